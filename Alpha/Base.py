@@ -4,7 +4,7 @@ from AlgorithmImports import *
 
 from Initialization import SetupBaseStructure
 from Alpha.Utils import Scanner, Stats
-from Tools import ContractUtils, Logger, Underlying
+from Tools import ContractUtils, GreeksProvider, Logger, Underlying
 from Strategy import Leg, Position, OrderType, WorkingOrder
 from Order import Order
 
@@ -93,9 +93,29 @@ class Base(AlphaModel):
         # Controls whether to consider the DTE of the last closed position when opening a new one:
         # If True, the Expiry date of the new position is selected such that the open DTE is the nearest to the DTE of the closed position
         "dynamicDTESelection": False,
+        # Times of the day at which the strategy looks to open new positions (i.e. [time(9, 45, 0)], checked by the getOrder method
+        # of the strategy). They drive the prefetch of the strike window (see prefetchLeadTime): the scanner still runs every
+        # scheduleFrequency within the scheduleStartTime/scheduleStopTime window
+        "tradeTimes": None,
+        # Lead time to subscribe and warm the strike window before the next trade time (or the scheduleStartTime if tradeTimes is
+        # not set). The window is released once the trade time has passed. Only used with useSlice = False. Setting this to None
+        # disables the prefetch (see DataHandler.prefetch)
+        "prefetchLeadTime": None,
         # Coarse filter for the Universe selection. It selects nStrikes on both sides of the ATM strike for each available expiration
         "nStrikesLeft": 200,   # 200 SPX @ 3820 & 3910C w delta @ 1.95 => 90/5 = 18
         "nStrikesRight": 200,   # 200
+        # Adaptive strike universe: the subscribed strikes are limited to the ones the strategy can actually trade, plus the wings.
+        # nStrikesLeft/nStrikesRight are the cap. The distance of the short strikes from ATM is either:
+        #  - strikeUniverseOffset: fixed distance (in points) for the strategies that select the strikes relative to the ATM strike
+        #    (i.e. 0 for an Iron Fly). If set, the deltas and the expected move are not used.
+        #  - otherwise, the distance of the target delta (strikeUniverseDelta, or the lowest of delta/putDelta/callDelta if None),
+        #    floored by the expected move of the underlying until expiration (ATM IV of the IV history, or strikeUniverseIV if not
+        #    available, times expectedMoveMultiplier)
+        "adaptiveStrikeUniverse": False,
+        "expectedMoveMultiplier": 1.0,
+        "strikeUniverseDelta": None,
+        "strikeUniverseOffset": None,
+        "strikeUniverseIV": 0.25,
         # Controls what happens when an open position reaches/crosses the dteThreshold ( -> DTE(openPosition) <= dteThreshold)
         # - If True, the position is closed as soon as the dteThreshold is reached, regardless of whether the position is profitable or not
         # - If False, once the dteThreshold is reached, the position is closed as soon as it is profitable
@@ -130,6 +150,12 @@ class Base(AlphaModel):
         "greeksIncluded": [],
         # Controls whether to compute the greeks for the strategy. If True, the greeks will be computed and stored in the contract under BSMGreeks.
         "computeGreeks": False,
+        # Source of the Greeks returned by self.contractUtils (see Tools.GreeksProvider). Valid options are (case insensitive):
+        # - lean: Greeks computed by Lean (cheapest)
+        # - surface: BSM Greeks with the IV read from the fitted volatility surface
+        # - batch: BSM Greeks with the IV solved for the whole list of contracts at once
+        # - bsm: BSM Greeks with the IV solved for each contract separately (most accurate)
+        "greeksProvider": "lean",
         # The time (on expiration day) at which any position that is still open will closed
         "marketCloseCutoffTime": time(15, 45, 0),
         # Limit Order Management
@@ -190,6 +216,15 @@ class Base(AlphaModel):
         "butterflyRightWingSize": 10,
         # useSlice determines if we should use the chainOption slice data instead of optionProvider. Default is set to FALSE
         "useSlice": True,
+        # IV rank/IV percentile filters (i.e. (30, 100) -> open new positions only if the IV rank is at least 30). Both are expressed
+        # in the range 0-100 and are checked on the rolling ATM IV history of the underlying (see Tools.IVHistory) before the option
+        # chain is fetched. The ATM IV is recorded on every bar (from the chain in the slice) only if one of the filters is set.
+        "ivRankRange": None,
+        "ivPercentileRange": None,
+        # Target DTE of the ATM IV recorded in the IV history (the expiry closest to this DTE is used)
+        "ivHistoryDte": 30,
+        # Minimum number of observations (one per bar) in the IV history before the IV filters let any trade through
+        "ivHistoryMinObservations": 30,
     }
 
     def __init__(self, context):
@@ -198,9 +233,10 @@ class Base(AlphaModel):
         self.nameTag = self.name # Set the Strategy Name (optional)
         self.logger = Logger(context, className=type(self).__name__, logLevel=context.logLevel) # Set the logger
         self.context.structure.AddConfiguration(parent=self, **self.getMergedParameters()) # This adds all the parameters to the class. We can also access them via self.parameter("parameterName")
-        self.contractUtils = ContractUtils(context) # Initialize the contract utils
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.create(context, self.parameter("greeksProvider", "lean"))) # Initialize the contract utils
         self.stats = Stats() # Initialize the stats dictionary
         self.order = Order(context, self)
+        self.scanner = Scanner(context, self) # Keep a single scanner (the expiry list is computed once a day)
         self.logger.debug(f'{self.name} -> __init__')
 
 
@@ -263,8 +299,16 @@ class Base(AlphaModel):
         # Check if the workingOrders are still OK to execute
         self.context.structure.checkOpenPositions()
 
+        # Subscribe and warm the strike window ahead of the next trade time (if prefetchLeadTime is set)
+        self.dataHandler.prefetch(data)
+
+        # Check the IV rank/percentile filters (cheap) before fetching and pricing the chain
+        if not self.checkIVHistory(data):
+            self.context.executionTimer.stop('Alpha.Base -> Update')
+            return insights
+
         # Run the strategies to open new positions
-        filteredChain, lastClosedOrderTag = Scanner(self.context, self).Call(data)
+        filteredChain, lastClosedOrderTag = self.scanner.Call(data)
 
         self.logger.debug(f'Did Alpha SCAN')
         self.logger.debug(f'Last Closed Order Tag: {lastClosedOrderTag}')
@@ -283,6 +327,42 @@ class Base(AlphaModel):
         return Insight.Group(insights)
 
 
+    def checkIVHistory(self, data):
+        """
+        Records the ATM IV of the current bar in the IV history of the underlying and checks the IV rank/percentile filters.
+
+        Args:
+            data: The data slice containing current market data.
+
+        Returns:
+            bool: True if the filters are not set or the current IV rank/percentile are within the ranges.
+        """
+        ivRankRange = self.parameter("ivRankRange")
+        ivPercentileRange = self.parameter("ivPercentileRange")
+        # Nothing to do if the filters are not set
+        if ivRankRange is None and ivPercentileRange is None:
+            return True
+
+        # Record the ATM IV from the chain of the strategy (slice or OptionChainProvider, the IV is computed by Lean)
+        contracts = self.dataHandler.getOptionContracts(data)
+        history = self.context.ivHistory.record(self.ticker, contracts, dte=self.parameter("ivHistoryDte", 30))
+        # Not enough observations yet
+        if len(history) == 0 or len(history) < self.parameter("ivHistoryMinObservations", 0):
+            self.logger.trace(f" -> IV history too short: {len(history)} observations.")
+            return False
+
+        if ivRankRange is not None:
+            ivRank = history.ivRank()
+            if not (ivRankRange[0] <= ivRank <= ivRankRange[1]):
+                self.logger.trace(f" -> IV rank {ivRank:.1f} outside of the range {ivRankRange}.")
+                return False
+        if ivPercentileRange is not None:
+            ivPercentile = history.ivPercentile()
+            if not (ivPercentileRange[0] <= ivPercentile <= ivPercentileRange[1]):
+                self.logger.trace(f" -> IV percentile {ivPercentile:.1f} outside of the range {ivPercentileRange}.")
+                return False
+        return True
+
     def GetOrder(self, chain):
         """
         Get the order with extra filters applied by the strategy.
@@ -342,6 +422,12 @@ class Base(AlphaModel):
             # Add this position to the global dictionary
             context.allPositions[orderId] = position
             context.openPositions[orderTag] = orderId
+            # Create the Greek indicators of the legs
+            context.greekIndicators.ensurePosition(position)
+            # The position holds a reference to the subscriptions of its legs until it is closed/cancelled
+            context.optionContractsSubscriptions.acquire([leg.symbol for leg in position.legs], owner=orderTag)
+            # Move the legs to the resolution tier of the positions
+            context.structure.updateResolutionTiers([leg.symbol for leg in position.legs])
 
             # Keep track of all the working orders
             context.workingOrders[orderTag] = {}
@@ -490,7 +576,10 @@ class Base(AlphaModel):
         """
         Handle changes in securities, including additions and removals.
         """
-        pass
+        # Keep the index of the future option chains up to date (i.e. on a roll)
+        dataHandler = getattr(self, "dataHandler", None)
+        if dataHandler is not None:
+            dataHandler.OnSecuritiesChanged(changes)
 
 
 
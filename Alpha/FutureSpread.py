@@ -20,6 +20,8 @@ class FutureSpread(Base):
         "allowMultipleEntriesPerExpiry": True,
         # Minimum time distance between opening two consecutive trades
         "minimumTradeScheduleDistance": timedelta(minutes=10),
+        # Times of the day at which the strategy opens new positions
+        "tradeTimes": [time(9, 35, 0), time(9, 40, 0), time(9, 45, 0)],
         # Days to Expiration
         "dte": 150,  # Adjust this based on the futures contract you want to trade
         # The size of the window used to filter the option chain: options expiring in the range [dte-dteWindow, dte] will be selected
@@ -73,13 +75,12 @@ class FutureSpread(Base):
         # https://tradeautomationtoolbox.com/byob-ticks/?save=admZ4dG
         if data.ContainsKey(self.underlyingSymbol):
             self.logger.debug(f"FutureSpread -> getOrder: Data contains key {self.underlyingSymbol}")
-            trade_times = [time(9, 35, 0), time(9, 40, 0), time(9, 45, 0)]
             # Remove the microsecond from the current time
             current_time = self.context.Time.time().replace(microsecond=0)
             self.logger.debug(f"FutureSpread -> getOrder -> current_time: {current_time}")
-            self.logger.debug(f"FutureSpread -> getOrder -> trade_times: {trade_times}")
-            self.logger.debug(f"FutureSpread -> getOrder -> current_time in trade_times: {current_time in trade_times}")
-            if current_time not in trade_times:
+            self.logger.debug(f"FutureSpread -> getOrder -> tradeTimes: {self.tradeTimes}")
+            self.logger.debug(f"FutureSpread -> getOrder -> current_time in tradeTimes: {current_time in self.tradeTimes}")
+            if current_time not in self.tradeTimes:
                 return None
 
             put = self.order.getSpreadOrder(chain,'put',fromPrice=self.minPremium,toPrice=self.maxPremium,wingSize=self.putWingSize,sell=True)
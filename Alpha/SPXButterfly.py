@@ -18,6 +18,12 @@ class SPXButterfly(Base):
         "allowMultipleEntriesPerExpiry": True,
         # Minimum time distance between opening two consecutive trades
         "minimumTradeScheduleDistance": timedelta(minutes=10),
+        # Times of the day at which the strategy opens new positions
+        "tradeTimes": [time(9, 45, 0)],
+        # Subscribe and warm the strike window 5 minutes before each trade time (OptionChainProvider path only: the prefetch
+        # and the adaptive strike universe do not apply to the slice)
+        "useSlice": False,
+        "prefetchLeadTime": timedelta(minutes=5),
         # Days to Expiration
         "dte": 0,
         # The size of the window used to filter the option chain: options expiring in the range [dte-dteWindow, dte] will be selected
@@ -31,6 +37,9 @@ class SPXButterfly(Base):
         # Example: 200 SPX @ 3820 & 3910C w delta @ 1.95 => 90/5 = 18
         "nStrikesLeft": 18,
         "nStrikesRight": 18,
+        # Only the ATM strike (plus the wings) is needed
+        "adaptiveStrikeUniverse": True,
+        "strikeUniverseOffset": 0,
         # TODO fix this and set it based on buying power.
         "maxOrderQuantity": 1000,
         "targetPremiumPct": 0.015,
@@ -61,9 +70,8 @@ class SPXButterfly(Base):
     def getOrder(self, chain, data):
         # Open trades at 13:00
         if data.ContainsKey(self.underlyingSymbol):
-            trade_times = [time(9, 45, 0)]
             current_time = self.context.Time.time()
-            if current_time not in trade_times:
+            if current_time not in self.tradeTimes:
                 return None
             fly =  self.order.getIronFlyOrder(
                 chain,
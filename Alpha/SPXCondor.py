@@ -18,6 +18,12 @@ class SPXCondor(Base):
         "allowMultipleEntriesPerExpiry": True,
         # Minimum time distance between opening two consecutive trades
         "minimumTradeScheduleDistance": timedelta(minutes=10),
+        # Times of the day at which the strategy opens new positions
+        "tradeTimes": [time(9, 45, 0), time(13, 10, 0), time(15, 15, 0)],
+        # Subscribe and warm the strike window 5 minutes before each trade time (OptionChainProvider path only: the prefetch
+        # and the adaptive strike universe do not apply to the slice)
+        "useSlice": False,
+        "prefetchLeadTime": timedelta(minutes=5),
         # Days to Expiration
         "dte": 0,
         # The size of the window used to filter the option chain: options expiring in the range [dte-dteWindow, dte] will be selected
@@ -32,6 +38,9 @@ class SPXCondor(Base):
         # Example: 200 SPX @ 3820 & 3910C w delta @ 1.95 => 90/5 = 18
         "nStrikesLeft": 18,
         "nStrikesRight": 18,
+        # Only the strikes within ATM +/- 30 (short strikes) plus the wings are needed
+        "adaptiveStrikeUniverse": True,
+        "strikeUniverseOffset": 30,
         # TODO fix this and set it based on buying power.
         "maxOrderQuantity": 1000,
         "targetPremiumPct": 0.015,
@@ -63,9 +72,8 @@ class SPXCondor(Base):
         # Best time to open the trade: 9:45 + 10:15 + 12:30 + 13:00 + 13:30 + 13:45 + 14:00 + 15:00 + 15:15 + 15:45
         # https://tradeautomationtoolbox.com/byob-ticks/?save=admZ4dG
         if data.ContainsKey(self.underlyingSymbol):
-            trade_times = [time(9, 45, 0), time(13, 10, 0), time(15, 15, 0)]
             current_time = self.context.Time.time()
-            if current_time not in trade_times:
+            if current_time not in self.tradeTimes:
                 return None
             strike = self.order.strategyBuilder.getATMStrike(chain)
             condor =  self.order.getIronCondorOrder(
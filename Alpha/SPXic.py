@@ -20,6 +20,10 @@ class SPXic(Base):
         "allowMultipleEntriesPerExpiry": True,
         # Minimum time distance between opening two consecutive trades
         "minimumTradeScheduleDistance": timedelta(minutes=10),
+        # Times of the day at which the strategy opens new positions
+        # "tradeTimes": [time(9, 45, 0), time(10, 15, 0), time(12, 30, 0), time(13, 0, 0), time(13, 30, 0), time(13, 45, 0), time(14, 0, 0), time(15, 0, 0), time(15, 15, 0), time(15, 45, 0)],
+        # "tradeTimes": [time(hour, minute, 0) for hour in range(9, 15) for minute in range(0, 60, 30) if not (hour == 15 and minute > 0)],
+        "tradeTimes": [time(9, 45, 0), time(10, 15, 0), time(12, 30, 0), time(13, 0, 0), time(13, 30, 0), time(13, 45, 0), time(14, 0, 0)],
         # Days to Expiration
         "dte": 0,
         # The size of the window used to filter the option chain: options expiring in the range [dte-dteWindow, dte] will be selected
@@ -73,15 +77,12 @@ class SPXic(Base):
         # https://tradeautomationtoolbox.com/byob-ticks/?save=admZ4dG
         if data.ContainsKey(self.underlyingSymbol):
             self.logger.debug(f"SPXic -> getOrder: Data contains key {self.underlyingSymbol}")
-            # trade_times = [time(9, 45, 0), time(10, 15, 0), time(12, 30, 0), time(13, 0, 0), time(13, 30, 0), time(13, 45, 0), time(14, 0, 0), time(15, 0, 0), time(15, 15, 0), time(15, 45, 0)]
-            trade_times = [time(9, 45, 0), time(10, 15, 0), time(12, 30, 0), time(13, 0, 0), time(13, 30, 0), time(13, 45, 0), time(14, 0, 0)]
-            # trade_times = [time(hour, minute, 0) for hour in range(9, 15) for minute in range(0, 60, 30) if not (hour == 15 and minute > 0)]
             # Remove the microsecond from the current time
             current_time = self.context.Time.time().replace(microsecond=0)
             self.logger.debug(f"SPXic -> getOrder -> current_time: {current_time}")
-            self.logger.debug(f"SPXic -> getOrder -> trade_times: {trade_times}")
-            self.logger.debug(f"SPXic -> getOrder -> current_time in trade_times: {current_time in trade_times}")
-            if current_time not in trade_times:
+            self.logger.debug(f"SPXic -> getOrder -> tradeTimes: {self.tradeTimes}")
+            self.logger.debug(f"SPXic -> getOrder -> current_time in tradeTimes: {current_time in self.tradeTimes}")
+            if current_time not in self.tradeTimes:
                 return None
 
             call =  self.order.getSpreadOrder(
@@ -2,11 +2,12 @@
 from AlgorithmImports import *
 #endregion
 
-from Tools import BSM, Logger
+from Tools import BSM, Logger, ChainSnapshot, StrategyDict
 
 class Scanner:
     """
     Handles the scanning and filtering of options chains. Manages market open checks, scheduling, and options chain expiration synchronization.
+    A single instance is kept by each Alpha model for the whole backtest: the expiry list is computed once a day.
 
     Attributes:
         context (Any): Context of the algorithm, includes settings and state.
@@ -20,7 +21,7 @@ class Scanner:
         self.base = base
         # Initialize the BSM pricing model
         self.bsm = BSM(context)
-        # Dictionary to keep track of all the available expiration dates at any given date
+        # Dictionary with the available expiration dates of the current date (the entries of the previous days are dropped)
         self.expiryList = {}
         # Set the logger
         self.logger = Logger(context, className = type(self).__name__, logLevel = context.logLevel)
@@ -226,6 +227,27 @@ class Scanner:
         self.logger.debug(f'Is Within Scheduled Time Window: {isWithinWindow}')
         return isWithinWindow
 
+    def countByStrategy(self, positions, strategyTagOf):
+        """
+        Counts the entries of the given dictionary (openPositions/workingOrders) that belong to the strategy.
+
+        Args:
+            positions (dict): The dictionary to count (a StrategyDict keeps the counts up to date as the entries change).
+            strategyTagOf (function): Returns the strategyTag of a value of the dictionary (used only if positions is a plain dict).
+
+        Returns:
+            int: The number of entries of the strategy.
+        """
+        if isinstance(positions, StrategyDict):
+            return positions.countTag(self.base.nameTag)
+        return sum(1 for value in positions.values() if strategyTagOf(value) == self.base.nameTag)
+
+    def openPositionsCount(self):
+        return self.countByStrategy(self.context.openPositions, lambda orderId: self.context.allPositions[orderId].strategyTag)
+
+    def workingOrdersCount(self):
+        return self.countByStrategy(self.context.workingOrders, lambda order: order.strategyTag)
+
     def hasReachedMaxActivePositions(self) -> bool:
         """
         Determine if the maximum number of active positions for the strategy has been reached.
@@ -233,19 +255,12 @@ class Scanner:
         Returns:
             bool: True if the maximum number of active positions has been reached; False otherwise.
         """
-        # Filter openPositions and workingOrders by strategyTag
-        openPositionsByStrategy = {tag: pos for tag, pos in self.context.openPositions.items() if self.context.allPositions[pos].strategyTag == self.base.nameTag}
-        workingOrdersByStrategy = {tag: order for tag, order in self.context.workingOrders.items() if order.strategyTag == self.base.nameTag}
+        # Do not open any new positions if we have reached the maximum for this strategy (open positions + working orders)
+        return (self.openPositionsCount() + self.workingOrdersCount()) >= self.base.maxActivePositions
 
-        # Do not open any new positions if we have reached the maximum for this strategy
-        return (len(openPositionsByStrategy) + len(workingOrdersByStrategy)) >= self.base.maxActivePositions
-    
     def hasReachedMaxOpenPositions(self) -> bool:
-        # Filter openPositions and workingOrders by strategyTag
-        workingOrdersByStrategy = {tag: order for tag, order in self.context.workingOrders.items() if order.strategyTag == self.base.nameTag}
-
-        # Do not open any new positions if we have reached the maximum for this strategy
-        return (len(workingOrdersByStrategy)) >= self.base.maxOpenPositions
+        # Do not open any new positions if we have reached the maximum number of working orders for this strategy
+        return self.workingOrdersCount() >= self.base.maxOpenPositions
 
     def syncExpiryList(self, chain):
         """
@@ -255,32 +270,40 @@ class Scanner:
             chain: A list of option contracts used to update the expiry dates.
         """
         # The list of expiry dates will change once a day (at most). See if we have already processed this list for the current date
-        if self.context.Time.date() in self.expiryList:
-            # Get the expiryList from the dictionary
-            expiry = self.expiryList.get(self.context.Time.date())
+        today = self.context.Time.date()
+        if today in self.expiryList:
+            return
+
+        # Start the timer
+        self.context.executionTimer.start("Alpha.Utils.Scanner -> syncExpiryList")
+
+        # Drop the expiry lists of the previous days
+        self.expiryList.clear()
+        # Set the DTE range (make sure values are not negative)
+        minDte = max(0, self.base.dte - self.base.dteWindow)
+        maxDte = max(0, self.base.dte)
+        # Get the expiry dates of the chain: one per partition of the chain snapshot (if this is the chain of the current bar)
+        snapshot = ChainSnapshot.cached(self.context, chain)
+        if snapshot is not None and snapshot.chain is chain:
+            expiries = [snapshot.contracts[partition[0]].Expiry for partition in snapshot.partitions.values()]
         else:
-            # Start the timer
-            self.context.executionTimer.start("Alpha.Utils.Scanner -> syncExpiryList")
-
-            # Set the DTE range (make sure values are not negative)
-            minDte = max(0, self.base.dte - self.base.dteWindow)
-            maxDte = max(0, self.base.dte)
-            # Get the list of expiry dates, sorted in reverse order
-            expiry = sorted(
-                set(
-                    [contract.Expiry for contract in chain if minDte <= (contract.Expiry.date() - self.context.Time.date()).days <= maxDte]
-                ),
-                reverse=True
-            )
-            # Only add the list to the dictionary if we found at least one expiry date
-            if expiry:
-                # Add the list to the dictionary
-                self.expiryList[self.context.Time.date()] = expiry
-            else:
-                self.logger.debug(f"No expiry dates found in the chain! {self.context.Time.strftime('%Y-%m-%d %H:%M')}')}}")
+            expiries = [contract.Expiry for contract in chain]
+        # Get the list of expiry dates within the DTE range, sorted in reverse order
+        expiry = sorted(
+            set(
+                [expiry for expiry in expiries if minDte <= (expiry.date() - today).days <= maxDte]
+            ),
+            reverse=True
+        )
+        # Only add the list to the dictionary if we found at least one expiry date
+        if expiry:
+            # Add the list to the dictionary
+            self.expiryList[today] = expiry
+        else:
+            self.logger.debug(f"No expiry dates found in the chain! {self.context.Time.strftime('%Y-%m-%d %H:%M')}")
 
-            # Stop the timer
-            self.context.executionTimer.stop("Alpha.Utils.Scanner -> syncExpiryList")
+        # Stop the timer
+        self.context.executionTimer.stop("Alpha.Utils.Scanner -> syncExpiryList")
 
     def filterByExpiry(self, chain, expiry=None, computeGreeks=False):
         """
@@ -299,14 +322,23 @@ class Scanner:
 
         # Check if the expiry date has been specified
         if expiry is not None:
-            # Filter contracts based on the requested expiry date
-            filteredChain = [
-                contract for contract in chain if contract.Expiry.date() == expiry.date()
-            ]
+            # Use the expiry partition (sorted by strike) of the chain snapshot if this is the chain of the current bar
+            snapshot = ChainSnapshot.cached(self.context, chain)
+            if snapshot is not None and snapshot.chain is chain:
+                filteredChain = snapshot.take(snapshot.expiryIndices(expiry))
+            else:
+                # Filter contracts based on the requested expiry date
+                filteredChain = [
+                    contract for contract in chain if contract.Expiry.date() == expiry.date()
+                ]
         else:
             # No filtering
             filteredChain = chain
 
+        # Fit the volatility smile of this expiry (the IV of any contract is then read from the surface)
+        if self.context.useVolSurface and filteredChain:
+            self.context.volSurface.fit(filteredChain)
+
         # Check if we need to compute the Greeks for every single contract (this is expensive!)
         # By default, the Greeks are only calculated while searching for the strike with the
         # requested delta, so there should be no need to set computeGreeks = True
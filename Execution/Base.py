@@ -1,6 +1,6 @@
 from AlgorithmImports import *
 
-from Tools import ContractUtils, Logger
+from Tools import ContractUtils, GreeksProvider, Logger
 from Execution.Utils import MarketOrderHandler, LimitOrderHandler, LimitOrderHandlerWithCombo
 """
 """
@@ -29,12 +29,15 @@ class Base(ExecutionModel):
         # and get a fill. This is calculated based on the speedOfFill and this 
         # value is just for reference.
         "maxRetries": 10,
+        # Source of the Greeks used by the contract utils (see Tools.GreeksProvider). Can be:
+        # "lean", "surface", "batch", "bsm"
+        "greeksProvider": "lean",
     }
 
     def __init__(self, context):
         self.context = context
         self.targetsCollection = PortfolioTargetCollection()
-        self.contractUtils = ContractUtils(context)
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.create(context, self.parameter("greeksProvider", "lean")))
         # Set the logger
         self.logger = Logger(context, className=type(self).__name__, logLevel=context.logLevel)
         self.marketOrderHandler = MarketOrderHandler(context, self)
@@ -2,7 +2,7 @@
 from AlgorithmImports import *
 #endregion
 
-from Tools import ContractUtils, Logger, Underlying, BSM
+from Tools import ContractUtils, GreeksProvider, Logger, Underlying, BSM
 
 
 class LimitOrderHandlerWithCombo:
@@ -30,7 +30,8 @@ class LimitOrderHandlerWithCombo:
     """
     def __init__(self, context, base):
         self.context = context
-        self.contractUtils = ContractUtils(context)
+        # Use the Greeks provider selected by the Execution model
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.of(base))
         self.base = base
         self.bsm = BSM(context)
         # Set the logger
@@ -103,8 +104,8 @@ class LimitOrderHandlerWithCombo:
         orderSign = 2 * int(orderType == "open") - 1
         # Get the order sides
         orderSides = np.array([c.contractSide for c in position.legs])
-        # Set the Greeks for the contracts maily for display/logging
-        self.bsm.setGreeks(contracts)
+        # Set the Greeks for the contracts maily for display/logging (approximated from the previous retry whenever possible)
+        self.bsm.refreshGreeks(contracts)
 
         # Define the legs of the combo order
         legs = []
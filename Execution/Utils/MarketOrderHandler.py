@@ -2,7 +2,7 @@
 from AlgorithmImports import *
 #endregion
 
-from Tools import ContractUtils, Logger, Underlying
+from Tools import ContractUtils, GreeksProvider, Logger, Underlying
 
 
 class MarketOrderHandler:
@@ -22,7 +22,8 @@ class MarketOrderHandler:
     def __init__(self, context, base):
         self.context = context
         self.base = base
-        self.contractUtils = ContractUtils(context)
+        # Use the Greeks provider selected by the Execution model
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.of(base))
         self.logger = Logger(context, className=type(self).__name__, logLevel=context.logLevel)
 
     def call(self, position, order):
@@ -169,6 +169,11 @@ class HandleOrderEvents:
         if bookPosition.orderTag in self.context.openPositions:
             self.context.openPositions.pop(bookPosition.orderTag)
             self.context.logger.debug(f"Closed position: {bookPosition.orderTag} removed from openPositions.")
+            # Dispose the Greek indicators of the legs
+            self.context.greekIndicators.disposePosition(bookPosition)
+            # Release the subscriptions of the legs (and move them back to the scan tier)
+            self.context.optionContractsSubscriptions.release(owner=bookPosition.orderTag)
+            self.context.structure.updateResolutionTiers([leg.symbol for leg in bookPosition.legs])
         else:
             self.context.logger.warning(f"Attempted to remove position {bookPosition.orderTag} but it was not found in openPositions.")
 
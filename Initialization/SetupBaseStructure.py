@@ -2,8 +2,9 @@
 from AlgorithmImports import *
 #endregion
 
-from Tools import Timer, Logger, DataHandler, Underlying, Charting
+from Tools import Timer, Logger, DataHandler, Underlying, Charting, GreeksCache, GreekIndicators, VolSurface, IVHistoryStore, StrategyDict, OptionContractListCache, SubscriptionRegistry, ProviderOptionContract, QuoteTracker
 from Initialization import AlwaysBuyingPowerModel, BetaFillModel, TastyWorksFeeModel
+import time as timer
 
 
 
@@ -63,10 +64,62 @@ class SetupBaseStructure:
         # is computed such that the contribution of each value decays by 95%
         # after <emaMemory> minutes (i.e. decay^emaMemory = 0.05)
         "emaMemory": 200,
+        # Maximum number of entries of the Greeks/IV cache shared by all the BSM instances (least recently used entries are evicted first)
+        "greeksCacheSize": 20000,
+        # Bounds of the approximate Greeks refresh (Taylor expansion from the last full IV solve) used on the legs of orders being retried:
+        # a full IV solve is performed once the underlying has moved more than greeksRefreshMaxSpotMove (relative), the last full solve is
+        # older than greeksRefreshMaxAge or the implied change in volatility exceeds greeksRefreshMaxIVChange
+        "greeksRefreshMaxSpotMove": 0.002,
+        "greeksRefreshMaxAge": timedelta(minutes=10),
+        "greeksRefreshMaxIVChange": 0.01,
+        # Read the IV from the fitted volatility surface (one smile per expiry, fitted on the liquid quotes) instead of solving it for each contract
+        "useVolSurface": False,
+        # Create the Lean Greek indicators of an option contract only when it becomes the leg of a position or its Greeks are
+        # read for the first time (they are disposed when the position is closed). If False, they are created for every option security.
+        # The indicators created on demand are warmed up when they are created (see GreekIndicators.warmUp).
+        "lazyGreekIndicators": True,
+        # Option price model (Lean OptionPriceModels) assigned to the option securities of each security type. Valid options are the
+        # names of the OptionPriceModels methods (i.e. "BlackScholes", "BaroneAdesiWhaley", "BjerksundStensland", "CrankNicolsonFD") or
+        # None to keep the default Lean model (no theoretical pricing). The models are only assigned if one of the Alpha/Monitor/Execution
+        # models reads the Lean Greeks (greeksProvider = "lean"): None is used automatically when all of them compute the Greeks with the
+        # internal BSM library, as the finite difference models (CrankNicolsonFD) are evaluated on every data point of every subscribed contract.
+        "optionPriceModels": {
+            # European options (SPX/SPXW): closed form
+            SecurityType.IndexOption: "BlackScholes",
+            # American options: analytic approximation
+            SecurityType.Option: "BaroneAdesiWhaley",
+            SecurityType.FutureOption: "BaroneAdesiWhaley",
+        },
+        # Maximum number of ATM IV observations (one per bar) kept in the IV history of each underlying (used by the IV rank/percentile
+        # filters of the strategies). The default is one year of minute bars.
+        "ivHistorySize": 252 * 390,
+        # Precision of the IV rank/percentile queries (size of the IV buckets) and highest IV value tracked by the IV history
+        "ivHistoryBucketSize": 0.0005,
+        "ivHistoryMaxIV": 5.0,
+        # The OptionChainProvider contract lists are requested once a day per underlying and shared by all the strategies. The lists
+        # with contracts expiring today (0DTE) are requested again once they are older than this interval (None -> never refresh)
+        "optionContractListRefresh": None,
+        # Interval of the subscription garbage collector: removes the option contracts that are expired or no longer referenced
+        # by a position or by the scan window of a strategy (see collectSubscriptions)
+        "subscriptionGCInterval": timedelta(minutes=30),
+        # Resolution tiers of the option contract subscriptions: the legs of the open positions and working orders (i.e.
+        # Resolution.Second for the stop management) and the scan universe of the strategies (i.e. Resolution.Minute). None -> use
+        # the timeResolution of the algorithm. The contracts are moved between the tiers as the positions are opened and closed
+        # (see updateResolutionTiers).
+        "legResolution": None,
+        "scanResolution": None,
+        # Maximum age of the Greeks reused for the contracts whose quotes and underlying price did not change since they were
+        # computed (see Tools.QuoteTracker). None -> no limit
+        "quoteTrackerMaxAge": timedelta(minutes=5),
     }
 
+    # Security types of the option contracts removed by the subscription garbage collector once expired
+    OPTION_TYPES = [SecurityType.Option, SecurityType.IndexOption, SecurityType.FutureOption]
+
     def __init__(self, context):
         self.context = context # Store the context as a class variable
+        # Time of the next run of the subscription garbage collector
+        self.nextSubscriptionGC = None
 
     def Setup(self):
         """
@@ -89,18 +142,22 @@ class SetupBaseStructure:
         # Set requested data resolution
         self.context.universe_settings.resolution = self.context.timeResolution
 
-        # Keep track of the option contract subscriptions
-        self.context.optionContractsSubscriptions = []
+        # Greeks provider tiers used by the Alpha/Monitor/Execution models (filled by GreeksProvider.create, see SetPriceModel)
+        self.context.greeksProviderTiers = set()
+        # Instances of the ProviderOptionContract (one per symbol, reused across bars)
+        self.context.providerOptionContracts = {}
+        # Keep track of the option contract subscriptions (and of the positions/scan windows using them)
+        self.context.optionContractsSubscriptions = SubscriptionRegistry(self.context)
         # Set Security Initializer
         self.context.SetSecurityInitializer(self.CompleteSecurityInitializer)
         # Initialize the dictionary to keep track of all positions
         self.context.allPositions = {}
 
-        # Dictionary to keep track of all open positions
-        self.context.openPositions = {}
+        # Dictionary to keep track of all open positions (the number of open positions of each strategy is kept up to date)
+        self.context.openPositions = StrategyDict(lambda orderId: getattr(self.context.allPositions.get(orderId), "strategyTag", None))
 
-        # Create dictionary to keep track of all the working orders. It stores orderTags
-        self.context.workingOrders = {}
+        # Create dictionary to keep track of all the working orders. It stores orderTags (the number of working orders of each strategy is kept up to date)
+        self.context.workingOrders = StrategyDict(lambda order: getattr(order, "strategyTag", None))
 
         # Create FIFO list to keep track of all the recently closed positions (needed for the Dynamic DTE selection)
         self.context.recentlyClosedDTE = []
@@ -124,10 +181,26 @@ class SetupBaseStructure:
         # Keep the chain object list in memory that gets updated before every Strategy update code run.
         self.context.chain = None
 
+        # Columnar snapshot of the option chain of each underlying (rebuilt on every bar, see Tools.ChainSnapshot)
+        self.context.chainSnapshots = {}
+
         # Assign the DEFAULT_PARAMETERS
         self.AddConfiguration(**SetupBaseStructure.DEFAULT_PARAMETERS)
         self.SetBacktestCutOffTime()
 
+        # Set the Greeks/IV cache shared by all the BSM instances
+        self.context.greeksCache = GreeksCache(self.context, maxSize=self.context.greeksCacheSize)
+        # Set the per-bar dirty set of the option quotes (the values derived from unchanged quotes are reused)
+        self.context.quoteTracker = QuoteTracker(self.context, maxAge=self.context.quoteTrackerMaxAge)
+        # Set the Lean Greek indicators manager
+        self.context.greekIndicators = GreekIndicators(self.context, lazy=self.context.lazyGreekIndicators)
+        # Set the volatility surface (only used if useVolSurface = True)
+        self.context.volSurface = VolSurface(self.context)
+        # Set the cache of the OptionChainProvider contract lists
+        self.context.optionContractLists = OptionContractListCache(self.context, refreshInterval=self.context.optionContractListRefresh)
+        # Set the rolling ATM IV history of each underlying (persisted to the ObjectStore in live mode)
+        self.context.ivHistory = IVHistoryStore(self.context, size=self.context.ivHistorySize, bucketSize=self.context.ivHistoryBucketSize, maxIV=self.context.ivHistoryMaxIV)
+
         # Set charting
         self.context.charting = Charting(
             self.context, 
@@ -182,45 +255,56 @@ class SetupBaseStructure:
             # New handling for FutureOptions
             security.SetFillModel(BetaFillModel(self.context))
             security.SetFeeModel(TastyWorksFeeModel())
-            security.PriceModel = OptionPriceModels.CrankNicolsonFD()
+            self.SetPriceModel(security)
             security.SetOptionAssignmentModel(NullOptionAssignmentModel())
 
-            # Initialize Greeks or any other specific models for FutureOptions
-            try:
-                security.iv = self.context.iv(security.symbol, security.symbol, resolution=self.context.timeResolution)
-                security.delta = self.context.d(security.symbol, security.symbol, resolution=self.context.timeResolution)
-                security.gamma = self.context.g(security.symbol, security.symbol, resolution=self.context.timeResolution)
-                security.vega = self.context.v(security.symbol, security.symbol, resolution=self.context.timeResolution)
-                security.rho = self.context.r(security.symbol, security.symbol, resolution=self.context.timeResolution)
-                security.theta = self.context.t(security.symbol, security.symbol, resolution=self.context.timeResolution)
-            except Exception as e:
-                self.context.logger.warning(f"FutureOption Initializer: Data not available: {e}") 
+            # Register the Greek indicators (created on demand)
+            self.context.greekIndicators.register(security)
         elif security.Type in [SecurityType.Option, SecurityType.IndexOption]:
             # This is for options.
             security.SetFillModel(BetaFillModel(self.context))
             # security.SetFillModel(MidPriceFillModel(self))
             security.SetFeeModel(TastyWorksFeeModel())
-            security.PriceModel = OptionPriceModels.CrankNicolsonFD()
+            self.SetPriceModel(security)
             # security.set_option_assignment_model(NullOptionAssignmentModel())
 
-            right = OptionRight.CALL if security.symbol.ID.option_right == OptionRight.PUT else OptionRight.PUT
-            mirror_symbol = Symbol.create_option(security.symbol.ID.underlying.symbol, security.symbol.ID.market, security.symbol.ID.option_style, right, security.symbol.ID.strike_price, security.symbol.ID.date)
-            try:
-                security.iv = self.context.iv(security.symbol, mirror_symbol, resolution=self.context.timeResolution)
-                security.delta = self.context.d(security.symbol, mirror_symbol, resolution=self.context.timeResolution)
-                security.gamma = self.context.g(security.symbol, mirror_symbol, resolution=self.context.timeResolution)
-                security.vega = self.context.v(security.symbol, mirror_symbol, resolution=self.context.timeResolution)
-                security.rho = self.context.r(security.symbol, mirror_symbol, resolution=self.context.timeResolution)
-                security.theta = self.context.t(security.symbol, mirror_symbol, resolution=self.context.timeResolution)
-
-            except Exception as e:
-                self.context.logger.warning(f"Security Initializer: Data not available: {e}") 
+            # Register the Greek indicators (created on demand)
+            self.context.greekIndicators.register(security)
 
         if security.Type == SecurityType.IndexOption:
             # disable option assignment. This is important for SPX but we disable for all for now.
             security.SetOptionAssignmentModel(NullOptionAssignmentModel())
         self.context.executionTimer.stop()
 
+    def SetPriceModel(self, security: Security) -> None:
+        """
+        Assigns the option price model configured for the type of the security (see the optionPriceModels parameter). The time
+        spent creating the models is tracked by the execution timer (one entry per model).
+
+        Args:
+            security (Security): The option security.
+        """
+        modelName = self.context.optionPriceModels.get(security.Type)
+        if modelName is None or not self.leanGreeksInUse():
+            # Keep the default Lean model
+            return
+
+        timerName = f"Initialization.SetupBaseStructure -> SetPriceModel -> {modelName}"
+        self.context.executionTimer.start(timerName)
+        security.PriceModel = getattr(OptionPriceModels, modelName)()
+        self.context.executionTimer.stop(timerName)
+
+    def leanGreeksInUse(self) -> bool:
+        """
+        Checks whether any of the Alpha/Monitor/Execution models reads the Greeks computed by Lean (lean Greeks provider tier).
+        The option price models are not needed otherwise.
+
+        Returns:
+            bool: True if the lean tier is used (or if the tiers are not tracked).
+        """
+        tiersInUse = getattr(self.context, "greeksProviderTiers", None)
+        return tiersInUse is None or "lean" in tiersInUse
+
     def ClearSecurity(self, security: Security) -> None:
         """
         Remove any additional data or settings associated with the security.
@@ -228,13 +312,139 @@ class SetupBaseStructure:
         Args:
             security (Security): The security object to be cleared.
         """
-        # Remove the security from the optionContractsSubscriptions dictionary
+        # Remove the security from the optionContractsSubscriptions registry
         if security.Symbol in self.context.optionContractsSubscriptions:
             self.context.optionContractsSubscriptions.remove(security.Symbol)
 
+        # Dispose the Greek indicators of the security
+        self.context.greekIndicators.dispose(security.Symbol)
+
+        # Drop the ProviderOptionContract of the security (it holds the Security object)
+        ProviderOptionContract.discard(self.context, security.Symbol)
+
+        # Drop the quotes of the security from the dirty set
+        quoteTracker = getattr(self.context, "quoteTracker", None)
+        if quoteTracker is not None:
+            quoteTracker.discard(security.Symbol)
+
         # Remove the security from the algorithm
         self.context.RemoveSecurity(security.Symbol)
 
+    def tierResolution(self, tier: str):
+        """
+        Returns the resolution of the given tier ("leg" or "scan"), or the timeResolution of the algorithm if the tier has no
+        resolution set.
+        """
+        resolution = self.context.legResolution if tier == "leg" else self.context.scanResolution
+        return self.context.timeResolution if resolution is None else resolution
+
+    def subscribeOptionContract(self, symbol, resolution) -> None:
+        """
+        Adds the data subscription of the option contract at the given resolution.
+        """
+        if symbol.SecurityType == SecurityType.FutureOption:
+            self.context.AddFutureOptionContract(symbol, resolution)
+        elif symbol.SecurityType == SecurityType.IndexOption:
+            self.context.AddIndexOptionContract(symbol, resolution)
+        else:
+            self.context.AddOptionContract(symbol, resolution)
+
+    def updateResolutionTiers(self, symbols) -> int:
+        """
+        Moves the given option contracts to the resolution of their tier (see SubscriptionRegistry.tier): called when a
+        position acquires the contracts of its legs and when it releases them (closed, cancelled or expired).
+        - Upgrade (scan -> leg): the contract is subscribed again at the leg resolution (Lean keeps the finest subscription).
+        - Downgrade (leg -> scan): Lean cannot change the resolution of an existing subscription, so the contract is removed
+          (unless it is still held) and the scan windows referencing it are released: the contract is subscribed again at the
+          scan resolution the next time the window is built. The contracts no longer referenced by anyone are left to the
+          subscription garbage collector (see collectSubscriptions).
+
+        Args:
+            symbols (list): The contract symbols.
+
+        Returns:
+            int: The number of contracts moved to a different tier.
+        """
+        subscriptions = self.context.optionContractsSubscriptions
+        moved = 0
+        for symbol in symbols:
+            if symbol not in subscriptions or subscriptions.refCount(symbol) == 0:
+                continue
+            tier = subscriptions.tier(symbol)
+            resolution = self.tierResolution(tier)
+            current = subscriptions.resolutions.get(symbol, self.context.timeResolution)
+            if current == resolution:
+                continue
+            if tier == "leg":
+                self.subscribeOptionContract(symbol, resolution)
+                subscriptions.resolutions[symbol] = resolution
+                self.context.executionTimer.count("Initialization.SetupBaseStructure -> updateResolutionTiers -> upgraded")
+            else:
+                # Never remove a contract that is still in the portfolio
+                if self.context.Portfolio[symbol].Invested:
+                    continue
+                scanOwners = subscriptions.scanOwners(symbol)
+                if symbol in self.context.Securities:
+                    self.ClearSecurity(self.context.Securities[symbol])
+                else:
+                    subscriptions.remove(symbol)
+                # Rebuild the scan windows that were using the contract
+                nameTags = [owner[1] for owner in scanOwners if owner is not None]
+                for strategy in self.context.strategies:
+                    if strategy.nameTag in nameTags:
+                        strategy.dataHandler.releaseScanWindow()
+                self.context.executionTimer.count("Initialization.SetupBaseStructure -> updateResolutionTiers -> downgraded")
+            moved += 1
+        return moved
+
+    def collectSubscriptions(self) -> int:
+        """
+        Subscription garbage collector: removes the subscriptions (and the Securities entries) of the option contracts added by
+        DataHandler.AddOptionContracts that are no longer held, ordered or inside the scan window of any strategy (see
+        SubscriptionRegistry), as well as the expired option contracts. The contracts of the option universe (SetFilter) are
+        left to Lean even when they are no longer referenced by a position. Runs every subscriptionGCInterval (see checkOpenPositions).
+
+        Returns:
+            int: The number of contracts removed.
+        """
+        self.context.executionTimer.start("Initialization.SetupBaseStructure -> collectSubscriptions")
+        startTime = timer.perf_counter()
+
+        today = self.context.Time.date()
+        subscriptions = self.context.optionContractsSubscriptions
+        # Contracts added by AddOptionContracts that are no longer referenced by a position or a scan window
+        candidates = set(subscriptions.unreferenced())
+        # Expired contracts: registered ones and the ones that are not in the registry (i.e. added by the option universe).
+        # A single set of symbols so that each contract is only cleared (and counted) once.
+        expired = {symbol for symbol in subscriptions if symbol.ID.Date.date() < today}
+        for symbol, security in list(self.context.Securities.items()):
+            # Check if the security is an option and if it has expired
+            if security.Type in self.OPTION_TYPES and security.HasData and security.Expiry.date() < today:
+                expired.add(symbol)
+        candidates.update(expired)
+
+        reclaimed = 0
+        for symbol in candidates:
+            # Never remove a contract that is still in the portfolio (the expired contracts have been settled by Lean)
+            if symbol not in expired and self.context.Portfolio[symbol].Invested:
+                continue
+            if symbol in self.context.Securities:
+                security = self.context.Securities[symbol]
+                if symbol in expired:
+                    self.context.logger.debug(f"  >>>  EXPIRED SECURITY-----> Removing expired {security.Expiry.date()} option contract {security.Symbol} from the algorithm.")
+                self.ClearSecurity(security)
+            else:
+                subscriptions.remove(symbol)
+            reclaimed += 1
+
+        self.nextSubscriptionGC = self.context.Time + self.context.subscriptionGCInterval
+        elapsed = timer.perf_counter() - startTime
+        self.context.executionTimer.count("Initialization.SetupBaseStructure -> collectSubscriptions -> reclaimed", reclaimed)
+        self.context.logger.debug(f"collectSubscriptions -> reclaimed {reclaimed} option contracts in {elapsed * 1000:.2f} ms ({len(subscriptions)} subscriptions left)")
+
+        self.context.executionTimer.stop("Initialization.SetupBaseStructure -> collectSubscriptions")
+        return reclaimed
+
     def SetBacktestCutOffTime(self) -> None:
         """
         Determines and sets the cutoff time for the backtest based on the algorithm's end date and market close time. This
@@ -275,9 +485,6 @@ class SetupBaseStructure:
         # Set data normalization mode to Raw
         underlying.SetDataNormalizationMode(DataNormalizationMode.Raw)
         self.context.logger.debug(f"{self.__class__.__name__} -> AddUnderlying -> Underlying: {underlying}")
-        # Keep track of the option contract subscriptions
-        self.context.optionContractsSubscriptions = []
-
         # Store the symbol for the option and the underlying
         strategy.underlyingSymbol = underlying.Symbol
 
@@ -350,21 +557,18 @@ class SetupBaseStructure:
             underlying = Underlying(self.context, strategy.underlyingSymbol)
             strategy.underlyingPriceAtOpen = underlying.Price()
 
+        # Drop the smiles of the expired contracts
+        self.context.volSurface.clear(before=self.context.Time)
+
     def checkOpenPositions(self):
         """
         Periodically checks and manages open positions to ensure they are valid and handles any necessary cleanup or
         adjustments based on the current market conditions or the positions' expiration status.
         """
         self.context.executionTimer.start()
-        # Iterate over all option contracts and remove the expired ones from the
-        for symbol, security in self.context.Securities.items():
-            # Check if the security is an option
-            if security.Type == SecurityType.Option and security.HasData:
-                # Check if the option has expired
-                if security.Expiry.date() < self.context.Time.date():
-                    self.context.logger.debug(f"  >>>  EXPIRED SECURITY-----> Removing expired {security.Expiry.date()} option contract {security.Symbol} from the algorithm.")
-                    # Remove the expired option contract
-                    self.ClearSecurity(security)
+        # Remove the expired and the unused option contracts from the algorithm (periodically)
+        if self.nextSubscriptionGC is None or self.context.Time >= self.nextSubscriptionGC:
+            self.collectSubscriptions()
 
         # Remove the expired positions from the openPositions dictionary. These are positions that expired
         # worthless or were closed before expiration.
@@ -377,6 +581,11 @@ class SetupBaseStructure:
                 self.context.charting.updateStats(position)
                 self.context.logger.debug(f"  >>>  EXPIRED POSITION-----> Removing expired position {orderTag} from the algorithm.")
                 self.context.openPositions.pop(orderTag)
+                # Dispose the Greek indicators of the legs
+                self.context.greekIndicators.disposePosition(position)
+                # Release the subscriptions of the legs (and move them back to the scan tier)
+                self.context.optionContractsSubscriptions.release(owner=orderTag)
+                self.updateResolutionTiers([leg.symbol for leg in position.legs])
 
         # Remove the expired positions from the workingOrders dictionary. These are positions that expired
         # without being filled completely.
@@ -393,6 +602,11 @@ class SetupBaseStructure:
                 # Remove this position from the list of open positions
                 if orderTag in self.context.openPositions:
                     self.context.openPositions.pop(orderTag)
+                # Dispose the Greek indicators of the legs
+                self.context.greekIndicators.disposePosition(position)
+                # Release the subscriptions of the legs (and move them back to the scan tier)
+                self.context.optionContractsSubscriptions.release(owner=orderTag)
+                self.updateResolutionTiers([leg.symbol for leg in position.legs])
                 # Remove the cancelled position from the final output unless we are required to include it
                 if not self.context.includeCancelledOrders:
                     self.context.allPositions.pop(orderId)
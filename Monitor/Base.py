@@ -4,7 +4,7 @@ from AlgorithmImports import *
 
 from Initialization import SetupBaseStructure
 from Strategy import WorkingOrder
-from Tools import Underlying
+from Tools import ContractUtils, GreeksProvider, Underlying
 
 
 class Base(RiskManagementModel):
@@ -39,14 +39,20 @@ class Base(RiskManagementModel):
         "stopLossMultiplier": 1.9,
         # Ensures that the Stop Loss does not exceed the theoretical loss. (Set to False for Credit Calendars)
         "capStopLoss": True,
+        # Source of the Greeks read through self.contractUtils by the risk checks of the derived monitors (i.e. a delta based
+        # stop in shouldClose). See Tools.GreeksProvider. Can be: "lean", "surface", "batch", "bsm"
+        "greeksProvider": "lean",
     }
 
     def __init__(self, context, strategy_id = 'Base'):
         self.context = context
         self.context.structure.AddConfiguration(parent=self, **self.getMergedParameters())
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.create(context, self.parameter("greeksProvider", "lean")))
         self.context.logger.debug(f"{self.__class__.__name__} -> __init__")
         self.context.strategyMonitors[strategy_id] = self
         self.strategy_id = strategy_id
+        # Quotes of the legs used for the last valuation of each position: orderTag -> list of (bid, ask) (see updatePositionValue)
+        self.positionQuotes = {}
 
     @classmethod
     def getMergedParameters(cls):
@@ -72,6 +78,33 @@ class Base(RiskManagementModel):
         """
         return cls.getMergedParameters().get(key, default)
 
+    def updatePositionValue(self, bookPosition):
+        """
+        Updates the value of the position (see Position.getPositionValue), unless the quotes of all its legs are the same as in
+        the last valuation.
+        The quotes are compared here rather than observed by the QuoteTracker: the legs would be marked as observed for the
+        bar without the price of the underlying, and the Greeks computed at an older spot would then be reused as clean.
+
+        Args:
+            bookPosition (Position): The open position.
+        """
+        # The quote tracking is disabled
+        if getattr(self.context, "quoteTracker", None) is None:
+            bookPosition.getPositionValue(self.context)
+            return
+
+        quotes = []
+        for leg in bookPosition.legs:
+            security = self.context.Securities[leg.symbol]
+            quotes.append((security.BidPrice, security.AskPrice))
+
+        if self.positionQuotes.get(bookPosition.orderTag) == quotes:
+            self.context.executionTimer.count("Monitor.Base -> updatePositionValue -> clean")
+            return
+
+        bookPosition.getPositionValue(self.context)
+        self.positionQuotes[bookPosition.orderTag] = quotes
+
     def ManageRisk(self, algorithm: QCAlgorithm, targets: List[PortfolioTarget]) -> List[PortfolioTarget]:
         """
         Manages the risk of the current open positions and determines which positions, if any, should be closed based on various risk management criteria.
@@ -147,7 +180,7 @@ class Base(RiskManagementModel):
             #        -> maxLoss = openPremium
 
             # Get the current value of the position
-            bookPosition.getPositionValue(self.context)
+            self.updatePositionValue(bookPosition)
             # Extract the positionPnL (per share)
             positionPnL = bookPosition.positionPnL
 
@@ -237,6 +270,11 @@ class Base(RiskManagementModel):
                 # Close the position
                 targets = self.closePosition(bookPosition, closeReason, stopLossFlg=stopLossFlg)
 
+        # Forget the quotes of the positions that are no longer open
+        for orderTag in list(self.positionQuotes):
+            if orderTag not in self.context.openPositions:
+                del self.positionQuotes[orderTag]
+
         # Stop the timer
         self.context.executionTimer.stop('Monitor.Base -> ManageRisk')
 
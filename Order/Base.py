@@ -2,7 +2,7 @@
 from AlgorithmImports import *
 # endregion
 from Order import Order
-from Tools import ContractUtils, Logger, Underlying
+from Tools import ContractUtils, GreeksProvider, Logger, Underlying
 from Strategy import Leg, Position, OrderType, WorkingOrder
 
 class Base:
@@ -18,8 +18,8 @@ class Base:
         self.name = strategy.name
         # Set the Strategy Name (optional)
         self.nameTag = strategy.nameTag
-        # Initialize the contract utils
-        self.contractUtils = ContractUtils(context)
+        # Initialize the contract utils (Greeks provider selected by the strategy)
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.of(strategy))
 
     def updateChain(self, chain):
         self.context.chain = chain
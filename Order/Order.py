@@ -5,7 +5,7 @@ from AlgorithmImports import *
 import numpy as np
 from .Base import Base
 from .OrderBuilder import OrderBuilder
-from Tools import ContractUtils, BSM, Logger
+from Tools import ContractUtils, GreeksProvider, BSM, Logger, ScenarioGrid
 from Strategy import Position
 
 
@@ -32,10 +32,12 @@ class Order(Base):
         super().__init__(context, strategy)
         # Initialize the BSM pricing model
         self.bsm = BSM(context)
-        # Initialize the contract utils
-        self.contractUtils = ContractUtils(context)
+        # Initialize the contract utils (Greeks provider selected by the strategy)
+        self.contractUtils = ContractUtils(context, greeksProvider=GreeksProvider.of(strategy))
         # Initialize the Strategy Builder
-        self.strategyBuilder = OrderBuilder(context)
+        self.strategyBuilder = OrderBuilder(context, greeksProvider=GreeksProvider.of(strategy))
+        # Initialize the scenario grid (P&L of the position under spot/time/vol shocks)
+        self.scenarioGrid = ScenarioGrid(context)
 
     def fValue(self, spotPrice, contracts, sides=None, atTime=None, openPremium=None):
         """
@@ -51,19 +53,10 @@ class Order(Base):
         Returns:
             float: Total financial value of the position.
         """
-        prices = np.array(
-            [
-                self.bsm.bsmPrice(
-                    contract,
-                    sigma=contract.BSMImpliedVolatility,
-                    spotPrice=spotPrice,
-                    atTime=atTime,
-                )
-                for contract in contracts
-            ]
-        )
-        # Total value of the position
-        value = openPremium + sum(prices * np.array(sides))
+        # Time shift from the current bar
+        timeShift = timedelta(0) if atTime is None else atTime - self.context.Time
+        # Total value of the position (single scenario of the grid)
+        value = self.scenarioGrid.evaluate(contracts, sides, timeShifts=[timeShift], openPremium=openPremium, spotPrice=spotPrice)[0, 0, 0]
         return value
 
 
@@ -115,16 +108,17 @@ class Order(Base):
 
         # Get the current price of the underlying
         UnderlyingLastPrice = self.contractUtils.getUnderlyingLastPrice(contracts[0])
-        # Evaluate the payoff at the extreme (spotPrice = 0)
-        maxLoss = self.getPayoff(0, contracts, sides)
-        # Evaluate the payoff at each strike
-        for contract in contracts:
-            maxLoss = min(maxLoss, self.getPayoff(contract.Strike, contracts, sides))
-
-        # Evaluate the payoff at the extreme (spotPrice = 10x higher)
-        maxLoss = min(maxLoss, self.getPayoff(UnderlyingLastPrice*10, contracts, sides))
+        # Legs of the order
+        strikes = np.array([contract.Strike for contract in contracts], dtype=np.float64)
+        # direction: Call -> +1, Put -> -1
+        directions = np.array([2*int(contract.Right == OptionRight.Call)-1 for contract in contracts], dtype=np.float64)
+        sides = np.asarray(sides, dtype=np.float64)
+        # Evaluate the payoff at the extremes (spotPrice = 0 and spotPrice = 10x higher) and at each strike (the payoff is piecewise linear)
+        spotPrices = np.concatenate(([0.0], strikes, [UnderlyingLastPrice*10]))
+        # Payoff matrix: (nSpotPrices, nContracts)
+        payoff = sides * np.maximum(0.0, directions * (spotPrices[:, None] - strikes))
         # Cap the payoff at zero: we are only interested in losses
-        maxLoss = min(0, maxLoss)
+        maxLoss = min(0, float(np.min(payoff.sum(axis=1))))
         # Return the max loss
         return maxLoss
 
@@ -303,7 +297,7 @@ class Order(Base):
 
         # Compute the Greeks for each contract (if not already available)
         if self.strategy.computeGreeks:
-            self.bsm.setGreeks(contracts)
+            self.bsm.refreshGreeks(contracts)
 
         # Compute the Mid-Price and Bid-Ask spread for the full order
         orderMidPrice = 0.0
@@ -419,13 +413,25 @@ class Order(Base):
         TReg = min(0, orderMidPrice + maxLoss) * orderQuantity
 
         portfolioMarginStress = self.context.portfolioMarginStress
+        # Determine the method used to calculate the profit target
+        profitTargetMethod = self.strategy.parameter("profitTargetMethod", "Premium").lower()
+        thetaProfitDays = self.strategy.parameter("thetaProfitDays", 0)
+        useThetaProfit = profitTargetMethod == "theta" and thetaProfitDays > 0
+        if self.strategy.computeGreeks or useThetaProfit:
+            # Evaluate the P&L of the position for all the scenarios at once:
+            #  - spot: [-portfolioMarginStress, 0, +portfolioMarginStress]
+            #  - time: [now, now + thetaProfitDays]
+            scenarioPnL = self.scenarioGrid.evaluate(
+                contracts,
+                sides,
+                spotShocks=[-portfolioMarginStress, 0.0, portfolioMarginStress],
+                timeShifts=[timedelta(0), timedelta(days=thetaProfitDays if useThetaProfit else 0)],
+                openPremium=midPrice,
+                spotPrice=underlyingPrice,
+            )
         if self.strategy.computeGreeks:
             # Compute the projected P&L of the position following a % movement of the underlying up or down
-            portfolioMargin = min(
-                0,
-                self.fValue(underlyingPrice * (1-portfolioMarginStress), contracts, sides=sides, atTime=context.Time, openPremium=midPrice),
-                self.fValue(underlyingPrice * (1+portfolioMarginStress), contracts, sides=sides, atTime=context.Time, openPremium=midPrice)
-            ) * orderQuantity
+            portfolioMargin = min(0, scenarioPnL[0, 0, 0], scenarioPnL[2, 0, 0]) * orderQuantity
 
         order = {
             "strategyId": strategyId,
@@ -500,14 +506,11 @@ class Order(Base):
         #                     }
         #         }
 
-        # Determine the method used to calculate the profit target
-        profitTargetMethod = self.strategy.parameter("profitTargetMethod", "Premium").lower()
-        thetaProfitDays = self.strategy.parameter("thetaProfitDays", 0)
         # Set a custom profit target unless we are using the default Premium based methodology
         if profitTargetMethod != "premium":
-            if profitTargetMethod == "theta" and thetaProfitDays > 0:
-                # Calculate the P&L of the position at T+[thetaProfitDays]
-                thetaPnL = self.fValue(underlyingPrice, contracts, sides=sides, atTime=context.Time + timedelta(days=thetaProfitDays), openPremium=midPrice)
+            if useThetaProfit:
+                # P&L of the position at T+[thetaProfitDays]
+                thetaPnL = scenarioPnL[1, 1, 0]
                 # Profit target is a percentage of the P&L calculated at T+[thetaProfitDays]
                 profitTargetAmt = profitTargetPct * abs(thetaPnL) * orderQuantity
             elif profitTargetMethod == "treg":
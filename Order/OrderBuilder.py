@@ -2,7 +2,8 @@
 from AlgorithmImports import *
 # endregion
 
-from Tools import Logger, ContractUtils, BSM
+import numpy as np
+from Tools import Logger, ContractUtils, BSM, ChainSnapshot, StrikeIndex
 
 class LargeStrikeGapError(Exception):
     """Custom exception for large gaps between option strikes."""
@@ -28,11 +29,18 @@ class OrderBuilder:
     #         If targetPremium != None  -> The order is executed only if the number of contracts required
     #           to reach the target credit/debit does not exceed the maxOrderQuantity
    
-    def __init__(self, context):
+    def __init__(self, context, greeksProvider=None):
         self.context = context # Set the context (QCAlgorithm object)
         self.bsm = BSM(context) # Initialize the BSM pricing model
         self.logger = Logger(context, className=type(self).__name__, logLevel=context.logLevel) # Set the logger
-        self.contractUtils = ContractUtils(context) # Initialize the contract utils
+        # The delta search reads the Greeks through the contract utils: the provider selected by the strategy (see
+        # Tools.GreeksProvider), or the BSM Greeks computed by self.bsm for the lean tier (the Lean indicators of the strikes
+        # being scanned are not warmed up)
+        if greeksProvider is not None and greeksProvider.name == "lean":
+            greeksProvider = None
+        self.contractUtils = ContractUtils(context, custom_greeks=True, greeksProvider=greeksProvider) # Initialize the contract utils
+        self.strikeIndexes = {} # Sorted strike index of each list of contracts (and option type) used during the current bar
+        self.strikeIndexesTime = None
 
     def optionTypeFilter(self, contract, type = None):
         """
@@ -67,32 +75,42 @@ class OrderBuilder:
         Returns:
             list[OptionContract]: List of ATM option contracts.
         """
-        # Initialize result
-        atm_contracts = []
+        # Exit if there are no contracts
+        if not contracts:
+            return []
 
-        # Sort the contracts based on how close they are to the current price of the underlying.
+        # Select the first two contracts (one Put and one Call) or the first contract (either Put or Call, based on the type specified)
+        Ncontracts = 2 if type == None or type.lower() == "both" else 1
+        # Get the contracts closest to the current price of the underlying (binary search on the sorted strikes).
         # Filter them by the selected contract type (Put/Call or both)
-        sorted_contracts = sorted([contract
-                                        for contract in contracts
-                                        if self.optionTypeFilter(contract, type)
-                                    ]
-                                    , key = lambda x: abs(x.Strike - self.contractUtils.getUnderlyingLastPrice(x))
-                                    , reverse = False
-                                    )
-
-        # Check if any contracts were returned after the filtering
-        if len(sorted_contracts) > 0:
-            if type == None or type.lower() == "both":
-                # Select the first two contracts (one Put and one Call)
-                Ncontracts = min(len(sorted_contracts), 2)
-            else:
-                # Select the first contract (either Put or Call, based on the type specified)
-                Ncontracts = 1
-            # Extract the selected contracts
-            atm_contracts = sorted_contracts[0:Ncontracts]
+        atm_contracts = self.strikeIndex(contracts, type).nearest(self.contractUtils.getUnderlyingLastPrice(contracts[0]), n=Ncontracts)
         # Return result
         return atm_contracts
 
+    def strikeIndex(self, contracts, type = None):
+        """
+        Returns the sorted strike index of the given contracts, filtered by option type. The index is built once per bar for each list of contracts.
+
+        Args:
+            contracts (list[OptionContract]): List of option contracts.
+            type (str, optional): Filters the contracts by type ('call', 'put', or None for both).
+
+        Returns:
+            StrikeIndex: The sorted strike index.
+        """
+        # The indexes are only valid during the current bar
+        if self.strikeIndexesTime != self.context.Time:
+            self.strikeIndexes = {}
+            self.strikeIndexesTime = self.context.Time
+        key = (id(contracts), len(contracts), None if type is None else type.lower())
+        cached = self.strikeIndexes.get(key)
+        # The index keeps a reference to the list, so the id cannot be reused by another list while the entry exists
+        if cached is not None and cached[0] is contracts:
+            return cached[1]
+        index = StrikeIndex([contract for contract in contracts if self.optionTypeFilter(contract, type)])
+        self.strikeIndexes[key] = (contracts, index)
+        return index
+
     def getATMStrike(self, contracts):
         """
         Retrieves the strike price of the ATM contract.
@@ -113,6 +131,16 @@ class OrderBuilder:
         # Return result
         return ATMStrike
 
+    def setGreeks(self, contracts):
+        """
+        Computes the BSM Greeks of the given contracts, unless they are read from a Greeks provider (computed on demand).
+
+        Args:
+            contracts (OptionContract | list[OptionContract]): The contracts.
+        """
+        if self.contractUtils.greeksProvider is None:
+            self.bsm.setGreeks(contracts)
+
     def getDeltaContract(self, contracts, delta = None):
         """
         Retrieves the contract closest to a specified delta value.
@@ -132,25 +160,25 @@ class OrderBuilder:
         rightIdx = len(contracts)-1
 
         # Compute the Greeks for the contracts at the extremes
-        self.bsm.setGreeks([contracts[leftIdx], contracts[rightIdx]])
+        self.setGreeks([contracts[leftIdx], contracts[rightIdx]])
 
         # Check if the requested Delta is outside of the range
         if contracts[rightIdx].Right == OptionRight.Call:
             # Check if the furthest OTM Call has a Delta higher than the requested Delta
-            if abs(contracts[rightIdx].BSMGreeks.Delta) > delta/100.0:
+            if abs(self.contractUtils.delta(contracts[rightIdx])) > delta/100.0:
                 # The requested delta is outside the boundary, return the strike of the furthest OTM Call
                 return contracts[rightIdx]
             # Check if the furthest ITM Call has a Delta lower than the requested Delta
-            elif abs(contracts[leftIdx].BSMGreeks.Delta) < delta/100.0:
+            elif abs(self.contractUtils.delta(contracts[leftIdx])) < delta/100.0:
                 # The requested delta is outside the boundary, return the strike of the furthest ITM Call
                 return contracts[leftIdx]
         else:
             # Check if the furthest OTM Put has a Delta higher than the requested Delta
-            if abs(contracts[leftIdx].BSMGreeks.Delta) > delta/100.0:
+            if abs(self.contractUtils.delta(contracts[leftIdx])) > delta/100.0:
                 # The requested delta is outside the boundary, return the strike of the furthest OTM Put
                 return contracts[leftIdx]
             # Check if the furthest ITM Put has a Delta lower than the requested Delta
-            elif abs(contracts[rightIdx].BSMGreeks.Delta) < delta/100.0:
+            elif abs(self.contractUtils.delta(contracts[rightIdx])) < delta/100.0:
                 # The requested delta is outside the boundary, return the strike of the furthest ITM Put
                 return contracts[rightIdx]
 
@@ -160,8 +188,8 @@ class OrderBuilder:
             middleIdx = round((leftIdx + rightIdx)/2.0)
             middleContract = contracts[middleIdx]
             # Compute the greeks for the contract in the middle
-            self.bsm.setGreeks(middleContract)
-            contractDelta = contracts[middleIdx].BSMGreeks.Delta
+            self.setGreeks(middleContract)
+            contractDelta = self.contractUtils.delta(middleContract)
             # Determine which side we need to continue the search
             if(abs(contractDelta) > delta/100.0):
                 if middleContract.Right == OptionRight.Call:
@@ -180,7 +208,7 @@ class OrderBuilder:
 
         # At this point where should only be two contracts remaining: choose the contract with the closest Delta
         deltaContract = sorted([contracts[leftIdx], contracts[rightIdx]]
-                                , key = lambda x: abs(abs(x.BSMGreeks.Delta) - delta/100.0)
+                                , key = lambda x: abs(abs(self.contractUtils.delta(x)) - delta/100.0)
                                 , reverse = False
                                 )[0]
 
@@ -224,7 +252,7 @@ class OrderBuilder:
         deltaContract = self.getDeltaContract(contracts, delta = delta)
         # Check if we found the contract
         if deltaContract:
-            if abs(deltaContract.BSMGreeks.Delta) >= delta/100.0:
+            if abs(self.contractUtils.delta(deltaContract)) >= delta/100.0:
                 # The contract is in the required range. Get the Strike
                 fromDeltaStrike = deltaContract.Strike
             else:
@@ -250,7 +278,7 @@ class OrderBuilder:
         deltaContract = self.getDeltaContract(contracts, delta = delta)
         # Check if we found the contract
         if deltaContract:
-            if abs(deltaContract.BSMGreeks.Delta) <= delta/100.0:
+            if abs(self.contractUtils.delta(deltaContract)) <= delta/100.0:
                 # The contract is in the required range. Get the Strike
                 toDeltaStrike = deltaContract.Strike
             else:
@@ -336,40 +364,18 @@ class OrderBuilder:
         toStrike = toStrike or float('inf')
         toPrice = toPrice or float('inf')
 
-        # Get the Put contracts, sorted by ascending strike. Apply the Strike/Price constraints
+        # Columnar view of the contracts (built once per bar by the DataHandler)
+        snapshot, idx = ChainSnapshot.get(self.context, contracts, contractUtils=self.contractUtils)
+
+        # Get the Put contracts, sorted by ascending strike. Apply the Strike/Price constraints and keep only the tradable contracts
         puts = []
         if type == None or type.lower() == "put":
-            puts = sorted([contract
-                            for contract in contracts
-                                if self.optionTypeFilter(contract, "Put")
-                                # Strike constraint
-                                and (fromStrike <= contract.Strike <= toStrike)
-                                # The option contract is tradable
-                                and self.contractUtils.getSecurity(contract).IsTradable
-                                # Option price constraint (based on the mid-price)
-                                and (fromPrice <= self.contractUtils.midPrice(contract) <= toPrice)
-                        ]
-                        , key = lambda x: x.Strike
-                        , reverse = False
-                        )
+            puts = snapshot.take(snapshot.filter(idx, right=OptionRight.Put, fromStrike=fromStrike, toStrike=toStrike, fromPrice=fromPrice, toPrice=toPrice, tradable=True))
 
-        # Get the Call contracts, sorted by ascending strike. Apply the Strike/Price constraints
+        # Get the Call contracts, sorted by ascending strike. Apply the Strike/Price constraints and keep only the tradable contracts
         calls = []
         if type == None or type.lower() == "call":
-            calls = sorted([contract
-                            for contract in contracts
-                                if self.optionTypeFilter(contract, "Call")
-                                # Strike constraint
-                                and (fromStrike <= contract.Strike <= toStrike)
-                                # The option contract is tradable
-                                and self.contractUtils.getSecurity(contract).IsTradable
-                                # Option price constraint (based on the mid-price)
-                                and (fromPrice <= self.contractUtils.midPrice(contract) <= toPrice)
-                            ]
-                            , key = lambda x: x.Strike
-                            , reverse = False
-                            )
-
+            calls = snapshot.take(snapshot.filter(idx, right=OptionRight.Call, fromStrike=fromStrike, toStrike=toStrike, fromPrice=fromPrice, toPrice=toPrice, tradable=True))
 
         deltaFilteredPuts = puts
         deltaFilteredCalls = calls
@@ -476,38 +482,37 @@ class OrderBuilder:
         if len(contracts) < 2 or wingSize <= 0:
             return None
 
-        # Calculate differences between consecutive contracts
-        differences = [abs(contracts[i+1].Strike - contracts[i].Strike) for i in range(len(contracts)-1)]
+        # Check that at least one pair of consecutive strikes is within the wing size
+        strikes = np.array([float(contract.Strike) for contract in contracts], dtype=np.float64)
+        self.checkStrikeGaps(strikes, wingSize)
+
+        # Get the furthest contract within the wing size (or the next contract if there is none). Binary search on the strikes
+        wingContract = contracts[StrikeIndex.wingPositions(strikes, wingSize)[0]]
 
+        return wingContract
+
+    def checkStrikeGaps(self, strikes, wingSize):
+        """
+        Makes sure that at least one pair of consecutive strikes is within the wing size.
+
+        Args:
+            strikes (np.ndarray): The strikes of the contracts (sorted).
+            wingSize (float): The maximum allowed distance between consecutive strikes.
+
+        Raises:
+            LargeStrikeGapError: If no pair of consecutive strikes has a difference less than or equal to wingSize.
+        """
+        # Calculate differences between consecutive contracts
+        differences = np.abs(np.diff(strikes))
         # Check if any difference is less than or equal to wingSize
-        if not any(diff <= wingSize for diff in differences):
+        if not np.any(differences <= wingSize):
             raise LargeStrikeGapError(
                 f"No consecutive strikes found within the specified wing size. "
-                f"SUGGESTION: Change your parameter wingSize in the model to {min(differences)}!"
+                f"SUGGESTION: Change your parameter wingSize in the model to {differences.min()}!"
                 f"Allowed wing size: {wingSize}, "
-                f"Minimum difference found: {min(differences)}"
+                f"Minimum difference found: {differences.min()}"
             )
 
-        # Initialize output
-        wingContract = None
-        firstLegStrike = contracts[0].Strike
-        currentWings = float('inf')
-
-        # Loop through contracts to find the best wing
-        for contract in contracts[1:]:
-            strike_difference = abs(contract.Strike - firstLegStrike)
-
-            if strike_difference <= wingSize:
-                wingContract = contract
-                currentWings = strike_difference
-            elif strike_difference - wingSize < currentWings - wingSize:
-                wingContract = contract
-                currentWings = strike_difference
-            else:
-                break  # We've gone too far, no need to continue
-
-        return wingContract
-
     def getSpread(self, contracts, type, strike = None, delta = None, wingSize = None, sortByStrike = False, fromPrice = None, toPrice = None, premiumOrder = 'max'):
         """
         Retrieves the best spread contract based on specified criteria.
@@ -545,9 +550,8 @@ class OrderBuilder:
             self.logger.error(f"Input parameter type = {type} is invalid. Valid values: 'Put'|'Call'")
             return
 
-        # Initialize the result and the best premium
+        # Initialize the result
         best_spread = []
-        best_premium = -float('inf') if premiumOrder == 'max' else float('inf')
         self.logger.debug(f"wingSize: {wingSize}, premiumOrder: {premiumOrder}, fromPrice: {fromPrice}, toPrice: {toPrice}, sortByStrike: {sortByStrike}, strike: {strike}")
         if strike is not None:
             wing = self.getWing(sorted_contracts, wingSize = wingSize)
@@ -559,22 +563,32 @@ class OrderBuilder:
                 if wing != None:
                     # Add the wing
                     best_spread.append(wing)
-        else:
-            # Iterate over sorted contracts
-            for i in range(len(sorted_contracts) - 1):
-                # Get the wing
-                wing = self.getWing(sorted_contracts[i:], wingSize = wingSize)
-                self.logger.debug(f"NO STRIKE: wing: {wing}")
-                if wing is not None:
-                    # Calculate the net premium
-                    net_premium = abs(self.contractUtils.midPrice(sorted_contracts[i]) - self.contractUtils.midPrice(wing))
-                    self.logger.debug(f"fromPrice: {fromPrice} <= net_premium: {net_premium} <= toPrice: {toPrice}")
-                    # Check if the net premium is within the specified price range
-                    if fromPrice <= net_premium <= toPrice:
-                        # Check if this spread has a better premium
-                        if (premiumOrder == 'max' and net_premium > best_premium) or (premiumOrder == 'min' and net_premium < best_premium):
-                            best_spread = [sorted_contracts[i], wing]
-                            best_premium = net_premium
+        elif len(sorted_contracts) > 1 and (wingSize or 0) > 0:
+            strikes = np.array([float(contract.Strike) for contract in sorted_contracts], dtype=np.float64)
+            # Each leg is checked against the remaining contracts: make sure the gaps between consecutive strikes are within the wing size
+            # (the remaining contracts of the furthest legs have the fewest gaps, so check the largest suffix that fails)
+            differences = np.abs(np.diff(strikes))
+            suffixMin = np.minimum.accumulate(differences[::-1])[::-1]
+            failing = np.nonzero(suffixMin > wingSize)[0]
+            if len(failing) > 0:
+                self.checkStrikeGaps(strikes[failing[0]:], wingSize)
+            # Get the wing of each leg (binary search on the strikes)
+            legs = np.arange(len(sorted_contracts) - 1)
+            wings = StrikeIndex.wingPositions(strikes, wingSize)[:-1]
+            # Calculate the net premium of each spread (mid-prices from the chain snapshot)
+            snapshot, idx = ChainSnapshot.get(self.context, sorted_contracts, contractUtils=self.contractUtils)
+            midPrices = snapshot.mid[idx]
+            netPremiums = np.abs(midPrices[legs] - midPrices[wings])
+            self.logger.debug(f"NO STRIKE: wings: {wings}, net premiums: {netPremiums}")
+            # Check if the net premium is within the specified price range
+            fromPrice = 0 if fromPrice is None else fromPrice
+            toPrice = float('inf') if toPrice is None else toPrice
+            valid = (fromPrice <= netPremiums) & (netPremiums <= toPrice)
+            if valid.any():
+                # Select the spread with the best premium (the first one in case of ties)
+                candidates = np.where(valid, netPremiums, -np.inf if premiumOrder == 'max' else np.inf)
+                best = int(np.argmax(candidates) if premiumOrder == 'max' else np.argmin(candidates))
+                best_spread = [sorted_contracts[best], sorted_contracts[wings[best]]]
 
         # By default, the legs of a spread are sorted based on their distance from the ATM strike.
         # - For Call spreads, they are already sorted by increasing strike
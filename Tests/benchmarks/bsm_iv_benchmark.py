@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of the implied volatility solvers on synthetic 500-contract chains:
+  - scalar: BSM.bsmIV called on each contract (scipy root_scalar, Halley + bisection fallback)
+  - batch: BSM.bsmIVBatch called once on the whole chain
+
+Usage (from the repository root):
+    PYTHONPATH=.:Tests python -m Tests.benchmarks.bsm_iv_benchmark
+"""
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.BSMLibrary import BSM
+    from Tests.mocks.algorithm_imports import OptionRight
+
+
+def create_chain(bsm, nContracts = 500, spot = 4500.0, dte = 7, seed = 0):
+    """Creates a chain of nContracts (Calls and Puts) quoted with a noisy volatility skew"""
+    rng = np.random.default_rng(seed)
+    expiry = (bsm.context.Time + timedelta(days = dte)).replace(hour = 0, minute = 0)
+    strikes = spot + 5.0*np.arange(-nContracts//4, nContracts//4)
+    chain = []
+    for strike in strikes:
+        # Simple skew plus some noise
+        sigma = 0.15 - 0.3*np.log(strike/spot) + rng.normal(0, 0.005)
+        for right in [OptionRight.Call, OptionRight.Put]:
+            contract = Contract(strike, right, expiry, underlyingLastPrice = spot, underlying = "SPX")
+            price = bsm.bsmPrice(contract, sigma, spotPrice = spot)
+            contract.BidPrice = contract.AskPrice = price
+            chain.append(contract)
+    return chain
+
+
+def run(nChains = 5, nContracts = 500):
+    algorithm = Factory.create_algorithm()
+    algorithm.Time = datetime(2024, 1, 2, 10, 0)
+    algorithm.Securities = {}
+    algorithm.executionTimer = MagicMock()
+    bsm = BSM(algorithm)
+
+    scalarElapsed = 0.0
+    batchElapsed = 0.0
+    maxDiff = 0.0
+    for seed in range(nChains):
+        chain = create_chain(bsm, nContracts = nContracts, seed = seed)
+        tau = np.array([bsm.optionTau(c) for c in chain])
+        strikes = np.array([c.Strike for c in chain])
+        isCall = np.array([c.Right == OptionRight.Call for c in chain])
+        spot = np.array([c.UnderlyingLastPrice for c in chain])
+        prices = np.array([0.5*(c.BidPrice + c.AskPrice) for c in chain])
+
+        start = time.perf_counter()
+        scalarIV = np.array([bsm.bsmIV(contract, tau = tau[idx]) for idx, contract in enumerate(chain)])
+        scalarElapsed += time.perf_counter() - start
+
+        start = time.perf_counter()
+        batchIV, converged = bsm.bsmIVBatch(prices, strikes, isCall, tau, spot)
+        batchElapsed += time.perf_counter() - start
+
+        # Only compare the well-conditioned contracts: deep ITM/OTM prices are (numerically) insensitive to the volatility
+        vega = bsm.bsmBatch(strikes, isCall, tau, spot, batchIV)["vega"]
+        both = converged & (scalarIV > 0) & (vega > 0.01)
+        maxDiff = max(maxDiff, float(np.max(np.abs(batchIV[both] - scalarIV[both]))))
+
+    print(f"Chains: {nChains} x {nContracts} contracts")
+    print(f"  scalar bsmIV:     {1000*scalarElapsed/nChains:10.2f} ms/chain")
+    print(f"  batch bsmIVBatch: {1000*batchElapsed/nChains:10.2f} ms/chain")
+    print(f"  speed-up:         {scalarElapsed/batchElapsed:10.1f}x")
+    print(f"  max |IV diff|:    {maxDiff:10.2e} (contracts with Vega > 0.01)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the option price models assigned by SetupBaseStructure.SetPriceModel (optionPriceModels parameter). The Greeks of
+the OptionContract are evaluated by Lean, so unlike the other benchmarks this one is an algorithm run on the Lean engine:
+  - PriceModelBenchmarkAlgorithm subscribes the SPXW 0DTE chain (8 strikes on each side of the ATM) and reads the Greeks of
+    every contract of the chain on each minute bar through the lean tier of the GreeksProvider
+  - the price model of the run is selected by the priceModel parameter: None (default Lean model, no theoretical pricing),
+    BlackScholes, BaroneAdesiWhaley, BjerksundStensland or CrankNicolsonFD
+
+At the end of the backtest it logs, for the selected model:
+  - startup: time spent creating the price models of the option securities (SetPriceModel timers), per contract
+  - per bar: time spent reading the Greeks of the chain (Tools.GreeksProvider -> lean timer), per bar and per contract
+
+Usage: run one backtest per model with the Lean engine, with algorithm-location pointing to this file, algorithm-type-name
+set to PriceModelBenchmarkAlgorithm and the model in the parameters of the config (i.e. "parameters": {"priceModel": "BlackScholes"}).
+"""
+#region imports
+from AlgorithmImports import *
+#endregion
+import os
+import sys
+
+# Make the packages of the repository importable when Lean loads this file directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from main import CentralAlgorithm
+from Initialization import SetupBaseStructure
+from Tools import Performance, GreeksProvider
+
+
+class PriceModelBenchmarkAlgorithm(CentralAlgorithm):
+    def Initialize(self):
+        self.SetStartDate(2023, 1, 3)
+        self.SetEndDate(2023, 1, 9)
+        self.SetCash(100_000)
+        self.logLevel = 1
+        self.timeResolution = Resolution.Minute
+
+        # Set the algorithm base variables and structures
+        self.structure = SetupBaseStructure(self).Setup()
+        self.performance = Performance(self)
+
+        # Same price model for all the option types (None -> keep the default Lean model)
+        self.priceModel = self.GetParameter("priceModel", "None")
+        modelName = None if self.priceModel == "None" else self.priceModel
+        self.optionPriceModels = {securityType: modelName for securityType in self.optionPriceModels}
+        # The Greeks are read through the lean tier (the price models are only assigned if a model uses it)
+        self.greeksProvider = GreeksProvider.create(self, "lean")
+
+        underlying = self.AddIndex("SPX", self.timeResolution).Symbol
+        option = self.AddIndexOption(underlying, "SPXW", self.timeResolution)
+        option.SetFilter(lambda universe: universe.IncludeWeeklys().Strikes(-8, 8).Expiration(0, 0))
+        self.optionSymbol = option.Symbol
+
+        self.bars = 0
+        self.contractBars = 0
+
+    def OnData(self, slice):
+        chain = slice.OptionChains.get(self.optionSymbol)
+        if chain is None:
+            return
+        contracts = list(chain)
+        for contract in contracts:
+            self.greeksProvider.delta(contract)
+            self.greeksProvider.gamma(contract)
+            self.greeksProvider.theta(contract)
+            self.greeksProvider.vega(contract)
+        self.bars += 1
+        self.contractBars += len(contracts)
+
+    def OnEndOfAlgorithm(self):
+        performance = self.executionTimer.performance
+        setPriceModel = [stats for name, stats in performance.items() if name.startswith("Initialization.SetupBaseStructure -> SetPriceModel")]
+        models = sum(stats["calls"] for stats in setPriceModel)
+        startup = sum(stats["elapsedTotal"] for stats in setPriceModel)
+        greeks = performance.get("Tools.GreeksProvider -> lean", {}).get("elapsedTotal", 0.0)
+
+        self.Log(f"Price model: {self.priceModel}")
+        self.Log(f"  startup:  {1000*startup:10.2f} ms for {models} models ({1e6*startup/max(1, models):8.2f} us/contract)")
+        self.Log(f"  per bar:  {1000*greeks/max(1, self.bars):10.3f} ms/bar over {self.bars} bars ({1e6*greeks/max(1, self.contractBars):8.2f} us/contract)")
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of the ProviderOptionContract allocations on a synthetic 200-contract strike window, over a session of bars:
+  - per bar: a new ProviderOptionContract (with a __dict__, as before the flyweight) is created for each symbol on every bar
+  - flyweight: ProviderOptionContract.get reuses the (slotted) instance of each symbol across bars
+
+Reports the time per bar (creating the contracts and reading their quotes), the number of instances created during the
+session and the peak memory traced by tracemalloc.
+
+Usage (from the repository root):
+    PYTHONPATH=.:Tests python -m Tests.benchmarks.provider_contract_benchmark
+"""
+import time
+import tracemalloc
+from datetime import datetime
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.ProviderOptionContract import ProviderOptionContract
+    from Tools.Timer import Timer
+
+
+class Symbol:
+    def __init__(self, strike, right):
+        self.ID = MagicMock(StrikePrice=strike, OptionRight=right, Date=datetime(2024, 1, 5))
+        self.Underlying = "SPX"
+
+
+class Security:
+    def __init__(self):
+        self.BidPrice = 1.0
+        self.AskPrice = 1.2
+        self.Price = 1.1
+        self.IsTradable = True
+        self.OpenInterest = 100
+
+
+# Same class with a __dict__ (ProviderOptionContract before __slots__)
+LegacyProviderOptionContract = type("LegacyProviderOptionContract", (ProviderOptionContract,), {})
+
+
+def session(algorithm, symbols, nBars, create):
+    start = time.perf_counter()
+    for bar in range(nBars):
+        spot = 4500.0 + 0.25*bar
+        contracts = [create(symbol, spot) for symbol in symbols]
+        # Read the quotes (as the filters of the Scanner/OrderBuilder do)
+        sum(contract.BidPrice + contract.AskPrice for contract in contracts)
+    return time.perf_counter() - start
+
+
+def measure(algorithm, symbols, nBars, create):
+    algorithm.providerOptionContracts = {}
+    tracemalloc.start()
+    elapsed = session(algorithm, symbols, nBars, create)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(nContracts = 200, nBars = 390):
+    algorithm = Factory.create_algorithm()
+    algorithm.executionTimer = Timer(algorithm)
+    symbols = [Symbol(4000.0 + 5*idx, right) for idx in range(nContracts//2) for right in ["Call", "Put"]]
+    algorithm.Securities = {symbol: Security() for symbol in symbols}
+
+    legacyCount = [0]
+    def createLegacy(symbol, spot):
+        legacyCount[0] += 1
+        return LegacyProviderOptionContract(symbol, spot, algorithm)
+
+    def createFlyweight(symbol, spot):
+        return ProviderOptionContract.get(symbol, spot, algorithm)
+
+    legacyElapsed, legacyPeak = measure(algorithm, symbols, nBars, createLegacy)
+    flyweightElapsed, flyweightPeak = measure(algorithm, symbols, nBars, createFlyweight)
+    flyweightCount = algorithm.executionTimer.counters.get("Tools.ProviderOptionContract -> created", 0)
+
+    print(f"Session: {nBars} bars x {nContracts} contracts")
+    print(f"  per bar (no slots):  {1000*legacyElapsed/nBars:8.3f} ms/bar, {legacyCount[0]:8d} instances, peak {legacyPeak/1024:8.1f} KiB")
+    print(f"  flyweight (slots):   {1000*flyweightElapsed/nBars:8.3f} ms/bar, {flyweightCount:8d} instances, peak {flyweightPeak/1024:8.1f} KiB")
+    print(f"  speed-up:            {legacyElapsed/flyweightElapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    run()
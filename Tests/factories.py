@@ -1,7 +1,25 @@
 from unittest.mock import MagicMock
 from datetime import datetime, timedelta
+import numpy as np
 from Tests.spec_helper import patch_imports
-from Tests.mocks.algorithm_imports import Symbol, Market, Resolution, QCAlgorithm
+from Tests.mocks.algorithm_imports import Symbol, Market, Resolution, QCAlgorithm, OptionRight
+
+
+class Contract:
+    """Plain option contract (a MagicMock would fake the BSMGreeks/BSMImpliedVolatility attributes)"""
+    def __init__(self, strike, right, expiry, bid=0.0, ask=0.0, underlyingLastPrice=100.0, underlying="TEST", **attributes):
+        self.Symbol = f"{underlying} {expiry:%y%m%d} {right} {strike}"
+        self.UnderlyingSymbol = underlying
+        self.UnderlyingLastPrice = underlyingLastPrice
+        self.Strike = strike
+        self.Right = right
+        self.Expiry = expiry
+        self.BidPrice = bid
+        self.AskPrice = ask
+        # Any other attribute read by the code under test (i.e. OpenInterest, ImpliedVolatility)
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
 
 class Factory:
     @staticmethod
@@ -24,6 +42,11 @@ class Factory:
         algorithm.emaMemory = 200
         algorithm.backtestMarketCloseCutoffTime = None
         algorithm.logLevel = 0
+        algorithm.useVolSurface = False
+        algorithm.greekIndicators = MagicMock()
+        algorithm.optionContractsSubscriptions = MagicMock()
+        algorithm.chainSnapshots = {}
+        algorithm.providerOptionContracts = {}
         
         # Add performance tracking
         algorithm.performance = MagicMock(OnUpdate=MagicMock())
@@ -50,4 +73,18 @@ class Factory:
         """Creates a mock option contract with proper property values"""
         from Tests.mocks.algorithm_imports import OptionContract
         contract = OptionContract()
-        return contract
\ No newline at end of file
+        return contract
+
+    @staticmethod
+    def create_chain(bsm, spot=100.0, sigma=0.2, expiry=None, spread=0.02):
+        """Creates a chain of plain contracts (see Contract) quoted around the BSM price for the given volatility"""
+        expiry = expiry or (bsm.context.Time + timedelta(days=10)).replace(hour=0, minute=0, second=0, microsecond=0)
+        chain = []
+        for strike in np.arange(80.0, 121.0, 5.0):
+            for right in [OptionRight.Call, OptionRight.Put]:
+                contract = Contract(strike, right, expiry, underlyingLastPrice=spot)
+                price = bsm.bsmPrice(contract, sigma, spotPrice=spot)
+                contract.BidPrice = price * (1 - spread/2)
+                contract.AskPrice = price * (1 + spread/2)
+                chain.append(contract)
+        return chain
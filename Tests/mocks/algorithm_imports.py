@@ -125,6 +125,8 @@ class PortfolioTarget:
         return f"PortfolioTarget({self.Symbol}, {self.Quantity}, {self.Tag})"
 
 class Resolution:
+    Tick = "Tick"
+    Second = "Second"
     Minute = "Minute"
     Hour = "Hour"
     Daily = "Daily"
@@ -308,6 +310,7 @@ class QCAlgorithm:
         
         # Add missing attributes
         self.universe_settings = MagicMock(resolution=None)
+        self.Settings = MagicMock(AutomaticIndicatorWarmUp=False)
         self.LiveMode = False
         self.strategies = []
         self._benchmark = None  # Add private benchmark variable
@@ -578,7 +581,23 @@ class OptionPriceModels:
     """Mock of QuantConnect's OptionPriceModels"""
     @staticmethod
     def CrankNicolsonFD():
-        return MagicMock()
+        return MagicMock(name="CrankNicolsonFD")
+
+    @staticmethod
+    def BlackScholes():
+        return MagicMock(name="BlackScholes")
+
+    @staticmethod
+    def BaroneAdesiWhaley():
+        return MagicMock(name="BaroneAdesiWhaley")
+
+    @staticmethod
+    def BjerksundStensland():
+        return MagicMock(name="BjerksundStensland")
+
+class NullOptionAssignmentModel:
+    """Mock of QuantConnect's NullOptionAssignmentModel"""
+    pass
 
 class StandardDeviationOfReturnsVolatilityModel:
     """Mock of QuantConnect's StandardDeviationOfReturnsVolatilityModel"""
@@ -816,6 +835,7 @@ __all__ = [
     'ImmediateFillModel',
     'SecurityPositionGroupModel',
     'OptionPriceModels',
+    'NullOptionAssignmentModel',
     'StandardDeviationOfReturnsVolatilityModel',
     'RiskManagementModel',
     'List',
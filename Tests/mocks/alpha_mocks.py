@@ -13,6 +13,8 @@ class MockBase:
         'scheduleStopTime': None,
         'scheduleFrequency': timedelta(minutes=5),
         'minimumTradeScheduleDistance': timedelta(days=1),
+        'tradeTimes': None,
+        'prefetchLeadTime': None,
         'checkForDuplicatePositions': True,
         'checkForOneDuplicateLeg': True,
         'maxActivePositions': 1,
@@ -141,6 +141,41 @@ with description('Alpha.Base') as self:
                 self.base.update(self.algorithm, self.mock_data)
                 self.algorithm.structure.checkOpenPositions.assert_called_once()
 
+            with it('skips the scan when the IV rank is outside of the range'):
+                self.base.ticker = "SPX"
+                contracts = [MagicMock()]
+                self.base.dataHandler.getOptionContracts = MagicMock(return_value=contracts)
+                self.base.scanner = MagicMock()
+                self.algorithm.ivHistory = MagicMock()
+                self.algorithm.ivHistory.record.return_value = MagicMock(__len__=MagicMock(return_value=500), ivRank=MagicMock(return_value=20.0))
+                with patch.object(Base, "PARAMETERS", {"ivRankRange": (50, 100)}, create=True):
+                    result = self.base.update(self.algorithm, self.mock_data)
+
+                expect(result).to(have_length(0))
+                self.algorithm.ivHistory.record.assert_called_once_with("SPX", contracts, dte=30)
+                self.base.scanner.Call.assert_not_called()
+
+            with it('records the IV history from the contracts of the DataHandler (useSlice = False)'):
+                self.base.ticker = "SPX"
+                contracts = [MagicMock()]
+                self.base.dataHandler.getOptionContracts = MagicMock(return_value=contracts)
+                self.base.dataHandler.getSliceOptionContracts = MagicMock(return_value=None)
+                self.algorithm.ivHistory = MagicMock()
+                self.algorithm.ivHistory.record.return_value = MagicMock(__len__=MagicMock(return_value=500), ivRank=MagicMock(return_value=70.0))
+                with patch.object(Base, "PARAMETERS", {"useSlice": False, "ivRankRange": (50, 100)}, create=True):
+                    expect(self.base.checkIVHistory(self.mock_data)).to(be_true)
+
+                self.algorithm.ivHistory.record.assert_called_once_with("SPX", contracts, dte=30)
+                self.base.dataHandler.getSliceOptionContracts.assert_not_called()
+
+            with it('scans the chain when the IV rank is within the range'):
+                self.base.ticker = "SPX"
+                self.base.dataHandler.getOptionContracts = MagicMock(return_value=[MagicMock()])
+                self.algorithm.ivHistory = MagicMock()
+                self.algorithm.ivHistory.record.return_value = MagicMock(__len__=MagicMock(return_value=500), ivRank=MagicMock(return_value=70.0))
+                with patch.object(Base, "PARAMETERS", {"ivRankRange": (50, 100)}, create=True):
+                    expect(self.base.checkIVHistory(self.mock_data)).to(be_true)
+
     with context('duplicate checking'):
         with before.each:
             self.current_time = datetime.now()
@@ -11,6 +11,7 @@ from Tests.mocks.module_mocks import ModuleMocks
 # Import after patching
 with patch_imports()[0], patch_imports()[1]:
     from Alpha.Utils.Scanner import Scanner
+    from Tools.StrategyDict import StrategyDict
     from Tests.mocks.algorithm_imports import (
         SecurityType, Resolution, OptionRight, Symbol,
         TradeBar, datetime, timedelta, time
@@ -147,6 +148,25 @@ with description('Alpha.Utils.Scanner') as self:
                 self.algorithm.workingOrders = {}
                 expect(self.scanner.hasReachedMaxOpenPositions()).to(be_false)
 
+        with context('StrategyDict'):
+            with it('uses the per-strategy counts'):
+                self.algorithm.allPositions = {
+                    "order1": MagicMock(strategyTag="TestStrategy"),
+                    "order2": MagicMock(strategyTag="OtherStrategy")
+                }
+                self.algorithm.openPositions = StrategyDict(lambda orderId: self.algorithm.allPositions[orderId].strategyTag)
+                self.algorithm.workingOrders = StrategyDict(lambda order: order.strategyTag)
+                self.algorithm.openPositions["pos1"] = "order1"
+                self.algorithm.openPositions["pos2"] = "order2"
+                expect(self.scanner.hasReachedMaxActivePositions()).to(be_false)
+
+                self.algorithm.workingOrders["order3"] = MagicMock(strategyTag="TestStrategy")
+                expect(self.scanner.hasReachedMaxActivePositions()).to(be_true)
+                expect(self.scanner.hasReachedMaxOpenPositions()).to(be_true)
+
+                del self.algorithm.workingOrders["order3"]
+                expect(self.scanner.hasReachedMaxOpenPositions()).to(be_false)
+
     with context('filterByExpiry'):
         with before.each:
             self.target_expiry = datetime.now() + timedelta(days=30)
@@ -170,6 +190,16 @@ with description('Alpha.Utils.Scanner') as self:
             self.scanner.filterByExpiry(self.chain, computeGreeks=True)
             self.scanner.bsm.setGreeks.assert_called_once()
 
+        with it('uses the expiry partition of the chain snapshot'):
+            snapshot = MagicMock(time=self.algorithm.Time, chain=self.chain)
+            snapshot.take.return_value = [self.chain[0]]
+            self.algorithm.chainSnapshots = {self.chain[0].UnderlyingSymbol: snapshot}
+
+            filtered = self.scanner.filterByExpiry(self.chain, self.target_expiry)
+
+            expect(filtered).to(equal([self.chain[0]]))
+            snapshot.expiryIndices.assert_called_once_with(self.target_expiry)
+
     with context('syncExpiryList'):
         with before.each:
             self.current_date = datetime.now().date()
@@ -212,6 +242,12 @@ with description('Alpha.Utils.Scanner') as self:
             self.scanner.expiryList[self.current_date] = ["existing"]
             self.scanner.syncExpiryList(self.chain)
             expect(self.scanner.expiryList[self.current_date]).to(equal(["existing"]))
+
+        with it('drops the expiry list of the previous days'):
+            previous_date = self.current_date - timedelta(days=1)
+            self.scanner.expiryList[previous_date] = ["previous"]
+            self.scanner.syncExpiryList(self.chain)
+            expect(list(self.scanner.expiryList.keys())).to(equal([self.current_date]))
             
         with it('filters expiries within DTE range'):
             # Change DTE range to only include one contract
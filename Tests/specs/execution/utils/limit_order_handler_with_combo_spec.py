@@ -17,6 +17,7 @@ with patch_imports()[0], patch_imports()[1]:
     from datetime import datetime, timedelta
     from Tests.mocks.algorithm_imports import UpdateOrderFields, OrderStatus, Leg
     from Strategy.Position import OrderType  # Import the actual OrderType class
+    from Tools import ContractUtils, GreeksProvider
 
 with description('LimitOrderHandlerWithCombo') as self:
     with before.each:
@@ -111,6 +112,7 @@ with description('LimitOrderHandlerWithCombo') as self:
         
         # Mock BSM
         self.handler.bsm.setGreeks = MagicMock()
+        self.handler.bsm.refreshGreeks = MagicMock()
         
         # Mock ComboLimitOrder with proper Leg creation
         self.mock_ticket = MagicMock()
@@ -132,6 +134,14 @@ with description('LimitOrderHandlerWithCombo') as self:
             
         Leg.Create = MagicMock(side_effect=leg_create_side_effect)
 
+    with context('initialization'):
+        with it('uses the greeks provider of the execution model'):
+            provider = GreeksProvider.create(self.algorithm, "bsm")
+            self.base.contractUtils = ContractUtils(self.algorithm, greeksProvider=provider)
+            handler = LimitOrderHandlerWithCombo(self.algorithm, self.base)
+
+            expect(handler.contractUtils.greeksProvider).to(equal(provider))
+
     with context('makeLimitOrder'):
         with it('creates combo limit order with correct legs'):
             # Execute
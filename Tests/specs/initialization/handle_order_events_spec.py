@@ -36,6 +36,7 @@ with description('HandleOrderEvents') as self:
             self.algorithm.charting = MagicMock()
             self.algorithm.recentlyClosedDTE = []
             self.algorithm.logger = MagicMock()
+            self.algorithm.structure = MagicMock()
             
             self.handler = HandleOrderEvents(self.algorithm, self.order_event)
 
@@ -161,4 +162,6 @@ with description('HandleOrderEvents') as self:
             expect(position.PnL).to(equal(200))
             expect(self.algorithm.openPositions).to_not(have_key("TEST_POS"))
             expect(self.algorithm.recentlyClosedDTE).to(have_length(1))
-            self.algorithm.charting.updateStats.assert_called_once_with(position) 
\ No newline at end of file
+            self.algorithm.charting.updateStats.assert_called_once_with(position)
+            # The legs are moved back to the scan resolution tier
+            self.algorithm.structure.updateResolutionTiers.assert_called_once_with([leg.symbol for leg in position.legs]) 
\ No newline at end of file
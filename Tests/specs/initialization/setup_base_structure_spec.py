@@ -9,6 +9,7 @@ from datetime import datetime, timedelta, time
 # Import after patching
 with patch_imports()[0], patch_imports()[1]:
     from Initialization.SetupBaseStructure import SetupBaseStructure
+    from Tools.SubscriptionRegistry import SubscriptionRegistry
     from Tests.mocks.algorithm_imports import (
         SecurityType, DataNormalizationMode, BrokerageName, 
         AccountType, Resolution, OptionRight, Symbol,
@@ -49,6 +50,10 @@ with description('SetupBaseStructure') as self:
             expect(hasattr(self.algorithm, 'executionTimer')).to(be_true)
             expect(hasattr(self.algorithm, 'optionContractsSubscriptions')).to(be_true)
             expect(self.algorithm.optionContractsSubscriptions).to(equal([]))
+            expect(self.algorithm.greeksCache.maxSize).to(equal(self.setup.DEFAULT_PARAMETERS['greeksCacheSize']))
+            expect(self.algorithm.greekIndicators.lazy).to(equal(self.setup.DEFAULT_PARAMETERS['lazyGreekIndicators']))
+            # The lazy Greek indicators are warmed up by GreekIndicators (not by the global setting)
+            expect(self.algorithm.Settings.AutomaticIndicatorWarmUp).to(be_false)
             
             # Verify method calls
             self.algorithm.SetSecurityInitializer.assert_called_once()
@@ -59,6 +64,7 @@ with description('SetupBaseStructure') as self:
             self.security = MagicMock()
             self.security.Type = SecurityType.Option
             self.security.Symbol = Factory.create_symbol()
+            self.algorithm.optionPriceModels = dict(SetupBaseStructure.DEFAULT_PARAMETERS['optionPriceModels'])
             
         with it('initializes option securities correctly'):
             self.setup.CompleteSecurityInitializer(self.security)
@@ -67,6 +73,32 @@ with description('SetupBaseStructure') as self:
             self.security.SetMarketPrice.assert_called()
             self.security.SetFillModel.assert_called()
             self.security.SetFeeModel.assert_called()
+            self.algorithm.greekIndicators.register.assert_called_with(self.security)
+
+        with it('assigns the option price model of the security type'):
+            self.setup.CompleteSecurityInitializer(self.security)
+            expect(repr(self.security.PriceModel)).to(contain('BaroneAdesiWhaley'))
+
+            self.security.Type = SecurityType.IndexOption
+            self.setup.CompleteSecurityInitializer(self.security)
+            expect(repr(self.security.PriceModel)).to(contain('BlackScholes'))
+
+        with it('keeps the default price model when set to None'):
+            self.algorithm.optionPriceModels[SecurityType.Option] = None
+            self.security.PriceModel = "default"
+            self.setup.CompleteSecurityInitializer(self.security)
+            expect(self.security.PriceModel).to(equal("default"))
+
+        with it('keeps the default price model when no model uses the lean Greeks'):
+            self.algorithm.greeksProviderTiers = {"bsm", "surface"}
+            self.security.PriceModel = "default"
+            self.setup.CompleteSecurityInitializer(self.security)
+            expect(self.security.PriceModel).to(equal("default"))
+
+        with it('assigns the option price model when a model uses the lean Greeks'):
+            self.algorithm.greeksProviderTiers = {"bsm", "lean"}
+            self.setup.CompleteSecurityInitializer(self.security)
+            expect(repr(self.security.PriceModel)).to(contain('BaroneAdesiWhaley'))
 
         with it('initializes equity securities correctly'):
             self.security.Type = SecurityType.Equity
@@ -137,7 +169,8 @@ with description('SetupBaseStructure') as self:
             self.algorithm.RemoveSecurity = MagicMock(side_effect=remove_security)
             self.algorithm.openPositions = {}
             self.algorithm.workingOrders = {}
-            self.algorithm.optionContractsSubscriptions = []  # Add this line
+            self.algorithm.optionContractsSubscriptions = SubscriptionRegistry(self.algorithm)
+            self.algorithm.subscriptionGCInterval = timedelta(minutes=30)
             
             # Add working orders setup with concrete datetime values
             current_time = datetime.now()
@@ -274,6 +307,113 @@ with description('SetupBaseStructure') as self:
             
             self.algorithm.charting.updateStats.assert_called_with(self.mock_position)
 
+    with context('collectSubscriptions'):
+        with before.each:
+            self.algorithm.Time = datetime(2024, 1, 10, 10, 0)
+            self.algorithm.subscriptionGCInterval = timedelta(minutes=30)
+            self.algorithm.optionContractsSubscriptions = SubscriptionRegistry(self.algorithm)
+            self.algorithm.Portfolio.__getitem__ = lambda _, symbol: MagicMock(Invested=symbol is self.invested)
+            self.algorithm.RemoveSecurity = MagicMock(side_effect=lambda symbol: self.algorithm.Securities.pop(symbol, None))
+
+            def contract(name, expiry):
+                symbol = MagicMock(ID=MagicMock(Date=expiry))
+                symbol.__repr__ = lambda _: name
+                self.algorithm.Securities[symbol] = MagicMock(Symbol=symbol, Type=SecurityType.IndexOption, HasData=True, Expiry=expiry)
+                return symbol
+
+            self.held = contract("held", datetime(2024, 1, 19))
+            self.outOfWindow = contract("outOfWindow", datetime(2024, 1, 19))
+            self.expired = contract("expired", datetime(2024, 1, 9))
+            self.invested = contract("invested", datetime(2024, 1, 19))
+            self.algorithm.optionContractsSubscriptions.acquire([self.held, self.expired], owner="tag1")
+            self.algorithm.optionContractsSubscriptions.acquire([self.outOfWindow, self.invested], owner=("scan", "SPXic"))
+            self.algorithm.optionContractsSubscriptions.release([self.outOfWindow, self.invested], owner=("scan", "SPXic"))
+            self.algorithm.optionContractsSubscriptions.subscribed.update([self.held, self.expired, self.outOfWindow, self.invested])
+            self.contract = contract
+
+        with it('removes the expired and the unreferenced contracts'):
+            reclaimed = self.setup.collectSubscriptions()
+
+            expect(reclaimed).to(equal(2))
+            expect(set(self.algorithm.Securities.keys())).to(equal({self.held, self.invested}))
+            expect(list(self.algorithm.optionContractsSubscriptions)).to(contain(self.held))
+            expect(self.algorithm.optionContractsSubscriptions.refCount(self.held)).to(equal(1))
+            self.algorithm.executionTimer.count.assert_called_with("Initialization.SetupBaseStructure -> collectSubscriptions -> reclaimed", 2)
+
+        with it('keeps the closed legs that are not subscribed through AddOptionContracts'):
+            # Leg of a strategy using the slice (option universe)
+            sliceLeg = self.contract("sliceLeg", datetime(2024, 1, 19))
+            self.algorithm.optionContractsSubscriptions.acquire([sliceLeg], owner="tag2")
+            self.algorithm.optionContractsSubscriptions.release(owner="tag2")
+
+            self.setup.collectSubscriptions()
+
+            expect(self.algorithm.Securities).to(have_key(sliceLeg))
+
+        with it('clears each expired contract once'):
+            self.setup.ClearSecurity = MagicMock()
+
+            reclaimed = self.setup.collectSubscriptions()
+
+            expect(reclaimed).to(equal(2))
+            expect(self.setup.ClearSecurity.call_count).to(equal(2))
+
+        with it('runs once per interval'):
+            self.algorithm.openPositions = {}
+            self.algorithm.workingOrders = {}
+            self.setup.checkOpenPositions()
+            expect(self.setup.nextSubscriptionGC).to(equal(datetime(2024, 1, 10, 10, 30)))
+
+            self.setup.collectSubscriptions = MagicMock()
+            self.algorithm.Time = datetime(2024, 1, 10, 10, 29)
+            self.setup.checkOpenPositions()
+            expect(self.setup.collectSubscriptions.called).to(be_false)
+            self.algorithm.Time = datetime(2024, 1, 10, 10, 30)
+            self.setup.checkOpenPositions()
+            expect(self.setup.collectSubscriptions.called).to(be_true)
+
+    with context('updateResolutionTiers'):
+        with before.each:
+            self.algorithm.legResolution = Resolution.Second
+            self.algorithm.scanResolution = None
+            self.algorithm.optionContractsSubscriptions = SubscriptionRegistry(self.algorithm)
+            self.algorithm.Portfolio.__getitem__ = lambda _, symbol: MagicMock(Invested=False)
+            self.algorithm.AddIndexOptionContract = MagicMock()
+            self.algorithm.RemoveSecurity = MagicMock(side_effect=lambda symbol: self.algorithm.Securities.pop(symbol, None))
+            self.algorithm.greekIndicators = MagicMock()
+            self.strategy = MagicMock(nameTag="SPXic")
+            self.algorithm.strategies = [self.strategy]
+            self.symbol = MagicMock(SecurityType=SecurityType.IndexOption)
+            self.algorithm.Securities[self.symbol] = MagicMock(Symbol=self.symbol)
+            subscriptions = self.algorithm.optionContractsSubscriptions
+            subscriptions.acquire([self.symbol], owner=("scan", "SPXic"))
+            subscriptions.resolutions[self.symbol] = Resolution.Minute
+
+        with it('upgrades the legs of a new position'):
+            self.algorithm.optionContractsSubscriptions.acquire([self.symbol], owner="tag1")
+            expect(self.setup.updateResolutionTiers([self.symbol])).to(equal(1))
+            self.algorithm.AddIndexOptionContract.assert_called_once_with(self.symbol, Resolution.Second)
+            expect(self.algorithm.optionContractsSubscriptions.resolutions[self.symbol]).to(equal(Resolution.Second))
+            # Already at the leg resolution
+            expect(self.setup.updateResolutionTiers([self.symbol])).to(equal(0))
+
+        with it('downgrades the legs of a closed position to the scan tier'):
+            subscriptions = self.algorithm.optionContractsSubscriptions
+            subscriptions.acquire([self.symbol], owner="tag1")
+            self.setup.updateResolutionTiers([self.symbol])
+            subscriptions.release(owner="tag1")
+            expect(self.setup.updateResolutionTiers([self.symbol])).to(equal(1))
+            # Removed: the scan window subscribes it again at the scan resolution
+            expect(self.symbol in subscriptions).to(be_false)
+            expect(self.algorithm.Securities).to_not(have_key(self.symbol))
+            self.strategy.dataHandler.releaseScanWindow.assert_called_once()
+
+        with it('does not change the tiers if the resolutions are the same'):
+            self.algorithm.legResolution = None
+            self.algorithm.optionContractsSubscriptions.acquire([self.symbol], owner="tag1")
+            expect(self.setup.updateResolutionTiers([self.symbol])).to(equal(0))
+            self.algorithm.AddIndexOptionContract.assert_not_called()
+
     with context('AddConfiguration'):
         with it('adds configuration parameters correctly'):
             test_params = {
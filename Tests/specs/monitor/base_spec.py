@@ -15,6 +15,7 @@ with patch_imports()[0], patch_imports()[1]:
         RiskManagementModel, List, SecurityChanges, SecuritiesDict
     )
     from Initialization.SetupBaseStructure import SetupBaseStructure
+    from Tools.QuoteTracker import QuoteTracker
 
 with description('Monitor.Base') as self:
     with before.each:
@@ -144,6 +145,33 @@ with description('Monitor.Base') as self:
             result = self.monitor.ManageRisk(self.algorithm, [])
             self.mock_position.getPositionValue.assert_called_once()
 
+    with context('updatePositionValue'):
+        with before.each:
+            self.algorithm.quoteTracker = QuoteTracker(self.algorithm)
+            self.algorithm.Securities["leg1"] = MagicMock(BidPrice=1.0, AskPrice=1.2)
+            self.position = MagicMock(orderTag="tag1", legs=[MagicMock(symbol="leg1")])
+
+        with it('skips the valuation if the quotes of the legs did not change'):
+            self.monitor.updatePositionValue(self.position)
+            self.algorithm.Time += timedelta(minutes=1)
+            self.monitor.updatePositionValue(self.position)
+
+            expect(self.position.getPositionValue.call_count).to(equal(1))
+            self.algorithm.executionTimer.count.assert_any_call("Monitor.Base -> updatePositionValue -> clean")
+
+        with it('revalues the position if the quotes of a leg changed'):
+            self.monitor.updatePositionValue(self.position)
+            self.algorithm.Time += timedelta(minutes=1)
+            self.algorithm.Securities["leg1"].AskPrice = 1.3
+            self.monitor.updatePositionValue(self.position)
+
+            expect(self.position.getPositionValue.call_count).to(equal(2))
+
+        with it('does not mark the legs as observed in the QuoteTracker'):
+            self.monitor.updatePositionValue(self.position)
+
+            expect(self.algorithm.quoteTracker.version("leg1")).to(equal(None))
+
     with context('checkStopLoss'):
         with before.each:
             self.position = MagicMock()
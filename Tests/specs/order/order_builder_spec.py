@@ -155,6 +155,28 @@ with description('OrderBuilder') as self:
             result = self.builder.getDeltaContract(self.delta_contracts, delta=10)  # 0.1 delta
             expect(abs(result.BSMGreeks.Delta)).to(equal(0.2))
 
+        with it('reads the deltas from the greeks provider of the strategy'):
+            provider = MagicMock()
+            provider.name = "batch"
+            # Deltas of the provider in reverse order of the BSM Greeks
+            provider.delta = MagicMock(side_effect=lambda contract: {95: 0.2, 100: 0.5, 105: 0.7}[contract.Strike])
+            with patch_imports()[0], patch_imports()[1]:
+                builder = OrderBuilder(self.algorithm, greeksProvider=provider)
+            builder.bsm.setGreeks = MagicMock()
+
+            result = builder.getDeltaContract(self.delta_contracts, delta=65)
+
+            expect(result.Strike).to(equal(105))
+            builder.bsm.setGreeks.assert_not_called()
+
+        with it('keeps the BSM greeks for the lean tier'):
+            provider = MagicMock()
+            provider.name = "lean"
+            with patch_imports()[0], patch_imports()[1]:
+                builder = OrderBuilder(self.algorithm, greeksProvider=provider)
+
+            expect(builder.contractUtils.greeksProvider).to(be_none)
+
     with context('getSpread'):
         with before.each:
             # Create mock contracts for spread testing
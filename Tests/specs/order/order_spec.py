@@ -1,5 +1,5 @@
 from mamba import description, context, it, before
-from expects import expect, equal, be_true, be_false, contain, have_length, have_key, be_none
+from expects import expect, equal, be_true, be_false, contain, have_length, have_key, be_none, be_below
 from unittest.mock import patch, MagicMock, call
 from datetime import datetime, timedelta, time
 from Tests.spec_helper import patch_imports
@@ -9,6 +9,7 @@ from Tests.mocks.module_mocks import ModuleMocks
 # Import after patching
 with patch_imports()[0], patch_imports()[1]:
     from Order.Order import Order
+    from Tools.BSMLibrary import BSM
     from Tests.mocks.algorithm_imports import (
         OrderStatus, Symbol, TradeBar, datetime, timedelta,
         Insight, InsightDirection, PortfolioTarget, OptionRight,
@@ -132,17 +133,29 @@ with description('Order') as self:
 
     with context('fValue'):
         with it('calculates financial value correctly'):
-            # Mock BSM price calculation
-            self.order.bsm.bsmPrice = MagicMock(return_value=1.0)
-            
             result = self.order.fValue(
                 spotPrice=100,
                 contracts=[self.mock_contract],
                 sides=[1],
                 openPremium=0.5
             )
-            
-            expect(result).to(equal(1.5))  # openPremium + bsmPrice * side
+
+            # openPremium + bsmPrice * side
+            expected = 0.5 + BSM(self.algorithm).bsmPrice(self.mock_contract, sigma=0.2, spotPrice=100)
+            expect(abs(result - expected)).to(be_below(1e-10))
+
+        with it('calculates financial value at a future time'):
+            atTime = self.algorithm.Time + timedelta(days=5)
+            result = self.order.fValue(
+                spotPrice=105,
+                contracts=[self.mock_contract],
+                sides=[-1],
+                atTime=atTime,
+                openPremium=2.0
+            )
+
+            expected = 2.0 - BSM(self.algorithm).bsmPrice(self.mock_contract, sigma=0.2, spotPrice=105, atTime=atTime)
+            expect(abs(result - expected)).to(be_below(1e-10))
 
     with context('getPayoff'):
         with it('calculates call option payoff correctly'):
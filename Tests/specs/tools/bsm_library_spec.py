@@ -0,0 +1,315 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_true, be_false, be_within, be_below, have_length
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+from Tests.mocks.module_mocks import ModuleMocks
+from datetime import datetime, timedelta
+import numpy as np
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.BSMLibrary import BSM, BSMGreeks
+    from Tools.GreeksCache import GreeksCache
+    from Tools.QuoteTracker import QuoteTracker
+    from Tests.mocks.algorithm_imports import OptionRight, SecurityType
+
+
+with description('BSM') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.Securities = {}
+            self.algorithm.executionTimer = MagicMock()
+            self.bsm = BSM(self.algorithm)
+            self.chain = Factory.create_chain(self.bsm)
+
+    with context('bsmBatch'):
+        with it('matches the scalar pricing functions'):
+            spot = 100.0
+            sigma = 0.25
+            tau = np.array([self.bsm.optionTau(c) for c in self.chain])
+            strikes = np.array([c.Strike for c in self.chain])
+            isCall = np.array([c.Right == OptionRight.Call for c in self.chain])
+
+            result = self.bsm.bsmBatch(strikes, isCall, tau, spot, sigma)
+
+            for idx, contract in enumerate(self.chain):
+                expect(abs(result["price"][idx] - self.bsm.bsmPrice(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+                expect(abs(result["delta"][idx] - self.bsm.bsmDelta(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+                expect(abs(result["gamma"][idx] - self.bsm.bsmGamma(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+                expect(abs(result["vega"][idx] - self.bsm.bsmVega(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+                expect(abs(result["theta"][idx] - self.bsm.bsmTheta(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+                expect(abs(result["rho"][idx] - self.bsm.bsmRho(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+                expect(abs(result["vomma"][idx] - self.bsm.bsmVomma(contract, sigma, spotPrice = spot))).to(be_below(1e-10))
+
+        with it('handles expired contracts and zero volatility like the scalar functions'):
+            strikes = np.array([90.0, 110.0, 90.0, 110.0])
+            isCall = np.array([True, True, False, False])
+
+            result = self.bsm.bsmBatch(strikes, isCall, np.array([0.0, 0.1, 0.1, 0.0]), 100.0, np.array([0.2, 0.0, 0.0, 0.2]))
+
+            # ITM Call -> Delta = 1, OTM Call -> Delta = 0, OTM Put -> Delta = 0, ITM Put -> Delta = -1
+            expect(list(result["delta"])).to(equal([1.0, 0.0, -0.0, -1.0]))
+            expect(bool(np.all(np.isinf(result["gamma"])))).to(be_true)
+            expect(bool(np.isinf(result["vomma"][1]))).to(be_true)
+
+        with it('prices like bsmPriceBatch'):
+            strikes = np.array([90.0, 100.0, 110.0, 90.0, 100.0, 110.0])
+            isCall = np.array([True, True, True, False, False, False])
+            tau = np.array([0.1, 0.0, 0.1, 0.1, 0.1, 0.0])
+            sigma = np.array([0.2, 0.2, 0.0, 0.3, 0.2, 0.2])
+
+            price = self.bsm.bsmPriceBatch(strikes, isCall, tau, 100.0, sigma)
+
+            expect(float(np.max(np.abs(price - self.bsm.bsmBatch(strikes, isCall, tau, 100.0, sigma)["price"])))).to(be_below(1e-12))
+
+    with context('black76Batch'):
+        with before.each:
+            self.forward = 4800.0
+            self.sigma = 0.18
+            self.strikes = np.arange(4500.0, 5101.0, 100.0)
+            self.tau = 30/365.0
+
+        with it('matches BSM on the discounted futures price'):
+            r = self.bsm.riskFreeRate
+            for isCall in [True, False]:
+                black76 = self.bsm.black76Batch(self.strikes, isCall, self.tau, self.forward, self.sigma)
+                bsm = self.bsm.bsmBatch(self.strikes, isCall, self.tau, self.forward * np.exp(-r*self.tau), self.sigma)
+                discount = np.exp(-r*self.tau)
+                expect(float(np.max(np.abs(black76["price"] - bsm["price"])))).to(be_below(1e-9))
+                expect(float(np.max(np.abs(black76["delta"] - bsm["delta"] * discount)))).to(be_below(1e-12))
+                expect(float(np.max(np.abs(black76["gamma"] - bsm["gamma"] * discount**2)))).to(be_below(1e-12))
+                expect(float(np.max(np.abs(black76["vega"] - bsm["vega"])))).to(be_below(1e-9))
+
+        with it('computes theta and rho as the derivatives of the price'):
+            h = 1e-6
+            for isCall in [True, False]:
+                result = self.bsm.black76Batch(self.strikes, isCall, self.tau, self.forward, self.sigma)
+                up = self.bsm.black76Batch(self.strikes, isCall, self.tau + h, self.forward, self.sigma)["price"]
+                down = self.bsm.black76Batch(self.strikes, isCall, self.tau - h, self.forward, self.sigma)["price"]
+                theta = -(up - down)/(2*h)/self.bsm.tradingDays
+                expect(float(np.max(np.abs(result["theta"] - theta)))).to(be_below(1e-5))
+                rateUp = self.bsm.black76Batch(self.strikes, isCall, self.tau, self.forward, self.sigma, ir = self.bsm.riskFreeRate + h)["price"]
+                rateDown = self.bsm.black76Batch(self.strikes, isCall, self.tau, self.forward, self.sigma, ir = self.bsm.riskFreeRate - h)["price"]
+                expect(float(np.max(np.abs(result["rho"] - (rateUp - rateDown)/(2*h))))).to(be_below(1e-5))
+
+        with it('prices future options in computeGreeksBatch and computeGreeks'):
+            expiry = (self.algorithm.Time + timedelta(days = 30)).replace(hour = 0, minute = 0)
+            tau = self.bsm.optionTau(Contract(0, OptionRight.Call, expiry, 0, 0))
+            chain = []
+            for strike in self.strikes:
+                contract = Contract(strike, OptionRight.Call, expiry, 0.0, 0.0, underlyingLastPrice = self.forward)
+                contract.Symbol = MagicMock(SecurityType = SecurityType.FutureOption)
+                price = float(self.bsm.black76Batch(strike, True, tau, self.forward, self.sigma)["price"])
+                contract.BidPrice = price - 0.005
+                contract.AskPrice = price + 0.005
+                chain.append(contract)
+
+            greeksList = self.bsm.computeGreeksBatch(chain)
+            expected = self.bsm.black76Batch(self.strikes, True, tau, self.forward, self.sigma)
+            for idx, greeks in enumerate(greeksList):
+                expect(abs(greeks.IV - self.sigma)).to(be_below(1e-5))
+                expect(abs(greeks.Delta - expected["delta"][idx])).to(be_below(1e-4))
+
+            single = self.bsm.computeGreeks(chain[3])
+            expect(abs(single.Delta - greeksList[3].Delta)).to(be_below(1e-8))
+
+    with context('bsmFused'):
+        with it('matches the individual pricing functions to 1e-10'):
+            def same(a, b):
+                if np.isnan(a) or np.isnan(b):
+                    return bool(np.isnan(a) and np.isnan(b))
+                if np.isinf(a) or np.isinf(b):
+                    return bool(a == b)
+                return bool(abs(a - b) < 1e-10)
+
+            for contract in self.chain:
+                isCall = contract.Right == OptionRight.Call
+                for spot in [90.0, 100.0, 110.0]:
+                    for tau in [0.0, 1.0/365.0, 0.1, 1.0]:
+                        for sigma in [0.0, 0.05, 0.2, 1.0]:
+                            for ir in [None, 0.05]:
+                                result = self.bsm.bsmFused(contract.Strike, isCall, tau, spot, sigma, ir = ir)
+                                kwargs = dict(tau = tau, ir = ir, spotPrice = spot)
+                                expected = {
+                                    "price": self.bsm.bsmPrice(contract, sigma, **kwargs),
+                                    "delta": self.bsm.bsmDelta(contract, sigma, **kwargs),
+                                    "gamma": self.bsm.bsmGamma(contract, sigma, **kwargs),
+                                    "vega": self.bsm.bsmVega(contract, sigma, **kwargs),
+                                    "theta": self.bsm.bsmTheta(contract, sigma, **kwargs),
+                                    "rho": self.bsm.bsmRho(contract, sigma, **kwargs),
+                                    "vomma": self.bsm.bsmVomma(contract, sigma, **kwargs),
+                                }
+                                for key, value in expected.items():
+                                    expect(same(result[key], value)).to(be_true)
+
+    with context('bsmIVBatch'):
+        with it('matches the scalar IV solver'):
+            tau = np.array([self.bsm.optionTau(c) for c in self.chain])
+            strikes = np.array([c.Strike for c in self.chain])
+            isCall = np.array([c.Right == OptionRight.Call for c in self.chain])
+            prices = np.array([0.5*(c.BidPrice + c.AskPrice) for c in self.chain])
+
+            iv, converged = self.bsm.bsmIVBatch(prices, strikes, isCall, tau, 100.0)
+
+            expect(bool(np.all(converged))).to(be_true)
+            for idx, contract in enumerate(self.chain):
+                expect(abs(iv[idx] - self.bsm.bsmIV(contract, tau = tau[idx]))).to(be_below(1e-5))
+
+        with it('flags the contracts that cannot be solved'):
+            # Expired contract, price below the intrinsic value, price above the spot
+            iv, converged = self.bsm.bsmIVBatch(np.array([1.0, 5.0, 150.0]), np.array([100.0, 90.0, 100.0]), np.array([True, True, True]), np.array([0.0, 0.1, 0.1]), 100.0)
+
+            expect(list(converged)).to(equal([False, False, False]))
+            expect(list(iv)).to(equal([0.0, 0.0, 0.0]))
+
+        with it('starts from the previous IV when provided'):
+            strikes = np.array([100.0])
+            tau = np.array([0.1])
+            price = self.bsm.bsmBatch(strikes, True, tau, 100.0, 0.3)["price"]
+
+            iv, converged = self.bsm.bsmIVBatch(price, strikes, True, tau, 100.0, x0 = np.array([0.29]))
+
+            expect(bool(converged[0])).to(be_true)
+            expect(iv[0]).to(be_within(0.2999, 0.3001))
+
+    with context('setGreeks'):
+        with it('attaches BSMGreeks matching computeGreeks to every contract'):
+            expected = [self.bsm.computeGreeks(contract) for contract in self.chain]
+
+            self.bsm.setGreeks(self.chain)
+
+            for contract, greeks in zip(self.chain, expected):
+                expect(contract.BSMGreeks.lastUpdated).to(equal(self.algorithm.Time))
+                expect(contract.BSMGreeks.Delta).to(equal(greeks.Delta))
+                expect(contract.BSMGreeks.Gamma).to(equal(greeks.Gamma))
+                expect(contract.BSMGreeks.Vega).to(equal(greeks.Vega))
+                expect(contract.BSMGreeks.Theta).to(equal(greeks.Theta))
+                expect(contract.BSMGreeks.Rho).to(equal(greeks.Rho))
+                expect(contract.BSMGreeks.IV).to(be_within(greeks.IV - 1e-5, greeks.IV + 1e-5))
+                expect(contract.BSMGreeks.IVConverged).to(be_true)
+
+        with it('recovers the volatility used to quote the chain'):
+            self.bsm.setGreeks(self.chain)
+
+            atm = [contract for contract in self.chain if contract.Strike == 100.0]
+            for contract in atm:
+                expect(contract.BSMImpliedVolatility).to(be_within(0.199, 0.201))
+
+        with it('skips the contracts already updated during the current bar'):
+            greeks = BSMGreeks(delta = 0.5, lastUpdated = self.algorithm.Time, precision = None)
+            self.chain[0].BSMGreeks = greeks
+
+            result = self.bsm.computeGreeksBatch(self.chain, saveIt = True)
+
+            expect(result).to(have_length(len(self.chain)))
+            expect(self.chain[0].BSMGreeks).to(equal(greeks))
+
+    with context('refreshGreeks'):
+        with before.each:
+            self.contract = [c for c in self.chain if c.Strike == 100.0 and c.Right == OptionRight.Call][0]
+            self.bsm.setGreeks([self.contract])
+            self.anchorGreeks = self.contract.BSMGreeks
+
+        def move(self, minutes, spot, sigma = 0.2):
+            """Moves the clock and re-quotes the contract at the given spot and volatility"""
+            self.algorithm.Time += timedelta(minutes = minutes)
+            self.contract.UnderlyingLastPrice = spot
+            price = self.bsm.bsmPrice(self.contract, sigma, spotPrice = spot)
+            self.contract.BidPrice = price - 0.01
+            self.contract.AskPrice = price + 0.01
+
+        with it('approximates the Greeks for small spot moves'):
+            self.move(5, 100.1)
+            expected = self.bsm.computeGreeks(self.contract)
+
+            self.bsm.refreshGreeks([self.contract])
+
+            expect(self.contract.BSMGreeks).not_to(equal(self.anchorGreeks))
+            expect(self.contract.BSMGreeks.lastUpdated).to(equal(self.algorithm.Time))
+            expect(self.contract.BSMGreeks.Delta).to(be_within(expected.Delta - 1e-3, expected.Delta + 1e-3))
+            expect(self.contract.BSMGreeks.IV).to(be_within(expected.IV - 1e-3, expected.IV + 1e-3))
+            self.algorithm.executionTimer.count.assert_called_with("Tools.BSMLibrary -> refreshGreeks -> approximate")
+
+        with it('falls back to a full solve when the spot moves too much'):
+            self.move(5, 101.0)
+
+            self.bsm.refreshGreeks([self.contract])
+
+            expect(self.contract.BSMGreeks.anchor["lastUpdated"]).to(equal(self.algorithm.Time))
+            self.algorithm.executionTimer.count.assert_called_with("Tools.BSMLibrary -> refreshGreeks -> full")
+
+        with it('falls back to a full solve when the anchor is too old'):
+            self.move(11, 100.0)
+
+            self.bsm.refreshGreeks(self.contract)
+
+            self.algorithm.executionTimer.count.assert_called_with("Tools.BSMLibrary -> refreshGreeks -> full")
+
+        with it('falls back to a full solve when the volatility changes too much'):
+            self.move(1, 100.0, sigma = 0.25)
+
+            self.bsm.refreshGreeks(self.contract)
+
+            expect(self.contract.BSMGreeks.IV).to(be_within(0.249, 0.251))
+            self.algorithm.executionTimer.count.assert_called_with("Tools.BSMLibrary -> refreshGreeks -> full")
+
+    with context('greeksCache'):
+        with before.each:
+            self.algorithm.greeksCache = GreeksCache(self.algorithm)
+
+        with it('reuses the Greeks of recreated contract objects within the same bar'):
+            self.bsm.setGreeks(self.chain)
+            # Recreate the chain (same symbols and quotes): this is what happens with ProviderOptionContract on every bar
+            chain = Factory.create_chain(self.bsm)
+
+            self.bsm.setGreeks(chain)
+
+            expect(self.algorithm.greeksCache.hits).to(equal(len(chain)))
+            for old, new in zip(self.chain, chain):
+                expect(new.BSMGreeks).to(equal(old.BSMGreeks))
+
+        with it('is shared between BSM instances'):
+            greeks = self.bsm.computeGreeks(self.chain[0])
+
+            expect(BSM(self.algorithm).computeGreeks(self.chain[0])).to(equal(greeks))
+            expect(self.algorithm.greeksCache.hits).to(equal(1))
+
+        with it('misses when the mid-price changes'):
+            self.bsm.setGreeks(self.chain)
+            chain = Factory.create_chain(self.bsm, sigma = 0.25)
+
+            self.bsm.setGreeks(chain)
+
+            expect(self.algorithm.greeksCache.hits).to(equal(0))
+
+    with context('quoteTracker'):
+        with before.each:
+            self.algorithm.logger = MagicMock()
+            self.algorithm.quoteTracker = QuoteTracker(self.algorithm)
+            for contract in self.chain:
+                self.algorithm.quoteTracker.observe(contract.Symbol, contract.BidPrice, contract.AskPrice, spot = 100.0)
+            self.greeks = self.bsm.computeGreeksBatch(self.chain, saveIt = True)
+            # Next bar with the same quotes
+            self.algorithm.Time += timedelta(minutes = 1)
+            for contract in self.chain:
+                self.algorithm.quoteTracker.observe(contract.Symbol, contract.BidPrice, contract.AskPrice, spot = 100.0)
+
+        with it('reuses the Greeks of the clean contracts'):
+            greeks = self.bsm.computeGreeksBatch(self.chain, saveIt = True)
+
+            for old, new in zip(self.greeks, greeks):
+                expect(new).to(equal(old))
+
+        with it('does not reuse the Greeks when a spot price is given'):
+            greeks = self.bsm.computeGreeksBatch(self.chain, spotPrice = 105.0)
+            # Same quotes on new contract objects (nothing to reuse)
+            expected = self.bsm.computeGreeksBatch(Factory.create_chain(self.bsm), spotPrice = 105.0)
+
+            for old, new, exp in zip(self.greeks, greeks, expected):
+                expect(new).not_to(equal(old))
+                expect(new.Delta).to(equal(exp.Delta))
+
+    def cleanup(self):
+        ModuleMocks.cleanup()
@@ -0,0 +1,95 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_true, have_length
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+from datetime import datetime, timedelta
+import numpy as np
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.ChainSnapshot import ChainSnapshot
+    from Tools.QuoteTracker import QuoteTracker
+    from Tests.mocks.algorithm_imports import OptionRight
+
+
+with description('ChainSnapshot') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.Securities = {}
+            self.algorithm.executionTimer = MagicMock()
+            self.near = datetime(2024, 1, 5)
+            self.far = datetime(2024, 1, 19)
+            self.chain = []
+            for expiry in [self.far, self.near]:
+                for strike in [110, 90, 100, 95, 105]:
+                    for right in [OptionRight.Call, OptionRight.Put]:
+                        price = max(0.5, (strike - 100 if right == OptionRight.Call else 100 - strike) + 2)
+                        self.chain.append(Contract(strike, right, expiry, price - 0.1, price + 0.1, underlying="SPX", OpenInterest=100, IsTradable=(strike != 105)))
+            self.snapshot = ChainSnapshot.build(self.algorithm, self.chain)
+
+    with context('build'):
+        with it('reads the columns of each contract'):
+            expect(len(self.snapshot)).to(equal(20))
+            expect(self.snapshot.strike.tolist()).to(equal([float(contract.Strike) for contract in self.chain]))
+            expect(bool(np.allclose(self.snapshot.mid, [0.5 * (c.BidPrice + c.AskPrice) for c in self.chain]))).to(be_true)
+            expect(bool(np.allclose(self.snapshot.spread, 0.2))).to(be_true)
+            expect(sorted(set(self.snapshot.dte.tolist()))).to(equal([3, 17]))
+
+        with it('partitions the contracts by expiry sorted by strike'):
+            contracts = self.snapshot.take(self.snapshot.expiryIndices(self.near))
+
+            expect(contracts).to(have_length(10))
+            expect({contract.Expiry for contract in contracts}).to(equal({self.near}))
+            strikes = [contract.Strike for contract in contracts]
+            expect(strikes).to(equal(sorted(strikes)))
+
+    with context('filter'):
+        with it('matches the list based filter'):
+            contracts = [contract for contract in self.chain if contract.Expiry == self.near]
+            snapshot, idx = ChainSnapshot.get(self.algorithm, contracts)
+            result = snapshot.take(snapshot.filter(idx, right=OptionRight.Put, fromStrike=92, toStrike=106, fromPrice=1.0, toPrice=8.0, tradable=True, reverse=True))
+
+            expected = sorted([contract for contract in contracts
+                               if contract.Right == OptionRight.Put and 92 <= contract.Strike <= 106 and contract.IsTradable
+                               and 1.0 <= 0.5 * (contract.BidPrice + contract.AskPrice) <= 8.0], key=lambda x: x.Strike, reverse=True)
+            expect(result).to(equal(expected))
+            expect(snapshot).to(equal(self.snapshot))
+
+    with context('get'):
+        with it('reuses the snapshot of the current bar'):
+            snapshot, idx = ChainSnapshot.get(self.algorithm, self.chain[3:7])
+
+            expect(snapshot).to(equal(self.snapshot))
+            expect(idx.tolist()).to(equal([3, 4, 5, 6]))
+            self.algorithm.executionTimer.count.assert_called_with("Tools.ChainSnapshot -> hits")
+
+        with it('builds a new snapshot on the next bar'):
+            self.algorithm.Time += timedelta(minutes=1)
+            snapshot, idx = ChainSnapshot.get(self.algorithm, self.chain[3:7])
+
+            expect(len(snapshot)).to(equal(4))
+            expect(ChainSnapshot.cached(self.algorithm, self.chain)).to(equal(snapshot))
+
+        with it('builds a new snapshot for contracts that are not in the chain'):
+            other = Contract(120, OptionRight.Call, self.near, 0.1, 0.2, underlying="SPX", OpenInterest=100, IsTradable=True)
+            snapshot, idx = ChainSnapshot.get(self.algorithm, [self.chain[0], other])
+
+            expect(len(snapshot)).to(equal(2))
+            # The snapshot of the chain is still cached
+            expect(ChainSnapshot.cached(self.algorithm, self.chain)).to(equal(self.snapshot))
+
+    with context('quote tracker'):
+        with it('reuses the mid-prices of the contracts whose quotes did not change'):
+            self.algorithm.logger = MagicMock()
+            self.algorithm.quoteTracker = QuoteTracker(self.algorithm)
+            ChainSnapshot.build(self.algorithm, self.chain)
+            self.algorithm.quoteTracker.setMid(self.chain[0].Symbol, 42.0)
+            self.chain[1].AskPrice += 0.2
+            self.algorithm.Time += timedelta(minutes=1)
+            snapshot = ChainSnapshot.build(self.algorithm, self.chain)
+
+            expect(snapshot.dirty.tolist()).to(equal([False, True] + [False] * 18))
+            expect(float(snapshot.mid[0])).to(equal(42.0))
+            expect(float(snapshot.mid[1])).to(equal(0.5 * (self.chain[1].BidPrice + self.chain[1].AskPrice)))
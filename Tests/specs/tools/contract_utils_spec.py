@@ -14,6 +14,7 @@ with description('ContractUtils') as self:
     with before.each:
         with patch_imports()[0], patch_imports()[1]:
             self.algorithm = Factory.create_algorithm()
+            self.algorithm.executionTimer = MagicMock()
             self.contract_utils = ContractUtils(self.algorithm)
             self.option_contract = Factory.create_option_contract()
 
@@ -90,6 +91,12 @@ with description('ContractUtils') as self:
                     delta = self.contract_utils.delta(self.option_contract)
                     expect(delta).to(equal(0.0))
 
+            with it('times the read of the Lean Greeks'):
+                with patch_imports()[0], patch_imports()[1]:
+                    self.contract_utils.delta(self.option_contract)
+                    self.algorithm.executionTimer.start.assert_called_once_with("Tools.GreeksProvider -> lean")
+                    self.algorithm.executionTimer.stop.assert_called_once_with("Tools.GreeksProvider -> lean")
+
         with context('gamma'):
             with it('returns the gamma'):
                 with patch_imports()[0], patch_imports()[1]:
@@ -1,4 +1,4 @@
-from mamba import description, context, it, before
+from mamba import description, context, it, before, after
 from expects import expect, equal, be_true, be_false, contain, have_length, be_none
 from unittest.mock import patch, MagicMock, call
 from Tests.spec_helper import patch_imports
@@ -13,6 +13,8 @@ from datetime import timedelta, datetime
 patch_contexts = patch_imports()
 with patch_contexts[0], patch_contexts[1]:
     from Tools.DataHandler import DataHandler
+    from Tools.OptionContractListCache import OptionContractListCache
+    from Tools.SubscriptionRegistry import SubscriptionRegistry
 
 with description('DataHandler') as self:
     with before.each:
@@ -36,7 +38,7 @@ with description('DataHandler') as self:
             self.data_handler = DataHandler(self.algorithm, self.ticker, self.strategy)
             self.algorithm.logger = MagicMock()
             self.algorithm.executionTimer = MagicMock()
-            self.algorithm.optionContractsSubscriptions = []
+            self.algorithm.optionContractsSubscriptions = SubscriptionRegistry(self.algorithm)
 
     with context('initialization'):
         with it('sets context, ticker and strategy correctly'):
@@ -112,8 +114,8 @@ with description('DataHandler') as self:
             # Create a custom __eq__ method for the symbols to handle dictionary lookup
             self.symbol1.__eq__ = lambda x: str(x) == str(self.symbol1)
             self.symbol2.__eq__ = lambda x: str(x) == str(self.symbol2)
-            self.symbol1.__hash__ = lambda: hash(str(self.symbol1))
-            self.symbol2.__hash__ = lambda: hash(str(self.symbol2))
+            self.symbol1.__hash__ = lambda _: hash(str(self.symbol1))
+            self.symbol2.__hash__ = lambda _: hash(str(self.symbol2))
             
             self.symbols = [
                 MagicMock(
@@ -160,6 +162,223 @@ with description('DataHandler') as self:
             )
             expect(result).to(be_none)
 
+    with context('incremental strike window'):
+        with before.each:
+            self.spx = DataHandler(self.algorithm, "SPX", self.strategy)
+            self.strategy.underlyingSymbol = "SPX"
+            self.strategy.contractUtils = None
+            self.underlying = MagicMock(Price=4000.0)
+            # Every option contract is a tradable security
+            self.algorithm.Securities = MagicMock()
+            self.algorithm.Securities.__getitem__ = lambda _, key: self.underlying if key == "SPX" else MagicMock(IsTradable=True)
+            expiry = self.algorithm.Time + timedelta(days=1)
+            self.symbols = [
+                MagicMock(ID=MagicMock(Date=expiry, StrikePrice=float(strike), OptionRight=right))
+                for strike in range(3900, 4105, 5) for right in ["Call", "Put"]
+            ]
+
+        with it('matches the full rebuild as the underlying moves'):
+            def fullRebuild(spot):
+                atm = sorted(self.symbols, key=lambda x: abs(x.ID.StrikePrice - spot))[0].ID.StrikePrice
+                strikes = sorted(set(x.ID.StrikePrice for x in self.symbols))
+                rank = strikes.index(atm)
+                low, high = strikes[max(0, rank - 3 + 1)], strikes[min(rank + 3 - 1, len(strikes) - 1)]
+                return [x for x in self.symbols if low <= x.ID.StrikePrice <= high]
+
+            for spot in [4000.0, 4001.0, 4003.0, 4012.5, 4030.0, 3950.0, 3901.0, 4200.0, 4002.5]:
+                self.underlying.Price = spot
+                result = self.spx.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+                expect([contract.Symbol for contract in result]).to(equal(fullRebuild(spot)))
+                expect({contract.UnderlyingLastPrice for contract in result}).to(equal({spot}))
+
+        with it('only creates the contracts entering the window'):
+            first = self.spx.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+            self.underlying.Price = 4001.0
+            same = self.spx.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+            expect(same).to(equal(first))
+
+            self.underlying.Price = 4005.0
+            moved = self.spx.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+            # One strike (Put + Call) enters the window and one leaves it
+            expect(len({id(contract) for contract in moved} - {id(contract) for contract in first})).to(equal(2))
+            expect(len(self.algorithm.optionContractsSubscriptions)).to(equal(len(first) + 2))
+            # The contracts that left the window are no longer referenced by the scan window
+            expect(self.algorithm.optionContractsSubscriptions.unreferenced()).to(have_length(2))
+
+    with context('tradable contracts'):
+        with before.each:
+            self.qqq = DataHandler(self.algorithm, "QQQ", self.strategy)
+            self.strategy.underlyingSymbol = "QQQ"
+            self.strategy.contractUtils = None
+            self.underlying = MagicMock(Price=400.0)
+            self.nonTradable = set()
+            self.algorithm.Securities = MagicMock()
+            self.algorithm.Securities.__getitem__ = lambda _, key: self.underlying if key == "QQQ" else MagicMock(IsTradable=key not in self.nonTradable)
+            expiry = self.algorithm.Time + timedelta(days=1)
+            self.symbols = [
+                MagicMock(ID=MagicMock(Date=expiry, StrikePrice=float(strike), OptionRight=right, Symbol=f"QQQ{strike}"))
+                for strike in range(390, 411) for right in ["Call", "Put"]
+            ]
+
+        with it('skips the non tradable contracts before looking for the ATM strike'):
+            self.nonTradable = {"QQQ400"}
+            result = self.qqq.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+            # 399 and 401 are equally close to the price: the first one in the list of symbols is the ATM strike
+            expect(sorted({contract.Symbol.ID.StrikePrice for contract in result})).to(equal([397.0, 398.0, 399.0, 401.0, 402.0]))
+
+            # The window is rebuilt once the contracts are tradable again
+            self.nonTradable = set()
+            result = self.qqq.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+            expect(sorted({contract.Symbol.ID.StrikePrice for contract in result})).to(equal([398.0, 399.0, 400.0, 401.0, 402.0]))
+
+        with it('stops the timer when no contract is tradable'):
+            self.nonTradable = {f"QQQ{strike}" for strike in range(390, 411)}
+            result = self.qqq.optionChainProviderFilter(self.symbols, -3, 3, 0, 5)
+
+            expect(result).to(be_none)
+            expect(self.algorithm.executionTimer.stop.call_count).to(equal(self.algorithm.executionTimer.start.call_count))
+
+    with context('adaptive strike universe'):
+        with before.each:
+            self.spx = DataHandler(self.algorithm, "SPX", self.strategy)
+            self.strategy.configure_mock(
+                underlyingSymbol="SPX", contractUtils=None, dte=0, dteWindow=0, nStrikesLeft=18, nStrikesRight=18,
+                adaptiveStrikeUniverse=True, expectedMoveMultiplier=1.0, strikeUniverseDelta=None, strikeUniverseOffset=30,
+                strikeUniverseIV=0.25, delta=10, putDelta=10, callDelta=10, wingSize=5, putWingSize=5, callWingSize=5,
+                butterflyLeftWingSize=5, butterflyRightWingSize=5
+            )
+            self.algorithm.ivHistory = MagicMock()
+            self.algorithm.ivHistory.get.return_value.last.return_value = None
+            self.underlying = MagicMock(Price=4000.0)
+            self.algorithm.Securities = MagicMock()
+            self.algorithm.Securities.__getitem__ = lambda _, key: self.underlying if key == "SPX" else MagicMock(IsTradable=True)
+            expiry = self.algorithm.Time
+            self.symbols = [
+                MagicMock(ID=MagicMock(Date=expiry, StrikePrice=float(strike), OptionRight=right))
+                for strike in range(3800, 4205, 5) for right in ["Call", "Put"]
+            ]
+
+        with it('is disabled by default'):
+            self.strategy.adaptiveStrikeUniverse = MagicMock()
+            expect(self.spx.strikeUniverse(0, underlyingPrice=4000.0)).to(be_none)
+
+        with it('uses only the fixed offset and the wings when the offset is set'):
+            # The expected move (1 day at 25% IV: 4000 * 0.25 * sqrt(1/365) ~ 52 > 30) and the deltas are not used
+            expect(self.spx.strikeUniverse(0, underlyingPrice=4000.0)).to(equal((35, 35)))
+            # ATM strike (i.e. Iron Fly)
+            self.strategy.strikeUniverseOffset = 0
+            expect(self.spx.strikeUniverse(0, underlyingPrice=4000.0)).to(equal((5, 5)))
+
+        with it('sizes the range from the expected move and the target delta'):
+            self.strategy.strikeUniverseOffset = None
+            self.strategy.strikeUniverseDelta = 50
+            self.algorithm.ivHistory.get.return_value.last.return_value = 0.2
+            stdMove = 4000.0 * 0.2 * (4 / 365.0) ** 0.5
+            # The expected move is the floor of the ATM delta
+            left, right = self.spx.strikeUniverse(4, underlyingPrice=4000.0)
+            expect(round(left, 6)).to(equal(round(stdMove + 5, 6)))
+            # 10 delta put / 20 delta call: 1.2816 / 0.8416 standard deviations from ATM
+            self.strategy.strikeUniverseDelta = None
+            self.strategy.delta = 20
+            self.strategy.callDelta = 20
+            self.strategy.callWingSize = 10
+            left, right = self.spx.strikeUniverse(4, underlyingPrice=4000.0)
+            expect(round(left, 2)).to(equal(round(1.28155 * stdMove + 5, 2)))
+            expect(round(right, 2)).to(equal(round(stdMove + 10, 2)))
+
+        with it('restricts the provider window to the strike range'):
+            result = self.spx.optionChainProviderFilter(self.symbols, -18, 18, 0, 0, strikeRange=self.spx.strikeUniverse(0))
+            strikes = sorted(set(contract.Strike for contract in result))
+            expect(strikes[0]).to(equal(3965.0))
+            expect(strikes[-1]).to(equal(4035.0))
+
+        with it('converts the range into a number of strikes capped by nStrikes'):
+            universe = MagicMock()
+            universe.Strikes.return_value = universe
+            universe.Expiration.return_value = universe
+            # The strike spacing is not known yet
+            self.spx.OptionFilterFunction(universe)
+            universe.Strikes.assert_called_with(-18, 18)
+            self.spx.updateStrikeStep([MagicMock(Strike=float(strike)) for strike in range(3950, 4055, 5)])
+            expect(self.spx.strikeStep).to(equal(5.0))
+            self.spx.OptionFilterFunction(universe)
+            universe.Strikes.assert_called_with(-8, 8)
+            self.strategy.strikeUniverseOffset = 200
+            self.spx.OptionFilterFunction(universe)
+            universe.Strikes.assert_called_with(-18, 18)
+
+    with context('prefetch'):
+        with before.each:
+            self.spx = DataHandler(self.algorithm, "SPX", self.strategy)
+            self.strategy.configure_mock(
+                underlyingSymbol="SPX", nameTag="SPXButterfly", contractUtils=None, useSlice=False, dte=0, dteWindow=0,
+                scheduleStartTime=datetime(2024, 1, 2, 9, 30).time(), tradeTimes=[datetime(2024, 1, 2, 9, 45).time()],
+                prefetchLeadTime=timedelta(minutes=5), adaptiveStrikeUniverse=False
+            )
+            self.strategy.scanner.isWithinScheduledTimeWindow.return_value = False
+            self.algorithm.OptionChainProvider = MagicMock()
+            self.algorithm.timeResolution = self.Resolution.Minute
+            self.underlying = MagicMock(Price=4000.0)
+            self.algorithm.Securities = MagicMock()
+            self.algorithm.Securities.__getitem__ = lambda _, key: self.underlying if key == "SPX" else MagicMock(IsTradable=True)
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 35)
+            self.symbols = [
+                MagicMock(ID=MagicMock(Date=self.algorithm.Time, StrikePrice=float(strike), OptionRight=right))
+                for strike in range(3950, 4055, 5) for right in ["Call", "Put"]
+            ]
+            self.algorithm.OptionChainProvider.GetOptionContractList.return_value = self.symbols
+
+        with it('is disabled if the lead time is not set'):
+            self.strategy.prefetchLeadTime = None
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 42)
+            expect(self.spx.prefetch()).to(be_none)
+            expect(len(self.algorithm.optionContractsSubscriptions)).to(equal(0))
+
+        with it('subscribes the window within the lead time of the next trade time'):
+            expect(self.spx.nextTradeTime()).to(equal(datetime(2024, 1, 2, 9, 45)))
+            # Too early
+            expect(self.spx.prefetch()).to(be_none)
+            expect(len(self.algorithm.optionContractsSubscriptions)).to(equal(0))
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 40)
+            contracts = self.spx.prefetch()
+            expect(contracts).to(have_length(6))
+            expect(len(self.algorithm.optionContractsSubscriptions)).to(equal(6))
+            expect(self.spx.prefetchTradeTime).to(equal(datetime(2024, 1, 2, 9, 45)))
+
+        with it('releases the window once the trade time has passed'):
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 44)
+            self.spx.prefetch()
+            # The scanner uses the prefetched window at the trade time
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 45)
+            expect(self.spx.getOptionContracts()).to(have_length(6))
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 46)
+            expect(self.spx.prefetch()).to(be_none)
+            expect(self.spx.prefetchTradeTime).to(be_none)
+            expect(self.spx.providerWindow).to(be_none)
+            expect(self.algorithm.optionContractsSubscriptions.unreferenced()).to(have_length(6))
+
+        with it('keeps the window while the scanner is running'):
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 44)
+            self.spx.prefetch()
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 46)
+            self.strategy.scanner.isWithinScheduledTimeWindow.return_value = True
+            self.spx.prefetch()
+            expect(self.spx.providerWindow).not_to(be_none)
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 47)
+            self.strategy.scanner.isWithinScheduledTimeWindow.return_value = False
+            self.spx.prefetch()
+            expect(self.spx.providerWindow).to(be_none)
+
+        with it('keeps the window if the strategy runs on every scheduled interval'):
+            self.strategy.tradeTimes = None
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 27)
+            expect(self.spx.nextTradeTime()).to(equal(datetime(2024, 1, 2, 9, 30)))
+            self.spx.prefetch()
+            self.algorithm.Time = datetime(2024, 1, 2, 9, 31)
+            self.spx.prefetch()
+            expect(self.spx.prefetchTradeTime).to(be_none)
+            expect(self.algorithm.optionContractsSubscriptions.unreferenced()).to(have_length(0))
+
     with context('getOptionContracts'):
         with before.each:
             self.algorithm.OptionChainProvider = MagicMock()
@@ -240,6 +459,19 @@ with description('DataHandler') as self:
             self.algorithm.OptionChainProvider.GetOptionContractList.assert_called_once()
             expect(result).to(have_length(1))
 
+        with it('reuses the cached contract list of the day'):
+            self.algorithm.optionContractLists = OptionContractListCache(self.algorithm)
+            # Lean canonical symbols compare by value (the mock creates a different object on every call)
+            self.data_handler.OptionsContract = MagicMock(return_value=self.test_symbol)
+            self.algorithm.OptionChainProvider.GetOptionContractList.return_value = self.test_symbols
+
+            self.data_handler.getOptionContracts()
+            self.algorithm.Time += timedelta(minutes=1)
+            result = self.data_handler.getOptionContracts()
+
+            self.algorithm.OptionChainProvider.GetOptionContractList.assert_called_once()
+            expect(result).to(have_length(1))
+
     with context('AddOptionContracts'):
         with before.each:
             self.contracts = [Factory.create_symbol(), Factory.create_symbol()]
@@ -257,6 +489,51 @@ with description('DataHandler') as self:
             expect(self.algorithm.AddOptionContract.call_count).to(equal(2))
             expect(self.algorithm.optionContractsSubscriptions).to(have_length(2))
 
+    with context('future option chains'):
+        with before.each:
+            self.strategy.underlyingSymbol = "ES"
+            self.fop = DataHandler(self.algorithm, "ES", self.strategy)
+            now = datetime(2024, 1, 2)
+
+            def future(name, days):
+                return MagicMock(SecurityType=SecurityType.Future, Canonical="ES", ID=MagicMock(Date=now + timedelta(days=days)),
+                                 IsCanonical=MagicMock(return_value=False), name=name)
+
+            self.march = future("ESH24", 75)
+            self.june = future("ESM24", 165)
+            self.contracts = {"ESH24": [MagicMock()], "ESM24": [MagicMock(), MagicMock()]}
+            # Option chains of the slice (keyed by the canonical option symbol: "?" + future contract)
+            self.slice = MagicMock()
+            self.slice.OptionChains.get = lambda key: (
+                MagicMock(Contracts=MagicMock(Count=len(self.contracts[key[1:]]), Values=self.contracts[key[1:]]))
+                if key[1:] in self.contracts else None
+            )
+            self.symbolPatch = patch.dict(DataHandler.OnSecuritiesChanged.__globals__, {"Symbol": MagicMock(CreateCanonicalOption=lambda symbol: f"?{symbol._mock_name}")})
+            self.symbolPatch.start()
+            # The June contract is added first
+            self.fop.OnSecuritiesChanged(MagicMock(AddedSecurities=[MagicMock(Symbol=self.june), MagicMock(Symbol=self.march)], RemovedSecurities=[]))
+
+        with after.each:
+            self.symbolPatch.stop()
+
+        with it('indexes the future contracts by expiry'):
+            expect(list(self.fop.futureOptionChains["ES"].keys())).to(equal([self.march, self.june]))
+
+        with it('reads the chain of the active contract without scanning the slice'):
+            expect(self.fop.getSliceOptionContracts(self.slice)).to(equal(self.contracts["ESH24"]))
+            expect(self.fop.activeFutureContract["ES"]).to(equal(self.march))
+
+            self.slice.FuturesChains = MagicMock()
+            expect(self.fop.getSliceOptionContracts(self.slice)).to(equal(self.contracts["ESH24"]))
+            self.slice.FuturesChains.items.assert_not_called()
+
+        with it('rolls to the next contract when the active one is removed'):
+            self.fop.getSliceOptionContracts(self.slice)
+            self.fop.OnSecuritiesChanged(MagicMock(AddedSecurities=[], RemovedSecurities=[MagicMock(Symbol=self.march)]))
+
+            expect(self.fop.getSliceOptionContracts(self.slice)).to(equal(self.contracts["ESM24"]))
+            expect(self.fop.activeFutureContract["ES"]).to(equal(self.june))
+
     with context('OptionsContract'):
         with before.each:
             # Reset the mock before each test
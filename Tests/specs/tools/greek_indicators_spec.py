@@ -0,0 +1,114 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_none, be_true, be_false
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.GreekIndicators import GreekIndicators
+    from Tests.mocks.algorithm_imports import Symbol, SecurityType, OptionRight
+
+
+def create_security(algorithm, ticker):
+    """Creates an option security and adds it to the algorithm"""
+    symbol = Symbol.create_option("SPX", "usa", None, OptionRight.Call, 4500, None)
+    symbol.Value = ticker
+    symbol.Underlying = "SPX"
+    security = MagicMock()
+    security.Symbol = symbol
+    security.Type = SecurityType.Option
+    algorithm.Securities[symbol] = security
+    return security
+
+
+def create_position(orderTag, securities):
+    """Creates a position with one leg for each of the given securities"""
+    return MagicMock(orderTag=orderTag, legs=[MagicMock(symbol=security.Symbol) for security in securities])
+
+
+with description('GreekIndicators') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Securities = {}
+            self.algorithm.executionTimer = MagicMock()
+            for name in ["iv", "d", "g", "v", "r", "t"]:
+                setattr(self.algorithm, name, MagicMock(side_effect=lambda *args, **kwargs: MagicMock()))
+            self.algorithm.DeregisterIndicator = MagicMock()
+            self.algorithm.WarmUpIndicator = MagicMock()
+            self.algorithm.openPositions = {}
+            self.algorithm.allPositions = {}
+            self.indicators = GreekIndicators(self.algorithm)
+            self.security = create_security(self.algorithm, "C4500")
+
+    with context('register'):
+        with it('does not create the indicators when lazy'):
+            self.indicators.register(self.security)
+
+            expect(self.security.delta).to(be_none)
+            expect(self.indicators.activeCount()).to(equal(0))
+            self.algorithm.d.assert_not_called()
+
+        with it('creates the indicators right away when not lazy'):
+            indicators = GreekIndicators(self.algorithm, lazy=False)
+            indicators.register(self.security)
+
+            expect(indicators.activeCount()).to(equal(6))
+            self.algorithm.d.assert_called_once()
+            # Created with the securities: no warm up needed
+            self.algorithm.WarmUpIndicator.assert_not_called()
+
+    with context('ensure'):
+        with it('warms up the indicators created on demand'):
+            self.indicators.register(self.security)
+            self.indicators.ensure(self.security)
+
+            expect(self.algorithm.WarmUpIndicator.call_count).to(equal(6))
+            symbols, indicator, _ = self.algorithm.WarmUpIndicator.call_args[0]
+            expect(symbols[0]).to(equal(self.security.Symbol))
+            expect(symbols[-1]).to(equal("SPX"))
+            expect(indicator).to(equal(self.security.theta))
+
+        with it('creates the indicators once'):
+            self.indicators.register(self.security)
+            expect(self.indicators.ensure(self.security)).to(be_true)
+            expect(self.indicators.ensure(self.security.Symbol)).to(be_true)
+
+            expect(self.indicators.activeCount()).to(equal(6))
+            expect(len(self.indicators)).to(equal(1))
+            expect(self.security.delta).not_to(be_none)
+            self.algorithm.iv.assert_called_once()
+
+        with it('uses the mirror contract'):
+            self.indicators.ensure(self.security)
+
+            mirror = self.algorithm.iv.call_args[0][1]
+            expect(mirror.ID.option_right).to(equal(OptionRight.PUT))
+            expect(mirror.ID.strike_price).to(equal(4500))
+
+        with it('ignores unknown symbols'):
+            symbol = Symbol.create_option("SPX", "usa", None, OptionRight.Put, 4400, None)
+            expect(self.indicators.ensure(symbol)).to(be_false)
+
+    with context('disposePosition'):
+        with it('disposes the indicators of the closed position'):
+            position = create_position("A", [self.security])
+            self.indicators.ensurePosition(position)
+            self.indicators.disposePosition(position)
+
+            expect(self.indicators.activeCount()).to(equal(0))
+            expect(self.security.delta).to(be_none)
+            expect(self.algorithm.DeregisterIndicator.call_count).to(equal(6))
+
+        with it('keeps the indicators of the legs of other open positions'):
+            other = create_security(self.algorithm, "C4550")
+            closed = create_position("A", [self.security, other])
+            stillOpen = create_position("B", [other])
+            self.algorithm.openPositions = {"A": 1, "B": 2}
+            self.algorithm.allPositions = {1: closed, 2: stillOpen}
+            self.indicators.ensurePosition(closed)
+            self.indicators.disposePosition(closed)
+
+            expect(len(self.indicators)).to(equal(1))
+            expect(self.security.delta).to(be_none)
+            expect(other.delta).not_to(be_none)
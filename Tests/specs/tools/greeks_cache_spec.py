@@ -0,0 +1,59 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_none, have_length
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory
+from Tests.mocks.module_mocks import ModuleMocks
+from datetime import datetime, timedelta
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.GreeksCache import GreeksCache
+
+with description('GreeksCache') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.executionTimer = MagicMock()
+            self.cache = GreeksCache(self.algorithm, maxSize=2)
+            self.contract = MagicMock(Symbol="SPX 240105C04700000")
+
+    with context('key'):
+        with it('changes with the bar time, the spot and the mid-price'):
+            key = self.cache.key(self.contract, 4700.0, 10.0)
+
+            expect(self.cache.key(self.contract, 4700.0, 10.0)).to(equal(key))
+            expect(self.cache.key(self.contract, 4701.0, 10.0) == key).to(equal(False))
+            expect(self.cache.key(self.contract, 4700.0, 10.5) == key).to(equal(False))
+            self.algorithm.Time += timedelta(minutes=1)
+            expect(self.cache.key(self.contract, 4700.0, 10.0) == key).to(equal(False))
+
+    with context('get/put'):
+        with it('counts hits and misses'):
+            key = self.cache.key(self.contract, 4700.0, 10.0)
+            greeks = MagicMock()
+
+            expect(self.cache.get(key)).to(be_none)
+            self.cache.put(key, greeks)
+            expect(self.cache.get(key)).to(equal(greeks))
+
+            expect(self.cache.hits).to(equal(1))
+            expect(self.cache.misses).to(equal(1))
+            expect(self.cache.hitRate()).to(equal(0.5))
+            self.algorithm.executionTimer.count.assert_any_call("Tools.GreeksCache -> hits")
+            self.algorithm.executionTimer.count.assert_any_call("Tools.GreeksCache -> misses")
+
+        with it('evicts the least recently used entry'):
+            self.cache.put("a", 1)
+            self.cache.put("b", 2)
+            # Touch "a" so that "b" becomes the least recently used entry
+            self.cache.get("a")
+            self.cache.put("c", 3)
+
+            expect(self.cache).to(have_length(2))
+            expect(self.cache.get("b")).to(be_none)
+            expect(self.cache.get("a")).to(equal(1))
+            expect(self.cache.evictions).to(equal(1))
+
+    def cleanup(self):
+        ModuleMocks.cleanup()
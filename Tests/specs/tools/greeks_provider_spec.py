@@ -0,0 +1,112 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_a, be_below, raise_error
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+from datetime import datetime, timedelta
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.GreeksProvider import GreeksProvider, ProviderGreeks
+    from Tools.BSMLibrary import BSM
+    from Tools.ContractUtils import ContractUtils
+    from Tools.VolSurface import VolSurface
+    from Tests.mocks.algorithm_imports import OptionRight
+
+
+with description('GreeksProvider') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.Securities = {}
+            self.algorithm.executionTimer = MagicMock()
+            self.bsm = BSM(self.algorithm)
+            self.chain = Factory.create_chain(BSM(self.algorithm), expiry = datetime(2024, 2, 1))
+            # ATM call
+            self.contract = self.chain[8]
+
+    with context('create'):
+        with it('creates the provider of each tier'):
+            for tier in ["lean", "bsm", "batch", "surface"]:
+                provider = GreeksProvider.create(self.algorithm, tier)
+                expect(provider.name).to(equal(tier))
+
+        with it('is case insensitive and defaults to lean'):
+            expect(GreeksProvider.create(self.algorithm, "BSM").name).to(equal("bsm"))
+            expect(GreeksProvider.create(self.algorithm, None).name).to(equal("lean"))
+
+        with it('returns the given provider instance'):
+            provider = GreeksProvider.create(self.algorithm, "batch")
+            expect(GreeksProvider.create(self.algorithm, provider)).to(equal(provider))
+
+        with it('raises an error for an invalid tier'):
+            expect(lambda: GreeksProvider.create(self.algorithm, "invalid")).to(raise_error(ValueError))
+
+    with context('of'):
+        with it('returns the provider of the contract utils of the model'):
+            provider = GreeksProvider.create(self.algorithm, "batch")
+            model = MagicMock(contractUtils=ContractUtils(self.algorithm, greeksProvider=provider))
+            expect(GreeksProvider.of(model)).to(equal(provider))
+
+        with it('returns None if the model has no provider'):
+            expect(GreeksProvider.of(MagicMock())).to(equal(None))
+            expect(GreeksProvider.of(object())).to(equal(None))
+
+    with context('lean'):
+        with it('reads the Greeks of the contract'):
+            self.contract.greeks = ProviderGreeks(delta = 0.5, gamma = 0.1)
+            self.contract.implied_volatility = 0.3
+            provider = GreeksProvider.create(self.algorithm, "lean")
+            expect(provider.delta(self.contract)).to(equal(0.5))
+            expect(provider.gamma(self.contract)).to(equal(0.1))
+            expect(provider.iv(self.contract)).to(equal(0.3))
+
+        with it('times the reads of the Lean Greeks'):
+            self.contract.greeks = ProviderGreeks(delta = 0.5)
+            self.algorithm.executionTimer = MagicMock()
+            GreeksProvider.create(self.algorithm, "lean").delta(self.contract)
+            self.algorithm.executionTimer.start.assert_called_once_with("Tools.GreeksProvider -> lean")
+            self.algorithm.executionTimer.stop.assert_called_once_with("Tools.GreeksProvider -> lean")
+
+    with context('tiers in use'):
+        with it('records the tiers created for the models'):
+            self.algorithm.greeksProviderTiers = set()
+            GreeksProvider.create(self.algorithm, "BSM")
+            GreeksProvider.create(self.algorithm, "surface")
+            expect(self.algorithm.greeksProviderTiers).to(equal({"bsm", "surface"}))
+
+    with context('bsm'):
+        with it('matches the BSM library'):
+            provider = GreeksProvider.create(self.algorithm, "bsm")
+            greeks = provider.greeks(self.contract)
+            expected = BSM(self.algorithm).computeGreeks(Contract(self.contract.Strike, self.contract.Right, self.contract.Expiry, self.contract.BidPrice, self.contract.AskPrice))
+            expect(greeks).to(be_a(ProviderGreeks))
+            expect(greeks.delta).to(equal(expected.Delta))
+            expect(greeks.vega).to(equal(expected.Vega))
+            expect(abs(greeks.iv - 0.2)).to(be_below(1e-3))
+
+    with context('batch'):
+        with it('prices the prepared contracts with the vectorized solver'):
+            provider = GreeksProvider.create(self.algorithm, "batch")
+            provider.prepare(self.chain)
+            expected = BSM(self.algorithm).computeGreeks(Contract(self.contract.Strike, self.contract.Right, self.contract.Expiry, self.contract.BidPrice, self.contract.AskPrice))
+            expect(abs(provider.delta(self.contract) - expected.Delta)).to(be_below(1e-4))
+            expect(abs(provider.iv(self.contract) - expected.IV)).to(be_below(1e-4))
+
+    with context('surface'):
+        with it('reads the IV from the volatility surface'):
+            self.algorithm.volSurface = VolSurface(self.algorithm)
+            provider = GreeksProvider.create(self.algorithm, "surface")
+            provider.prepare(self.chain)
+            sigma = self.algorithm.volSurface.iv(self.contract)
+            expect(abs(provider.iv(self.contract) - sigma)).to(be_below(1e-12))
+            expect(abs(sigma - 0.2)).to(be_below(1e-3))
+
+    with context('ContractUtils'):
+        with it('delegates the Greeks to the provider'):
+            provider = GreeksProvider.create(self.algorithm, "bsm")
+            contractUtils = ContractUtils(self.algorithm, greeksProvider = provider)
+            greeks = provider.greeks(self.contract)
+            expect(contractUtils.delta(self.contract)).to(equal(greeks.delta))
+            expect(contractUtils.theta(self.contract)).to(equal(greeks.theta))
+            expect(contractUtils.implied_volatility(self.contract)).to(equal(greeks.iv))
@@ -0,0 +1,101 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_none, be_true, be_false, have_key
+from unittest.mock import MagicMock, PropertyMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+from Tests.mocks.tools_mocks import MockObjectStore
+from datetime import datetime
+import numpy as np
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.IVHistory import IVHistory, IVHistoryStore
+    from Tests.mocks.algorithm_imports import OptionRight
+
+
+with description('IVHistory') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.executionTimer = MagicMock()
+            self.history = IVHistory(self.algorithm, size=50, bucketSize=0.001, maxIV=2.0)
+
+    with context('queries'):
+        with it('returns None when empty'):
+            expect(self.history.ivRank()).to(be_none)
+            expect(self.history.ivPercentile()).to(be_none)
+            expect(self.history.last()).to(be_none)
+
+        with it('matches the brute force rank and percentile over a rolling window'):
+            rng = np.random.default_rng(7)
+            # Values on the bucket grid so that the brute force results are exact
+            values = np.round(rng.uniform(0.08, 0.6, 180), 3)
+            for idx, iv in enumerate(values):
+                self.history.add(iv)
+                window = values[max(0, idx + 1 - 50):idx + 1]
+                expect(len(self.history)).to(equal(len(window)))
+                expect(self.history.min()).to(equal(round(window.min() * 1000) * 0.001))
+                expect(self.history.max()).to(equal(round(window.max() * 1000) * 0.001))
+                for query in [0.05, 0.2, window[-1], 0.7]:
+                    low, high = round(window.min() * 1000), round(window.max() * 1000)
+                    bucket = min(int(query / 0.001 + 1e-9), self.history.nBuckets - 1)
+                    expected = (100.0 if bucket >= high else 0.0) if high == low else min(max((bucket - low) / (high - low), 0.0), 1.0) * 100
+                    expect(bool(abs(self.history.ivRank(query) - expected) < 1e-9)).to(be_true)
+                    expectedPct = np.sum(np.floor(window / 0.001 + 1e-9) < bucket) / len(window) * 100
+                    expect(bool(abs(self.history.ivPercentile(query) - expectedPct) < 1e-9)).to(be_true)
+
+        with it('keeps the observations in chronological order'):
+            for iv in range(1, 61):
+                self.history.add(iv / 100)
+            expect(self.history.toList()).to(equal([iv / 100 for iv in range(11, 61)]))
+            expect(self.history.last()).to(equal(0.6))
+
+        with it('records one observation per bar'):
+            expect(self.history.add(0.2, time=self.algorithm.Time)).to(be_true)
+            expect(self.history.add(0.3, time=self.algorithm.Time)).to(be_false)
+            expect(self.history.add(float("nan"))).to(be_false)
+            expect(len(self.history)).to(equal(1))
+
+    with context('IVHistoryStore'):
+        with before.each:
+            self.store = IVHistoryStore(self.algorithm, size=50)
+            self.algorithm.object_store = MockObjectStore()
+
+        with it('records the ATM IV of the expiry closest to the target DTE'):
+            near = datetime(2024, 1, 5)
+            far = datetime(2024, 2, 2)
+            contracts = [
+                Contract(95, OptionRight.Call, near, ImpliedVolatility=0.30), Contract(100, OptionRight.Call, near, ImpliedVolatility=0.25),
+                Contract(95, OptionRight.Call, far, ImpliedVolatility=0.22), Contract(100, OptionRight.Call, far, ImpliedVolatility=0.20), Contract(100, OptionRight.Call, far, ImpliedVolatility=0.18), Contract(105, OptionRight.Call, far, ImpliedVolatility=0.0),
+            ]
+            history = self.store.record("SPX", contracts, dte=30)
+
+            expect(len(history)).to(equal(1))
+            expect(bool(abs(history.last() - 0.19) < 1e-12)).to(be_true)
+
+        with it('only reads the IV of the ATM contracts'):
+            expiry = datetime(2024, 2, 2)
+            atm = Contract(100, OptionRight.Call, expiry, ImpliedVolatility=0.20)
+            otm = MagicMock(Strike=110, Expiry=expiry, UnderlyingLastPrice=100.0)
+            otmIV = PropertyMock(return_value=0.35)
+            type(otm).ImpliedVolatility = otmIV
+            history = self.store.record("SPX", [atm, otm], dte=30)
+
+            expect(history.last()).to(equal(0.20))
+            otmIV.assert_not_called()
+
+        with it('persists the histories to the ObjectStore'):
+            for iv in [0.1, 0.2, 0.3]:
+                self.store.get("SPX").add(iv)
+            self.store.save()
+            expect(self.algorithm.object_store.saved_data).to(have_key("ivHistory.json"))
+
+            self.algorithm.object_store.stored_data = self.algorithm.object_store.saved_data
+            restored = IVHistoryStore(self.algorithm, size=2)
+            restored.load()
+            expect(restored.get("SPX").toList()).to(equal([0.2, 0.3]))
+
+        with it('keeps track of the date of the last save'):
+            expect(self.store.lastSaveDate).to(be_none)
+            self.store.save()
+            expect(self.store.lastSaveDate).to(equal(self.algorithm.Time.date()))
@@ -0,0 +1,75 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_true
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory
+from datetime import datetime, timedelta
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.OptionContractListCache import OptionContractListCache
+
+
+def contractSymbol(expiry):
+    """Option contract symbol with the given expiry"""
+    return MagicMock(ID=MagicMock(Date=expiry))
+
+
+with description('OptionContractListCache') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.executionTimer = MagicMock()
+            self.algorithm.OptionChainProvider = MagicMock()
+            self.symbols = [contractSymbol(datetime(2024, 1, 5)), contractSymbol(datetime(2024, 1, 19))]
+            self.algorithm.OptionChainProvider.GetOptionContractList.return_value = self.symbols
+            self.cache = OptionContractListCache(self.algorithm)
+
+    with context('get'):
+        with it('requests the list once per underlying and day'):
+            for minute in range(5):
+                self.algorithm.Time = datetime(2024, 1, 2, 10, minute)
+                expect(self.cache.get("?SPXW")).to(equal(self.symbols))
+            self.cache.get("?SPY")
+
+            expect(self.algorithm.OptionChainProvider.GetOptionContractList.call_count).to(equal(2))
+            expect(self.cache.hits).to(equal(4))
+            expect(self.cache.misses).to(equal(2))
+            self.algorithm.executionTimer.count.assert_any_call("Tools.OptionContractListCache -> hits")
+
+        with it('drops the lists of the previous days'):
+            self.cache.get("?SPXW")
+            self.algorithm.Time = datetime(2024, 1, 3, 9, 31)
+            self.cache.get("?SPXW")
+
+            expect(self.algorithm.OptionChainProvider.GetOptionContractList.call_count).to(equal(2))
+            expect(len(self.cache)).to(equal(1))
+
+        with it('does not cache empty lists'):
+            self.algorithm.OptionChainProvider.GetOptionContractList.return_value = []
+            self.cache.get("?SPXW")
+            self.cache.get("?SPXW")
+
+            expect(self.algorithm.OptionChainProvider.GetOptionContractList.call_count).to(equal(2))
+
+    with context('refreshInterval'):
+        with before.each:
+            self.cache.refreshInterval = timedelta(minutes=30)
+
+        with it('refreshes the lists with 0DTE contracts'):
+            self.symbols.append(contractSymbol(datetime(2024, 1, 2)))
+            self.cache.get("?SPXW")
+            self.algorithm.Time += timedelta(minutes=29)
+            self.cache.get("?SPXW")
+            expect(self.algorithm.OptionChainProvider.GetOptionContractList.call_count).to(equal(1))
+
+            self.algorithm.Time += timedelta(minutes=1)
+            self.cache.get("?SPXW")
+            expect(self.algorithm.OptionChainProvider.GetOptionContractList.call_count).to(equal(2))
+            expect(self.cache.refreshes).to(equal(1))
+
+        with it('keeps the lists without 0DTE contracts for the whole day'):
+            self.cache.get("?SPXW")
+            self.algorithm.Time += timedelta(hours=5)
+            self.cache.get("?SPXW")
+            expect(self.algorithm.OptionChainProvider.GetOptionContractList.call_count).to(equal(1))
@@ -1,11 +1,12 @@
 from mamba import description, context, it, before
-from expects import expect, equal, be_true, be_none
+from expects import expect, equal, be_true, be_false, be_none, raise_error
 from unittest.mock import patch, MagicMock
 from Tests.spec_helper import patch_imports
 from Tests.factories import Factory
 
 with patch_imports()[0], patch_imports()[1]:
     from Tools.ProviderOptionContract import ProviderOptionContract
+    from Tools.ContractUtils import ContractUtils
     from AlgorithmImports import datetime, timedelta
 
 with description('ProviderOptionContract') as self:
@@ -57,6 +58,21 @@ with description('ProviderOptionContract') as self:
             expect(self.contract.greeks.vega).to(equal(0.3))
             expect(self.contract.greeks.rho).to(equal(0.05))
 
+        with it('resolves the greeks tier of each strategy through its contract utils'):
+            self.algorithm.executionTimer = MagicMock()
+            self.security.delta = MagicMock(current=MagicMock(value=0.5))
+            contract = ProviderOptionContract.get(self.symbol, self.underlying_price, self.algorithm)
+            # Two strategies with different tiers share the same instance
+            provider = MagicMock()
+            provider.delta.return_value = 0.4
+            bsmUtils = ContractUtils(self.algorithm, greeksProvider=provider)
+            leanUtils = ContractUtils(self.algorithm)
+
+            expect(ProviderOptionContract.get(self.symbol, self.underlying_price, self.algorithm) is contract).to(be_true)
+            expect(bsmUtils.delta(contract)).to(equal(0.4))
+            expect(leanUtils.delta(contract)).to(equal(0.5))
+            expect(contract.greeks.delta).to(equal(0.5))
+
     with context('contract properties'):
         with before.each:
             self.security = self.algorithm.Securities[self.symbol]
@@ -87,4 +103,29 @@ with description('ProviderOptionContract') as self:
 
         with it('returns zero for missing implied volatility'):
             self.security.iv = None
-            expect(self.contract.implied_volatility).to(equal(0)) 
\ No newline at end of file
+            expect(self.contract.implied_volatility).to(equal(0)) 
+
+    with context('flyweight'):
+        with before.each:
+            self.algorithm.executionTimer = MagicMock()
+
+        with it('reuses the instance of the symbol'):
+            contract = ProviderOptionContract.get(self.symbol, 100.0, self.algorithm)
+            same = ProviderOptionContract.get(self.symbol, 101.5, self.algorithm)
+
+            expect(same is contract).to(be_true)
+            expect(same.UnderlyingLastPrice).to(equal(101.5))
+            self.algorithm.executionTimer.count.assert_called_with("Tools.ProviderOptionContract -> reused")
+
+        with it('creates a new instance once the symbol is discarded'):
+            contract = ProviderOptionContract.get(self.symbol, 100.0, self.algorithm)
+            ProviderOptionContract.discard(self.algorithm, self.symbol)
+
+            expect(ProviderOptionContract.get(self.symbol, 100.0, self.algorithm) is contract).to(be_false)
+
+        with it('declares its attributes in __slots__'):
+            expect(hasattr(self.contract, "__dict__")).to(be_false)
+            expect(hasattr(self.contract, "BSMGreeks")).to(be_false)
+            self.contract.BSMGreeks = MagicMock()
+            self.contract.BSMImpliedVolatility = 0.2
+            expect(lambda: setattr(self.contract, "unknown", 1)).to(raise_error(AttributeError))
@@ -0,0 +1,139 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_true, be_false, be_none
+from unittest.mock import MagicMock, call
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory
+from datetime import datetime, timedelta
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.QuoteTracker import QuoteTracker
+
+
+def nextBar(spec, minutes=1):
+    spec.algorithm.Time += timedelta(minutes=minutes)
+
+
+with description('QuoteTracker') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.executionTimer = MagicMock()
+            self.algorithm.logger = MagicMock()
+            self.tracker = QuoteTracker(self.algorithm, maxAge=timedelta(minutes=5))
+
+    with context('observe'):
+        with it('marks a contract dirty the first time it is observed'):
+            expect(self.tracker.observe("A", 1.0, 1.2, 100.0)).to(be_true)
+            expect(len(self.tracker)).to(equal(1))
+
+        with it('marks a contract clean if the quotes and the underlying did not change'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            nextBar(self)
+            expect(self.tracker.observe("A", 1.0, 1.2, 100.0)).to(be_false)
+
+        with it('marks a contract dirty if the quotes changed'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            nextBar(self)
+            expect(self.tracker.observe("A", 1.0, 1.3, 100.0)).to(be_true)
+            expect(self.tracker.version("A")).to(equal(1))
+            expect(self.tracker.version("A", quotesOnly=True)).to(equal(1))
+
+        with it('only bumps the full version if the underlying changed'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            nextBar(self)
+            expect(self.tracker.observe("A", 1.0, 1.2, 101.0)).to(be_true)
+            expect(self.tracker.version("A")).to(equal(1))
+            expect(self.tracker.version("A", quotesOnly=True)).to(equal(0))
+
+        with it('ignores the underlying if no spot is given'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            nextBar(self)
+            expect(self.tracker.observe("A", 1.0, 1.2)).to(be_false)
+
+        with it('keeps a contract dirty for the rest of the bar'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.3, 100.0)
+            expect(self.tracker.observe("A", 1.0, 1.3, 100.0)).to(be_true)
+
+    with context('isClean'):
+        with it('is clean while the version is unchanged'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            version = self.tracker.version("A")
+            computedAt = self.algorithm.Time
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            expect(self.tracker.isClean("A", version, since=computedAt)).to(be_true)
+            nextBar(self)
+            self.tracker.observe("A", 1.1, 1.2, 100.0)
+            expect(self.tracker.isClean("A", version, since=computedAt)).to(be_false)
+
+        with it('is not clean if the contract was not observed in this bar'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            version = self.tracker.version("A")
+            nextBar(self)
+            expect(self.tracker.version("A")).to(be_none)
+            expect(self.tracker.isClean("A", version)).to(be_false)
+            expect(self.tracker.isClean("A", None)).to(be_false)
+
+        with it('expires the values older than maxAge'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            version = self.tracker.version("A")
+            computedAt = self.algorithm.Time
+            nextBar(self, minutes=6)
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            expect(self.tracker.isClean("A", version)).to(be_true)
+            expect(self.tracker.isClean("A", version, since=computedAt)).to(be_false)
+
+        with it('ignores the underlying with quotesOnly'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            version = self.tracker.version("A", quotesOnly=True)
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.2, 101.0)
+            expect(self.tracker.isClean("A", version, quotesOnly=True)).to(be_true)
+            expect(self.tracker.isClean("A", self.tracker.version("A") - 1)).to(be_false)
+
+    with context('mid'):
+        with it('keeps the mid-price until the quotes change'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            self.tracker.setMid("A", 1.1)
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.2, 101.0)
+            expect(self.tracker.mid("A")).to(equal(1.1))
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.4, 101.0)
+            expect(self.tracker.mid("A")).to(be_none)
+
+    with context('hit rate'):
+        with it('reports the clean/dirty counts of each bar'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            self.tracker.observe("B", 2.0, 2.2, 100.0)
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.2)
+            self.tracker.observe("B", 2.0, 2.3)
+            expect(self.tracker.lastHitRate).to(equal(0.0))
+            expect(self.tracker.hitRate()).to(equal(0.5))
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.2)
+
+            expect(self.tracker.lastHitRate).to(equal(0.5))
+            self.algorithm.executionTimer.count.assert_has_calls([
+                call("Tools.QuoteTracker -> clean", 1),
+                call("Tools.QuoteTracker -> dirty", 1),
+            ])
+
+        with it('moves a contract to the dirty count if it changes again in the same bar'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            nextBar(self)
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            expect(self.tracker.hitRate()).to(equal(1.0))
+            self.tracker.observe("A", 1.0, 1.2, 100.5)
+            expect(self.tracker.hitRate()).to(equal(0.0))
+            expect(self.tracker.dirtyCount).to(equal(1))
+
+    with context('discard'):
+        with it('drops the state of the contract'):
+            self.tracker.observe("A", 1.0, 1.2, 100.0)
+            self.tracker.discard("A")
+            expect(len(self.tracker)).to(equal(0))
@@ -0,0 +1,63 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_below
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+from datetime import datetime, timedelta
+import numpy as np
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.ScenarioGrid import ScenarioGrid
+    from Tools.BSMLibrary import BSM
+    from Tests.mocks.algorithm_imports import OptionRight
+
+
+with description('ScenarioGrid') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.Securities = {}
+            self.algorithm.executionTimer = MagicMock()
+            self.grid = ScenarioGrid(self.algorithm)
+            self.bsm = BSM(self.algorithm)
+            expiry = datetime(2024, 1, 12)
+            # Short put spread
+            self.contracts = [Contract(95.0, OptionRight.Put, expiry, BSMImpliedVolatility=0.22), Contract(90.0, OptionRight.Put, expiry, BSMImpliedVolatility=0.25)]
+            self.sides = [-1, 1]
+
+    with context('evaluate'):
+        with it('matches the scalar pricing on every scenario'):
+            spotShocks = [-0.1, 0.0, 0.05]
+            timeShifts = [timedelta(0), timedelta(days = 3), timedelta(days = 20)]
+            volShocks = [-0.05, 0.0, 0.1]
+            pnl = self.grid.evaluate(self.contracts, self.sides, spotShocks = spotShocks, timeShifts = timeShifts, volShocks = volShocks, openPremium = 1.5, spotPrice = 100.0)
+
+            expect(pnl.shape).to(equal((3, 3, 3)))
+            for i, spotShock in enumerate(spotShocks):
+                for j, timeShift in enumerate(timeShifts):
+                    for k, volShock in enumerate(volShocks):
+                        expected = 1.5 + sum(
+                            side * self.bsm.bsmPrice(contract, contract.BSMImpliedVolatility + volShock, spotPrice = 100.0 * (1 + spotShock), atTime = self.algorithm.Time + timeShift)
+                            for contract, side in zip(self.contracts, self.sides)
+                        )
+                        expect(abs(pnl[i, j, k] - expected)).to(be_below(1e-10))
+
+        with it('uses the given implied volatility'):
+            pnl = self.grid.evaluate(self.contracts, self.sides, openPremium = 0.0, spotPrice = 100.0, sigma = [0.3, 0.3])
+            expected = sum(side * self.bsm.bsmPrice(contract, 0.3, spotPrice = 100.0) for contract, side in zip(self.contracts, self.sides))
+            expect(abs(pnl[0, 0, 0] - expected)).to(be_below(1e-10))
+
+    with context('evaluateBatch'):
+        with it('evaluates each order over the same grid'):
+            expiry = self.contracts[0].Expiry
+            # Second order shares the 95 Put with the first one
+            callSpread = [Contract(105.0, OptionRight.Call, expiry, BSMImpliedVolatility=0.18), self.contracts[0]]
+            orders = [(self.contracts, self.sides, 1.5), (callSpread, [-1, -1], 3.0)]
+            spotShocks = [-0.12, 0.12]
+            pnl = self.grid.evaluateBatch(orders, spotShocks = spotShocks, spotPrice = 100.0)
+
+            expect(pnl.shape).to(equal((2, 2, 1, 1)))
+            for idx, (contracts, sides, openPremium) in enumerate(orders):
+                single = self.grid.evaluate(contracts, sides, spotShocks = spotShocks, openPremium = openPremium, spotPrice = 100.0)
+                expect(float(np.max(np.abs(pnl[idx] - single)))).to(be_below(1e-12))
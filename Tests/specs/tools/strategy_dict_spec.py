@@ -0,0 +1,50 @@
+from mamba import description, context, it, before
+from expects import expect, equal, have_key
+from Tests.spec_helper import patch_imports
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.StrategyDict import StrategyDict
+
+
+class Order:
+    """Plain working order"""
+    def __init__(self, strategyTag):
+        self.strategyTag = strategyTag
+
+
+with description('StrategyDict') as self:
+    with before.each:
+        self.orders = StrategyDict(lambda order: order.strategyTag)
+        self.orders["a"] = Order("SPXic")
+        self.orders["b"] = Order("SPXic")
+        self.orders["c"] = Order("SPXcs")
+
+    with context('counts'):
+        with it('counts the entries of each strategy'):
+            expect(self.orders.countTag("SPXic")).to(equal(2))
+            expect(self.orders.countTag("SPXcs")).to(equal(1))
+            expect(self.orders.countTag("Other")).to(equal(0))
+
+        with it('moves the entry to the new strategy when it is replaced'):
+            self.orders["a"] = Order("SPXcs")
+            expect(self.orders.countTag("SPXic")).to(equal(1))
+            expect(self.orders.countTag("SPXcs")).to(equal(2))
+            expect(len(self.orders)).to(equal(3))
+
+        with it('updates the counts when the entries are removed'):
+            del self.orders["a"]
+            self.orders.pop("c")
+            self.orders.pop("missing", None)
+            expect(self.orders.countTag("SPXic")).to(equal(1))
+            expect(self.orders.countTag("SPXcs")).to(equal(0))
+            expect(self.orders.counts).not_to(have_key("SPXcs"))
+
+        with it('matches a full scan after a mix of operations'):
+            self.orders.update({"d": Order("SPXbf"), "e": Order("SPXic")})
+            self.orders.setdefault("e", Order("SPXcs"))
+            self.orders.popitem()
+            for tag in ["SPXic", "SPXcs", "SPXbf"]:
+                expected = sum(1 for order in self.orders.values() if order.strategyTag == tag)
+                expect(self.orders.countTag(tag)).to(equal(expected))
+            self.orders.clear()
+            expect(self.orders.countTag("SPXic")).to(equal(0))
@@ -0,0 +1,82 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_none
+from Tests.spec_helper import patch_imports
+import numpy as np
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.StrikeIndex import StrikeIndex
+
+
+class Contract:
+    """Plain option contract"""
+    def __init__(self, strike, right="Call"):
+        self.Strike = strike
+        self.Right = right
+
+    def __repr__(self):
+        return f"Contract({self.Strike}, {self.Right})"
+
+
+def legacyWing(contracts, wingSize):
+    """Linear scan used by OrderBuilder.getWing before the strike index"""
+    wingContract = None
+    firstLegStrike = contracts[0].Strike
+    currentWings = float('inf')
+    for contract in contracts[1:]:
+        strike_difference = abs(contract.Strike - firstLegStrike)
+        if strike_difference <= wingSize:
+            wingContract = contract
+            currentWings = strike_difference
+        elif strike_difference - wingSize < currentWings - wingSize:
+            wingContract = contract
+            currentWings = strike_difference
+        else:
+            break
+    return wingContract
+
+
+with description('StrikeIndex') as self:
+    with before.each:
+        rng = np.random.default_rng(11)
+        strikes = rng.choice(np.arange(4000, 4200, 5), size=60)
+        self.contracts = [Contract(float(strike), right) for strike in strikes for right in ["Put", "Call"]]
+        rng.shuffle(self.contracts)
+        self.index = StrikeIndex(self.contracts)
+
+    with context('nearest'):
+        with it('matches a stable sort by distance'):
+            for price in [3900.0, 4000.0, 4052.5, 4101.0, 4197.5, 4500.0]:
+                for n in [1, 2, 3, 7]:
+                    expected = sorted(self.contracts, key=lambda x: abs(x.Strike - price))[:n]
+                    expect(self.index.nearest(price, n=n)).to(equal(expected))
+
+        with it('returns an empty list when empty'):
+            expect(StrikeIndex([]).nearest(4000.0, n=2)).to(equal([]))
+            expect(StrikeIndex([]).nearestStrike(4000.0)).to(be_none)
+
+    with context('offsetStrike'):
+        with it('moves along the listed strikes'):
+            strikes = sorted({contract.Strike for contract in self.contracts})
+            atm = self.index.nearestStrike(4101.0)
+            position = strikes.index(atm)
+
+            expect(self.index.offsetStrike(4101.0, 0)).to(equal(atm))
+            expect(self.index.offsetStrike(4101.0, 2)).to(equal(strikes[position + 2]))
+            expect(self.index.offsetStrike(4101.0, -3)).to(equal(strikes[position - 3]))
+            expect(self.index.offsetStrike(4101.0, len(strikes))).to(be_none)
+
+    with context('atStrike'):
+        with it('returns the contracts of the strike in the original order'):
+            strike = self.contracts[0].Strike
+            expected = [contract for contract in self.contracts if contract.Strike == strike]
+            expect(self.index.atStrike(strike)).to(equal(expected))
+
+    with context('wingPositions'):
+        with it('matches the linear scan for every leg'):
+            for reverse in [False, True]:
+                ladder = sorted({contract.Strike for contract in self.contracts}, reverse=reverse)
+                ladder = [Contract(strike) for strike in ladder]
+                for wingSize in [1, 5, 12, 25]:
+                    wings = StrikeIndex.wingPositions([contract.Strike for contract in ladder], wingSize)
+                    for i in range(len(ladder) - 1):
+                        expect(ladder[wings[i]]).to(equal(legacyWing(ladder[i:], wingSize)))
@@ -0,0 +1,78 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_true, be_false
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.SubscriptionRegistry import SubscriptionRegistry
+
+
+with description('SubscriptionRegistry') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.registry = SubscriptionRegistry(self.algorithm)
+
+    with context('acquire'):
+        with it('returns only the contracts that are not subscribed yet'):
+            expect(self.registry.acquire(["A", "B"], owner="tag1")).to(equal(["A", "B"]))
+            expect(self.registry.acquire(["B", "C"], owner=("scan", "SPXic"))).to(equal(["C"]))
+
+            expect(len(self.registry)).to(equal(3))
+            expect("B" in self.registry).to(be_true)
+            expect(self.registry.refCount("B")).to(equal(2))
+
+        with it('counts each owner once'):
+            self.registry.acquire(["A"], owner="tag1")
+            self.registry.acquire(["A"], owner="tag1")
+            expect(self.registry.refCount("A")).to(equal(1))
+
+    with context('release'):
+        with before.each:
+            self.registry.acquire(["A", "B"], owner="tag1")
+            self.registry.acquire(["B", "C"], owner="scan")
+            self.registry.subscribed.update(["A", "B", "C"])
+
+        with it('returns the contracts that are no longer referenced'):
+            expect(sorted(self.registry.release(owner="tag1"))).to(equal(["A"]))
+            expect(self.registry.release(["C", "D"], owner="scan")).to(equal(["C"]))
+            expect(sorted(self.registry.unreferenced())).to(equal(["A", "C"]))
+            # The contracts stay registered until they are removed
+            expect(len(self.registry)).to(equal(3))
+
+        with it('only returns the contracts subscribed through AddOptionContracts'):
+            self.registry.subscribed.discard("A")
+            self.registry.release(owner="tag1")
+            expect(self.registry.unreferenced()).to(equal([]))
+
+        with it('ignores the owners without references'):
+            expect(self.registry.release(owner="other")).to(equal([]))
+            expect(self.registry.refCount("A")).to(equal(1))
+
+    with context('remove'):
+        with it('drops the contract and the references of its owners'):
+            self.registry.acquire(["A", "B"], owner="tag1")
+            self.registry.remove("A")
+
+            expect("A" in self.registry).to(be_false)
+            expect(self.registry.release(owner="tag1")).to(equal(["B"]))
+
+    with context('tier'):
+        with it('puts the contracts referenced by a position in the leg tier'):
+            self.registry.acquire(["A", "B"], owner=("scan", "SPXic"))
+            self.registry.acquire(["B"], owner="tag1")
+            self.registry.append("C")
+
+            expect(self.registry.tier("A")).to(equal("scan"))
+            expect(self.registry.tier("B")).to(equal("leg"))
+            expect(self.registry.tier("C")).to(equal("scan"))
+            expect(self.registry.scanOwners("B")).to(equal([("scan", "SPXic")]))
+            self.registry.release(owner="tag1")
+            expect(self.registry.tier("B")).to(equal("scan"))
+
+    with context('list compatibility'):
+        with it('supports append and the comparison with a list'):
+            expect(self.registry).to(equal([]))
+            self.registry.append("A")
+            expect(self.registry).to(equal(["A"]))
+            expect(self.registry.release(owner=None)).to(equal(["A"]))
@@ -54,6 +54,20 @@ with description('Timer') as self:
                 expect(perf['elapsedMin']).to(equal(1.0))
                 expect(perf['elapsedMax']).to(equal(2.0))
 
+    with context('count'):
+        with it('accumulates the counters'):
+            self.timer.count('hits')
+            self.timer.count('hits', 2)
+            self.timer.count('misses')
+
+            expect(self.timer.counters).to(equal({'hits': 3, 'misses': 1}))
+
+        with it('logs the counters with the stats'):
+            self.timer.count('hits')
+            self.timer.showStats()
+
+            self.algorithm.Log.assert_any_call("  --> hits: 1")
+
     with context('showStats'):
         with it('displays stats for single method'):
             with patch('time.perf_counter') as mock_timer:
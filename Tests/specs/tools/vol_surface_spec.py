@@ -0,0 +1,141 @@
+from mamba import description, context, it, before
+from expects import expect, equal, be_none, be_true, be_within, be_below
+from unittest.mock import MagicMock
+from Tests.spec_helper import patch_imports
+from Tests.factories import Factory, Contract
+from Tests.mocks.module_mocks import ModuleMocks
+from datetime import datetime, timedelta
+import numpy as np
+
+with patch_imports()[0], patch_imports()[1]:
+    from Tools.VolSurface import VolSurface
+    from Tools.BSMLibrary import BSM
+    from Tests.mocks.algorithm_imports import OptionRight
+
+
+def skew(strike, spot = 100.0):
+    return 0.2 - 0.5*np.log(strike/spot)
+
+
+def quote(bsm, contract, spot = 100.0, sigma = None, spread = 0.02):
+    """Quotes the contract around the BSM price with a relative bid-ask spread"""
+    sigma = sigma if sigma is not None else skew(contract.Strike, spot)
+    price = bsm.bsmPrice(contract, sigma, spotPrice = spot)
+    contract.BidPrice = price * (1 - spread/2)
+    contract.AskPrice = price * (1 + spread/2)
+
+
+with description('VolSurface') as self:
+    with before.each:
+        with patch_imports()[0], patch_imports()[1]:
+            self.algorithm = Factory.create_algorithm()
+            self.algorithm.Time = datetime(2024, 1, 2, 10, 0)
+            self.algorithm.Securities = {}
+            self.algorithm.executionTimer = MagicMock()
+            self.bsm = BSM(self.algorithm)
+            self.surface = VolSurface(self.algorithm)
+            self.expiry = datetime(2024, 3, 1)
+            self.chain = []
+            for strike in np.arange(80.0, 121.0, 2.5):
+                for right in [OptionRight.Call, OptionRight.Put]:
+                    contract = Contract(strike, right, self.expiry)
+                    quote(self.bsm, contract)
+                    self.chain.append(contract)
+
+    with context('fit'):
+        with it('reproduces the IV of the quotes used for the fit'):
+            self.surface.fit(self.chain)
+
+            for strike in [85.0, 95.0, 105.0, 115.0]:
+                expect(abs(self.surface.ivAt("TEST", self.expiry, strike) - skew(strike))).to(be_below(1e-3))
+
+        with it('interpolates between strikes and is flat outside the fitted range'):
+            self.surface.fit(self.chain)
+
+            expect(abs(self.surface.ivAt("TEST", self.expiry, 101.25) - skew(101.25))).to(be_below(2e-3))
+            expect(float(self.surface.ivAt("TEST", self.expiry, 200.0))).to(equal(float(self.surface.ivAt("TEST", self.expiry, 120.0))))
+
+        with it('ignores illiquid quotes'):
+            wing = [c for c in self.chain if c.Strike == 120.0 and c.Right == OptionRight.Call][0]
+            wing.BidPrice = 0.0
+
+            self.surface.fit(self.chain)
+
+            expect(bool(np.isclose(self.surface.smiles[("TEST", self.expiry)].k[-1], np.log(117.5/self.surface.smiles[("TEST", self.expiry)].forward)))).to(be_true)
+
+        with it('returns None when there are not enough liquid quotes'):
+            for contract in self.chain:
+                contract.BidPrice = 0.0
+
+            expect(self.surface.fitExpiry(self.expiry, self.chain)).to(be_none)
+            expect(self.surface.ivAt("TEST", self.expiry, 100.0)).to(be_none)
+
+        with it('refits incrementally when only a few quotes changed'):
+            self.surface.fit(self.chain)
+            self.algorithm.Time += timedelta(minutes = 1)
+            # Re-quote the 80 Put (the 80 Call is ITM and not used in the fit)
+            quote(self.bsm, self.chain[1], sigma = 0.35)
+
+            self.surface.fit(self.chain)
+
+            self.algorithm.executionTimer.count.assert_called_with("Tools.VolSurface -> fit -> incremental")
+            expect(abs(self.surface.ivAt("TEST", self.expiry, 80.0) - 0.35)).to(be_below(1e-3))
+
+        with it('refits fully when the spot moves'):
+            self.surface.fit(self.chain)
+            self.algorithm.Time += timedelta(minutes = 1)
+            for contract in self.chain:
+                contract.UnderlyingLastPrice = 101.0
+                quote(self.bsm, contract, spot = 101.0)
+
+            self.surface.fit(self.chain)
+
+            self.algorithm.executionTimer.count.assert_called_with("Tools.VolSurface -> fit -> full")
+
+    with context('underlyings'):
+        with before.each:
+            # Second underlying with the same expiry and a flat smile
+            self.other = []
+            for strike in np.arange(80.0, 121.0, 2.5):
+                for right in [OptionRight.Call, OptionRight.Put]:
+                    contract = Contract(strike, right, self.expiry, underlying = "OTHER")
+                    quote(self.bsm, contract, sigma = 0.4)
+                    self.other.append(contract)
+
+        with it('keeps a separate smile for each underlying with the same expiry'):
+            self.surface.fit(self.chain + self.other)
+
+            expect(abs(self.surface.ivAt("TEST", self.expiry, 95.0) - skew(95.0))).to(be_below(1e-3))
+            expect(abs(self.surface.ivAt("OTHER", self.expiry, 95.0) - 0.4)).to(be_below(1e-3))
+            expect(abs(self.surface.iv(self.chain[10]) - skew(self.chain[10].Strike))).to(be_below(1e-3))
+            expect(abs(self.surface.iv(self.other[10]) - 0.4)).to(be_below(1e-3))
+
+        with it('does not return the smile of another underlying'):
+            self.surface.fit(self.other)
+
+            expect(self.surface.iv(self.chain[10])).to(be_none)
+
+        with it('clears the expired smiles of all the underlyings'):
+            self.surface.fit(self.chain + self.other)
+
+            self.surface.clear(before = self.expiry + timedelta(days = 1))
+
+            expect(self.surface.smiles).to(equal({}))
+
+    with context('BSM integration'):
+        with it('reads the IV from the surface when enabled'):
+            self.algorithm.useVolSurface = True
+            self.algorithm.volSurface = self.surface
+            self.surface.fit(self.chain)
+            # Illiquid wing quoted far away from the smile
+            wing = Contract(130.0, OptionRight.Call, self.expiry)
+            wing.BidPrice = 0.0
+            wing.AskPrice = 0.05
+
+            self.bsm.setGreeks([wing])
+
+            expect(wing.BSMGreeks.IV).to(be_within(float(self.surface.ivAt("TEST", self.expiry, 130.0)) - 1e-5, float(self.surface.ivAt("TEST", self.expiry, 130.0)) + 1e-5))
+            expect(wing.BSMGreeks.IVConverged).to(be_none)
+
+    def cleanup(self):
+        ModuleMocks.cleanup()
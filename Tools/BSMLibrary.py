@@ -24,6 +24,16 @@ from scipy import optimize
 from scipy.stats import norm
 from Tools import Logger, ContractUtils
 
+# Standard normal CDF/PDF on scalars (no scipy dispatch overhead)
+SQRT2 = sqrt(2.0)
+INV_SQRT2PI = 1.0/sqrt(2.0*pi)
+
+def normCdf(x):
+    return 0.5*erfc(-x/SQRT2)
+
+def normPdf(x):
+    return INV_SQRT2PI*exp(-0.5*x*x)
+
 
 class BSM:
     def __init__(self, context, tradingDays = 365.0):
@@ -37,6 +47,10 @@ class BSM:
         self.riskFreeRate = context.riskFreeRate
         # Set the number of trading days
         self.tradingDays = tradingDays
+        # Bounds of the approximate (Taylor expansion) refresh of the Greeks (see refreshGreeks)
+        self.refreshMaxSpotMove = getattr(context, "greeksRefreshMaxSpotMove", 0.002)
+        self.refreshMaxAge = getattr(context, "greeksRefreshMaxAge", timedelta(minutes = 10))
+        self.refreshMaxIVChange = getattr(context, "greeksRefreshMaxIVChange", 0.01)
 
     def isITM(self, contract, spotPrice = None):
         # Get the current price of the underlying unless otherwise specified
@@ -301,6 +315,95 @@ class BSM:
         # Return the result
         return IV
 
+    # Compute the Implied Volatility of a whole chain in one pass. All inputs are NumPy arrays (or scalars that can be broadcast):
+    #  - prices: option prices (i.e. mid-prices) to match
+    #  - strikes, isCall, tau, spotPrice: same as bsmBatch
+    #  - x0: optional starting point (i.e. the IV from the previous bar). Contracts without a valid x0 start from the Corrado-Miller approximation
+    # All contracts are iterated together with Halley's method and a per-contract convergence mask. Contracts that do not converge
+    # are retried with a vectorized bisection over the same bracket as bsmIV [0.0001, 2].
+    # Returns a tuple (IV, converged): IV is set to 0 wherever converged is False
+    def bsmIVBatch(self, prices, strikes, isCall, tau, spotPrice, ir = None, x0 = None, xtol = 1e-6, maxIterations = 50):
+        # Start the timer
+        self.context.executionTimer.start("Tools.BSMLibrary -> bsmIVBatch")
+
+        # Broadcast all the inputs to the same shape
+        prices, strikes, isCall, tau, spotPrice = np.broadcast_arrays(
+            np.asarray(prices, dtype = np.float64)
+            , np.asarray(strikes, dtype = np.float64)
+            , np.asarray(isCall, dtype = bool)
+            , np.asarray(tau, dtype = np.float64)
+            , np.asarray(spotPrice, dtype = np.float64)
+        )
+
+        # Initialize the IV to zero in case anything goes wrong
+        IV = np.zeros(prices.shape)
+        # Initialize the flags to mark whether we were able to find the root
+        converged = np.zeros(prices.shape, dtype = bool)
+        # Expired contracts or contracts without a valid price cannot be solved
+        solvable = (tau > 0) & np.isfinite(prices) & (prices > 0)
+
+        with np.errstate(divide = "ignore", invalid = "ignore", over = "ignore"):
+            # Initial guess: Corrado-Miller approximation (using the Call price, from the Put-Call parity if needed)
+            Xert = strikes * np.exp(-self.riskFreeRate*tau)
+            callPrice = np.where(isCall, prices, prices + spotPrice - Xert)
+            halfIntrinsic = callPrice - (spotPrice - Xert)/2.0
+            discriminant = np.maximum(halfIntrinsic**2 - (spotPrice - Xert)**2/np.pi, 0.0)
+            sigma = np.sqrt(2.0*np.pi/tau)/(spotPrice + Xert) * (halfIntrinsic + np.sqrt(discriminant))
+            # Use the starting point provided (if any)
+            if x0 is not None:
+                x0 = np.broadcast_to(np.asarray(x0, dtype = np.float64), prices.shape)
+                sigma = np.where(np.isfinite(x0) & (x0 > 0), x0, sigma)
+            # Make sure we start from a reasonable value
+            sigma = np.where(np.isfinite(sigma) & (sigma > 0), sigma, 0.1)
+
+            # Halley's method on all the active contracts at once
+            active = solvable.copy()
+            for _ in range(maxIterations):
+                idx = np.flatnonzero(active)
+                if idx.size == 0:
+                    break
+                result = self.bsmBatch(strikes[idx], isCall[idx], tau[idx], spotPrice[idx], sigma[idx], ir = ir)
+                f = result["price"] - prices[idx]
+                fprime = result["vega"]
+                fprime2 = result["vomma"]
+                # Halley step
+                step = 2.0*f*fprime/(2.0*fprime**2 - f*fprime2)
+                newSigma = sigma[idx] - step
+                # Stop iterating on the contracts where the method breaks down: they will go through the bisection
+                failed = ~np.isfinite(newSigma) | (newSigma <= 0) | (fprime == 0)
+                done = ~failed & (np.abs(step) < xtol)
+                sigma[idx] = np.where(failed, sigma[idx], newSigma)
+                converged[idx[done]] = True
+                active[idx[done | failed]] = False
+
+            # Fallback method (Bisection) for the contracts where Halley's optimization failed
+            pending = np.flatnonzero(solvable & ~converged)
+            if pending.size > 0:
+                lower = np.full(pending.size, 0.0001)
+                upper = np.full(pending.size, 2.0)
+                fLower = self.bsmBatch(strikes[pending], isCall[pending], tau[pending], spotPrice[pending], lower, ir = ir)["price"] - prices[pending]
+                fUpper = self.bsmBatch(strikes[pending], isCall[pending], tau[pending], spotPrice[pending], upper, ir = ir)["price"] - prices[pending]
+                # Only the contracts where the root is bracketed can be solved
+                bracketed = np.sign(fLower) * np.sign(fUpper) <= 0
+                while np.any(upper - lower >= xtol):
+                    middle = 0.5*(lower + upper)
+                    fMiddle = self.bsmBatch(strikes[pending], isCall[pending], tau[pending], spotPrice[pending], middle, ir = ir)["price"] - prices[pending]
+                    # Keep the half of the bracket containing the root
+                    isLower = np.sign(fMiddle) == np.sign(fLower)
+                    lower = np.where(isLower, middle, lower)
+                    fLower = np.where(isLower, fMiddle, fLower)
+                    upper = np.where(isLower, upper, middle)
+                sigma[pending] = 0.5*(lower + upper)
+                converged[pending] = bracketed & np.isfinite(fLower)
+
+        # Set the IV where we found the root
+        IV = np.where(converged, sigma, IV)
+
+        # Stop the timer
+        self.context.executionTimer.stop("Tools.BSMLibrary -> bsmIVBatch")
+
+        return IV, converged
+
     # Compute the Delta of an option
     def bsmDelta(self, contract, sigma, tau = None, d1 = None, ir = None, spotPrice = None, atTime = None):
         if d1 == None:
@@ -325,34 +428,60 @@ class BSM:
 
         # Avoid recomputing the Greeks if we have already done it for this time bar
         if hasattr(contract, "BSMGreeks") and contract.BSMGreeks.lastUpdated == self.context.Time:
+            # Stop the timer
+            self.context.executionTimer.stop("Tools.BSMLibrary -> computeGreeks")
             return contract.BSMGreeks
 
+        # Options on futures are priced with the (vectorized) Black-76 model
+        if self.isFutureOption(contract):
+            # Stop the timer
+            self.context.executionTimer.stop("Tools.BSMLibrary -> computeGreeks")
+            return self.computeGreeksBatch([contract], sigma = sigma, ir = ir, atTime = atTime, saveIt = saveIt, spotPrice = spotPrice)[0]
+
+        # Get the current price of the underlying unless otherwise specified
+        if spotPrice == None:
+            spotPrice = self.contractUtils.getUnderlyingLastPrice(contract)
+
+        # Check the shared cache (only for the current time bar)
+        cache = self.greeksCache() if atTime == None else None
+        if cache is not None:
+            cacheKey = cache.key(contract, spotPrice, self.contractUtils.midPrice(contract), sigma = sigma, ir = ir)
+            greeks = cache.get(cacheKey)
+            if greeks is not None:
+                # Check if we need to save the Greeks as an attribute of the contract object
+                if saveIt:
+                    self.saveGreeks(contract, greeks, saveIV = sigma == None)
+                # Stop the timer
+                self.context.executionTimer.stop("Tools.BSMLibrary -> computeGreeks")
+                return greeks
+
         # Get the DTE as a fraction of a year
         tau = self.optionTau(contract, atTime = atTime)
 
+        if sigma == None:
+            # Read the Implied Volatility from the fitted surface (if enabled and available)
+            surface = self.volSurface()
+            if surface is not None:
+                sigma = surface.iv(contract)
+                if sigma is not None and saveIt:
+                    contract.BSMImpliedVolatility = sigma
         if sigma == None:
             # Compute Implied Volatility
             sigma = self.bsmIV(contract, tau = tau, saveIt = saveIt)
         ### if (sigma == None)
 
-        # Get the current price of the underlying unless otherwise specified
-        if spotPrice == None:
-            spotPrice = self.contractUtils.getUnderlyingLastPrice(contract)
-
-        # Compute D1
-        d1 = self.bsmD1(contract, sigma, tau = tau, ir = ir, spotPrice = spotPrice)
-        # Compute D2
-        d2 = self.bsmD2(contract, sigma, tau = tau, d1 = d1, ir = ir, spotPrice = spotPrice)
+        # Compute the price and all the Greeks in one pass
+        result = self.bsmFused(contract.Strike, contract.Right == OptionRight.Call, tau, spotPrice, sigma, ir = ir)
 
         # First order derivatives
-        delta = self.bsmDelta(contract, sigma = sigma, tau = tau, d1 = d1, ir = ir, spotPrice = spotPrice)
-        theta = self.bsmTheta(contract, sigma, tau = tau, d1 = d1, d2 = d2, ir = ir, spotPrice = spotPrice)
-        vega = self.bsmVega(contract, sigma, tau = tau, d1 = d1, ir = ir, spotPrice = spotPrice)
-        rho = self.bsmRho(contract, sigma, tau = tau, d1 = d1, d2 = d2, ir = ir, spotPrice = spotPrice)
+        delta = result["delta"]
+        theta = result["theta"]
+        vega = result["vega"]
+        rho = result["rho"]
 
         # Second Order derivatives
-        gamma = self.bsmGamma(contract, sigma, tau = tau, d1 = d1, ir = ir, spotPrice = spotPrice)
-        vomma = self.bsmVomma(contract, sigma, tau = tau, d1 = d1, d2 = d2, ir = ir, spotPrice = spotPrice)
+        gamma = result["gamma"]
+        vomma = result["vomma"]
 
         # Lambda (a.k.a. elasticity or leverage: the percentage change in option value per percentage change in the underlying price)
         elasticity = delta * np.float64(spotPrice)/np.float64(self.contractUtils.midPrice(contract))
@@ -369,29 +498,521 @@ class BSM:
                             , IV = sigma
                             , lastUpdated = self.context.Time
                             )
+        # Keep the unrounded values as the starting point for refreshGreeks
+        greeks.setAnchor(price = result["price"]
+                         , spotPrice = spotPrice
+                         , delta = delta
+                         , gamma = gamma
+                         , vega = vega
+                         , theta = theta
+                         , IV = sigma
+                         )
 
         # Check if we need to save the Greeks as an attribute of the contract object
         if saveIt:
             contract.BSMGreeks = greeks
 
+        # Store the Greeks in the shared cache
+        if cache is not None:
+            cache.put(cacheKey, greeks)
+
         # Stop the timer
         self.context.executionTimer.stop("Tools.BSMLibrary -> computeGreeks")
 
         return greeks
 
 
+    # Shared setup of the vectorized models (bsmBatch, bsmPriceBatch and black76Batch): broadcasts the inputs to the same shape
+    # and computes D1/D2 with the same edge cases as bsmD1 (expired contracts or sigma = 0 -> deep ITM: sign * Inf, far OTM: -sign * Inf).
+    #  - drift: rate of the drift of D1 = (log(S/K) + (drift + sigma^2/2)*tau)/(sigma*sqrt(tau)) (the risk free rate for Black-Scholes, 0 for Black-76)
+    #  - discountRate: rate of the discount factor e^(-discountRate*tau)
+    # Returns the broadcasted inputs followed by sqrt(tau), the degenerate flags, the sign (+1 Call, -1 Put), D1, D2 and the discount factor.
+    def batchD1D2(self, strikes, isCall, tau, underlyingPrice, sigma, drift, discountRate):
+        # Broadcast all the inputs to the same shape
+        strikes, isCall, tau, underlyingPrice, sigma = np.broadcast_arrays(
+            np.asarray(strikes, dtype = np.float64)
+            , np.asarray(isCall, dtype = bool)
+            , np.asarray(tau, dtype = np.float64)
+            , np.asarray(underlyingPrice, dtype = np.float64)
+            , np.asarray(sigma, dtype = np.float64)
+        )
+
+        with np.errstate(divide = "ignore", invalid = "ignore", over = "ignore"):
+            sqrtTau = np.sqrt(tau)
+            # Contracts that are expired (tau = 0) or for which the IV could not be computed (sigma = 0)
+            degenerate = (tau == 0) | (sigma == 0)
+            # Set the sign based on whether it is a Call (+1) or a Put (-1)
+            sign = np.where(isCall, 1.0, -1.0)
+            # ITM/OTM flags (used for the degenerate cases)
+            itm = np.where(isCall, strikes < underlyingPrice, underlyingPrice < strikes)
+            # Compute D1: deep ITM -> sign * Inf, far OTM -> -sign * Inf
+            d1 = np.where(degenerate
+                          , sign * np.where(itm, np.inf, -np.inf)
+                          , (np.log(underlyingPrice/strikes) + (drift + 0.5*sigma**2)*tau)/(sigma * sqrtTau)
+                          )
+            # Compute D2
+            d2 = d1 - sigma * sqrtTau
+            # Discount factor
+            discount = np.exp(-discountRate*tau)
+
+        return strikes, isCall, tau, underlyingPrice, sigma, sqrtTau, degenerate, sign, d1, d2, discount
+
+    # Vectorized pricing of a whole chain in one pass. All inputs are NumPy arrays (or scalars that can be broadcast):
+    #  - strikes: strike prices
+    #  - isCall: boolean mask, True for Calls and False for Puts
+    #  - tau: DTE as a fraction of a year (see optionTau)
+    #  - spotPrice: price of the underlying
+    #  - sigma: volatility
+    # Returns a dictionary of arrays with the price, delta, gamma, vega, theta, rho and vomma of each contract.
+    # The results match the scalar methods (bsmPrice, bsmDelta, ...), including the edge cases tau = 0 and sigma = 0.
+    def bsmBatch(self, strikes, isCall, tau, spotPrice, sigma, ir = None):
+        # Use the risk free rate unless otherwise specified
+        if ir == None:
+            ir = self.riskFreeRate
+
+        # Broadcast the inputs and compute D1/D2 and the discount factor (X*e^(-r*tau) uses the risk free rate, like bsmPrice)
+        strikes, isCall, tau, spotPrice, sigma, sqrtTau, degenerate, sign, d1, d2, discount = self.batchD1D2(
+            strikes, isCall, tau, spotPrice, sigma, ir, self.riskFreeRate
+        )
+
+        # The edge cases are handled the same way as bsmD1/bsmGamma/bsmVomma: we let NumPy produce inf/nan silently
+        with np.errstate(divide = "ignore", invalid = "ignore", over = "ignore"):
+            # Compute the CDF/PDF only once
+            Nd1 = norm.cdf(d1)
+            Nd2 = norm.cdf(d2)
+            Nmd1 = norm.cdf(-d1)
+            Nmd2 = norm.cdf(-d2)
+            nd1 = norm.pdf(d1)
+
+            # X*e^(-r*tau)
+            Xert = strikes * discount
+
+            # Price
+            price = np.where(isCall, Nd1*spotPrice - Nd2*Xert, Nmd2*Xert - Nmd1*spotPrice)
+            # Delta
+            delta = np.where(isCall, Nd1, -Nmd1)
+            # Theta (daily)
+            SNs = -(spotPrice * nd1 * sigma) / (2.0 * sqrtTau)
+            rXert = self.riskFreeRate * Xert
+            theta = np.where(isCall, SNs - rXert * Nd2, SNs + rXert * Nmd2)/self.tradingDays
+            # Rho
+            tXert = tau * self.riskFreeRate * Xert
+            rho = np.where(isCall, tXert * Nd2, -tXert * Nmd2)
+            # Gamma
+            gamma = np.where(degenerate, np.inf, nd1 / (spotPrice * sigma * sqrtTau))
+            # Vega
+            vega = spotPrice * nd1 * sqrtTau
+            # Vomma
+            vomma = np.where(sigma == 0, np.inf, vega * d1 * d2 / sigma)
+
+        return {"price": price
+                , "delta": delta
+                , "gamma": gamma
+                , "vega": vega
+                , "theta": theta
+                , "rho": rho
+                , "vomma": vomma
+                }
+
+    # Vectorized pricing only (same inputs and edge cases as bsmBatch, without computing the Greeks).
+    # Used to price the contracts over a grid of scenarios (see ScenarioGrid).
+    def bsmPriceBatch(self, strikes, isCall, tau, spotPrice, sigma, ir = None):
+        # Use the risk free rate unless otherwise specified
+        if ir == None:
+            ir = self.riskFreeRate
+
+        # Broadcast the inputs and compute D1/D2 and the discount factor (same as bsmBatch)
+        strikes, isCall, tau, spotPrice, sigma, sqrtTau, degenerate, sign, d1, d2, discount = self.batchD1D2(
+            strikes, isCall, tau, spotPrice, sigma, ir, self.riskFreeRate
+        )
+
+        with np.errstate(divide = "ignore", invalid = "ignore", over = "ignore"):
+            # Price: sign * (N(sign*d1)*S - N(sign*d2)*X*e^(-r*tau))
+            price = sign * (norm.cdf(sign*d1)*spotPrice - norm.cdf(sign*d2)*strikes*discount)
+
+        return price
+
+    # Vectorized Black-76 pricing of options on futures (FOP). Same inputs as bsmBatch, with the price of the underlying future
+    # (forwardPrice) in place of the spot price:
+    #  - d1 = (log(F/K) + sigma^2/2*tau)/(sigma*sqrt(tau)), d2 = d1 - sigma*sqrt(tau)
+    #  - Call = e^(-r*tau)*(F*N(d1) - K*N(d2)), Put = e^(-r*tau)*(K*N(-d2) - F*N(-d1))
+    # The Greeks are computed with respect to the futures price. Theta is daily (like bsmBatch) and Rho = -tau*price.
+    # Returns a dictionary of arrays with the price, delta, gamma, vega, theta, rho and vomma of each contract.
+    def black76Batch(self, strikes, isCall, tau, forwardPrice, sigma, ir = None):
+        # Use the risk free rate unless otherwise specified
+        if ir == None:
+            ir = self.riskFreeRate
+
+        # Broadcast the inputs and compute D1/D2 (no drift: the future has no cost of carry) and the discount factor e^(-r*tau)
+        strikes, isCall, tau, forwardPrice, sigma, sqrtTau, degenerate, sign, d1, d2, discount = self.batchD1D2(
+            strikes, isCall, tau, forwardPrice, sigma, 0.0, ir
+        )
+
+        with np.errstate(divide = "ignore", invalid = "ignore", over = "ignore"):
+            # Compute the CDF/PDF only once
+            Nsd1 = norm.cdf(sign*d1)
+            Nsd2 = norm.cdf(sign*d2)
+            nd1 = norm.pdf(d1)
+
+            # Price
+            price = sign * discount * (forwardPrice*Nsd1 - strikes*Nsd2)
+            # Delta
+            delta = sign * discount * Nsd1
+            # Gamma
+            gamma = np.where(degenerate, np.inf, discount * nd1 / (forwardPrice * sigma * sqrtTau))
+            # Vega
+            vega = discount * forwardPrice * nd1 * sqrtTau
+            # Theta (daily)
+            theta = (-discount * forwardPrice * nd1 * sigma / (2.0 * sqrtTau) + ir * price)/self.tradingDays
+            # Rho
+            rho = -tau * price
+            # Vomma
+            vomma = np.where(sigma == 0, np.inf, vega * d1 * d2 / sigma)
+
+        return {"price": price
+                , "delta": delta
+                , "gamma": gamma
+                , "vega": vega
+                , "theta": theta
+                , "rho": rho
+                , "vomma": vomma
+                }
+
+    # Check whether the contract is an option on a future (priced with the Black-76 model). Strategies trading future options
+    # (DataHandler.is_future_option) subscribe to FutureOption securities, so their contracts are routed to Black-76 automatically.
+    def isFutureOption(self, contract):
+        return getattr(contract.Symbol, "SecurityType", None) == SecurityType.FutureOption
+
+    # Fused scalar pricing of a single contract: tau, discount factor, d1, d2, N(d1), N(d2) and n(d1) are computed only once
+    # (with math.erf based normals) and all the Greeks are derived from them.
+    # Returns a dictionary with the price, delta, gamma, vega, theta, rho and vomma of the contract.
+    # The results match the individual methods (bsmPrice, bsmDelta, ...), including the edge cases tau = 0 and sigma = 0.
+    def bsmFused(self, strike, isCall, tau, spotPrice, sigma, ir = None):
+        # Use the risk free rate unless otherwise specified
+        if ir == None:
+            ir = self.riskFreeRate
+
+        sqrtTau = sqrt(tau)
+        # Contracts that are expired (tau = 0) or for which the IV could not be computed (sigma = 0)
+        degenerate = tau == 0 or sigma == 0
+        if degenerate:
+            # Set the sign based on whether it is a Call (+1) or a Put (-1)
+            sign = 1.0 if isCall else -1.0
+            itm = strike < spotPrice if isCall else spotPrice < strike
+            # Deep ITM -> sign * Inf, far OTM -> -sign * Inf
+            d1 = sign * (float('inf') if itm else float('-inf'))
+        else:
+            d1 = (log(spotPrice/strike) + (ir + 0.5*sigma**2)*tau)/(sigma * sqrtTau)
+        d2 = d1 - sigma * sqrtTau
+
+        # Discount factor and the normal CDF/PDF
+        df = exp(-self.riskFreeRate*tau)
+        Xert = strike * df
+        nd1 = normPdf(d1)
+
+        if isCall:
+            Nd1 = normCdf(d1)
+            Nd2 = normCdf(d2)
+            price = Nd1*spotPrice - Nd2*Xert
+            delta = Nd1
+        else:
+            Nd1 = normCdf(-d1)
+            Nd2 = normCdf(-d2)
+            price = Nd2*Xert - Nd1*spotPrice
+            delta = -Nd1
+
+        # Theta (daily): -S*N'(d1)*sigma/(2*sqrt(tau)) -/+ r*X*e^(-r*tau)*N(+/-d2)
+        SNs = spotPrice * nd1 * sigma
+        if tau == 0:
+            # 0/0 (same as the NumPy based bsmTheta)
+            SNs = float('nan')
+        else:
+            SNs = -SNs / (2.0 * sqrtTau)
+        rXert = self.riskFreeRate * strike * df
+        theta = (SNs - rXert * Nd2 if isCall else SNs + rXert * Nd2)/self.tradingDays
+
+        # Rho
+        tXert = tau * self.riskFreeRate * strike * df
+        rho = tXert * Nd2 if isCall else -tXert * Nd2
+
+        # Gamma
+        gamma = float('inf') if degenerate else nd1 / (spotPrice * sigma * sqrtTau)
+        # Vega
+        vega = spotPrice * nd1 * sqrtTau
+        # Vomma
+        vomma = float('inf') if sigma == 0 else vega * d1 * d2 / sigma
+
+        return {"price": price
+                , "delta": delta
+                , "gamma": gamma
+                , "vega": vega
+                , "theta": theta
+                , "rho": rho
+                , "vomma": vomma
+                }
+
+    # Compute the Greeks of a list of contracts using the vectorized engine (bsmBatch)
+    def computeGreeksBatch(self, contracts, sigma = None, ir = None, atTime = None, saveIt = False, spotPrice = None):
+        # Start the timer
+        self.context.executionTimer.start("Tools.BSMLibrary -> computeGreeksBatch")
+
+        # Initialize the result list with the Greeks already computed during this time bar (if any)
+        greeksList = [contract.BSMGreeks if hasattr(contract, "BSMGreeks") and contract.BSMGreeks.lastUpdated == self.context.Time else None
+                      for contract in contracts
+                      ]
+        # Reuse the Greeks of the contracts whose quotes (and underlying price) did not change since they were computed
+        quoteTracker = self.quoteTracker() if atTime == None and sigma == None and ir == None and spotPrice == None else None
+        if quoteTracker is not None:
+            reused = 0
+            for idx, contract in enumerate(contracts):
+                greeks = getattr(contract, "BSMGreeks", None) if greeksList[idx] is None else None
+                if isinstance(greeks, BSMGreeks) and quoteTracker.isClean(contract.Symbol, greeks.quoteVersion, since = greeks.lastUpdated):
+                    greeksList[idx] = greeks
+                    reused += 1
+            if reused:
+                self.context.executionTimer.count("Tools.BSMLibrary -> computeGreeksBatch -> clean", reused)
+        # Only process the contracts that have not been updated already during this time bar
+        pendingIdx = [idx for idx, greeks in enumerate(greeksList) if greeks is None]
+        pending = [contracts[idx] for idx in pendingIdx]
+
+        if pending:
+            # Get the price of each underlying only once
+            spotPrices = {}
+            spot = np.empty(len(pending))
+            tau = np.empty(len(pending))
+            strikes = np.empty(len(pending))
+            isCall = np.empty(len(pending), dtype = bool)
+            isFOP = np.empty(len(pending), dtype = bool)
+            midPrices = np.empty(len(pending))
+            for idx, contract in enumerate(pending):
+                underlying = contract.UnderlyingSymbol
+                if underlying not in spotPrices:
+                    # For future options this is the price of the underlying future contract
+                    spotPrices[underlying] = self.contractUtils.getUnderlyingLastPrice(contract) if spotPrice == None else spotPrice
+                spot[idx] = spotPrices[underlying]
+                isFOP[idx] = self.isFutureOption(contract)
+                # Get the DTE as a fraction of a year
+                tau[idx] = self.optionTau(contract, atTime = atTime)
+                strikes[idx] = contract.Strike
+                isCall[idx] = contract.Right == OptionRight.Call
+                midPrices[idx] = self.contractUtils.midPrice(contract)
+
+            # Check the shared cache (only for the current time bar)
+            cache = self.greeksCache() if atTime == None else None
+            if cache is not None:
+                cacheKeys = [cache.key(contract, spot[idx], midPrices[idx], sigma = sigma, ir = ir) for idx, contract in enumerate(pending)]
+                missing = []
+                for idx, contract in enumerate(pending):
+                    greeks = cache.get(cacheKeys[idx])
+                    if greeks is None:
+                        missing.append(idx)
+                    else:
+                        greeksList[pendingIdx[idx]] = greeks
+                        # Check if we need to save the Greeks as an attribute of the contract object
+                        if saveIt:
+                            self.saveGreeks(contract, greeks, saveIV = sigma == None)
+                # Only keep the contracts that were not found in the cache
+                pendingIdx = [pendingIdx[idx] for idx in missing]
+                pending = [pending[idx] for idx in missing]
+                cacheKeys = [cacheKeys[idx] for idx in missing]
+                spot, tau, strikes, isCall, isFOP, midPrices = spot[missing], tau[missing], strikes[missing], isCall[missing], isFOP[missing], midPrices[missing]
+
+        if pending:
+            if sigma == None:
+                iv = np.full(len(pending), np.nan)
+                ivConverged = np.full(len(pending), None)
+                # Read the Implied Volatility from the fitted surface (if enabled and available)
+                surface = self.volSurface()
+                if surface is not None:
+                    iv = np.array([surface.iv(contract) for contract in pending], dtype = np.float64)
+                # Compute the Implied Volatility of all the other contracts at once
+                solve = np.flatnonzero(~np.isfinite(iv))
+                if solve.size > 0:
+                    # Start the search at the lastest known value for the IV (if previously calculated)
+                    x0 = np.array([getattr(pending[idx], "BSMImpliedVolatility", np.nan) for idx in solve], dtype = np.float64)
+                    # Black-76 prices are BSM prices on the discounted futures price: F*e^(-r*tau)
+                    solveSpot = np.where(isFOP[solve], spot[solve] * np.exp(-self.riskFreeRate*tau[solve]), spot[solve])
+                    iv[solve], ivConverged[solve] = self.bsmIVBatch(midPrices[solve], strikes[solve], isCall[solve], tau[solve], solveSpot, ir = ir, x0 = x0)
+                # Check if we need to save the IV as an attribute of the contract object
+                if saveIt:
+                    for idx, contract in enumerate(pending):
+                        contract.BSMImpliedVolatility = iv[idx]
+            else:
+                iv = np.full(len(pending), sigma, dtype = np.float64)
+                ivConverged = np.full(len(pending), None)
+
+            # Price the whole chain in one pass
+            result = self.bsmBatch(strikes, isCall, tau, spot, iv, ir = ir)
+            # Options on futures are priced with the Black-76 model
+            if isFOP.any():
+                fop = self.black76Batch(strikes[isFOP], isCall[isFOP], tau[isFOP], spot[isFOP], iv[isFOP], ir = ir)
+                for key in result:
+                    result[key][isFOP] = fop[key]
+
+            # Lambda (a.k.a. elasticity or leverage: the percentage change in option value per percentage change in the underlying price)
+            with np.errstate(divide = "ignore", invalid = "ignore"):
+                elasticity = result["delta"] * spot / midPrices
+
+            # Create the Greeks objects
+            for idx, contract in enumerate(pending):
+                greeks = BSMGreeks(delta = result["delta"][idx]
+                                   , gamma = result["gamma"][idx]
+                                   , vega = result["vega"][idx]
+                                   , theta = result["theta"][idx]
+                                   , rho = result["rho"][idx]
+                                   , vomma = result["vomma"][idx]
+                                   , elasticity = elasticity[idx]
+                                   , IV = iv[idx]
+                                   , lastUpdated = self.context.Time
+                                   , IVConverged = ivConverged[idx]
+                                   )
+                # Keep the unrounded values as the starting point for refreshGreeks
+                greeks.setAnchor(price = result["price"][idx]
+                                 , spotPrice = spot[idx]
+                                 , delta = result["delta"][idx]
+                                 , gamma = result["gamma"][idx]
+                                 , vega = result["vega"][idx]
+                                 , theta = result["theta"][idx]
+                                 , IV = iv[idx]
+                                 )
+                greeksList[pendingIdx[idx]] = greeks
+                # Version of the quotes used to compute the Greeks (see QuoteTracker)
+                if quoteTracker is not None:
+                    greeks.quoteVersion = quoteTracker.version(contract.Symbol)
+                # Check if we need to save the Greeks as an attribute of the contract object
+                if saveIt:
+                    contract.BSMGreeks = greeks
+                # Store the Greeks in the shared cache
+                if cache is not None:
+                    cache.put(cacheKeys[idx], greeks)
+
+        # Stop the timer
+        self.context.executionTimer.stop("Tools.BSMLibrary -> computeGreeksBatch")
+
+        return greeksList
+
+    # Approximate the current Greeks of a contract with a Taylor expansion around the last full solve (anchor):
+    #  - price = price0 + Delta * dS + 1/2 * Gamma * dS^2 + Theta * dt
+    #  - the residual with respect to the current mid-price is attributed to a change in volatility: dSigma = residual / Vega
+    #  - Delta = Delta0 + Gamma * dS
+    # Returns None if the approximation is not applicable (no anchor, anchor too old, spot move or IV change too large)
+    def approximateGreeks(self, contract, spotPrice = None):
+        # Get the last Greeks computed for this contract
+        previous = getattr(contract, "BSMGreeks", None)
+        if not isinstance(previous, BSMGreeks) or previous.anchor is None:
+            return None
+
+        # Nothing to do if the Greeks have already been updated during this time bar
+        if previous.lastUpdated == self.context.Time:
+            return previous
+
+        anchor = previous.anchor
+        # Check the age of the anchor
+        age = self.context.Time - anchor["lastUpdated"]
+        if age < timedelta(0) or age > self.refreshMaxAge:
+            return None
+
+        # Make sure the anchor can be used for the expansion (i.e. expired contracts or failed IV)
+        if not all(np.isfinite(anchor[key]) for key in ["price", "delta", "gamma", "vega", "theta", "IV"]) or anchor["vega"] <= 0:
+            return None
+
+        # Get the current price of the underlying unless otherwise specified
+        if spotPrice == None:
+            spotPrice = self.contractUtils.getUnderlyingLastPrice(contract)
+
+        # Check the spot move
+        dS = spotPrice - anchor["spotPrice"]
+        if abs(dS) > self.refreshMaxSpotMove * anchor["spotPrice"]:
+            return None
+
+        # Elapsed time in days (Theta is a daily value)
+        dt = age.total_seconds()/(24.0*3600.0)
+        # Taylor expansion of the price
+        price = anchor["price"] + anchor["delta"]*dS + 0.5*anchor["gamma"]*dS**2 + anchor["theta"]*dt
+        # Attribute the residual with respect to the mid-price to a change in volatility
+        midPrice = self.contractUtils.midPrice(contract)
+        dSigma = (midPrice - price)/anchor["vega"]
+        if abs(dSigma) > self.refreshMaxIVChange:
+            return None
+
+        # Update the Delta
+        delta = anchor["delta"] + anchor["gamma"]*dS
+
+        # Lambda (a.k.a. elasticity or leverage: the percentage change in option value per percentage change in the underlying price)
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            elasticity = delta * np.float64(spotPrice)/np.float64(midPrice)
+
+        greeks = BSMGreeks(delta = delta
+                           , gamma = anchor["gamma"]
+                           , vega = anchor["vega"]
+                           , theta = anchor["theta"]
+                           , rho = previous.Rho
+                           , vomma = previous.Vomma
+                           , elasticity = elasticity
+                           , IV = anchor["IV"] + dSigma
+                           , lastUpdated = self.context.Time
+                           , IVConverged = previous.IVConverged
+                           )
+        # Keep expanding around the same anchor
+        greeks.anchor = anchor
+        return greeks
+
+    # Refresh the Greeks of a list of contracts (i.e. the legs of an order being retried) using the Taylor expansion (approximateGreeks)
+    # whenever possible, and fall back to a full IV solve (setGreeks) for the others.
+    def refreshGreeks(self, contracts):
+        # Start the timer
+        self.context.executionTimer.start("Tools.BSMLibrary -> refreshGreeks")
+
+        if not isinstance(contracts, list):
+            contracts = [contracts]
+
+        # List of contracts that require a full IV solve
+        fullRefresh = []
+        for contract in contracts:
+            greeks = self.approximateGreeks(contract)
+            if greeks is None:
+                fullRefresh.append(contract)
+                self.context.executionTimer.count("Tools.BSMLibrary -> refreshGreeks -> full")
+            elif greeks is not contract.BSMGreeks:
+                self.saveGreeks(contract, greeks)
+                self.context.executionTimer.count("Tools.BSMLibrary -> refreshGreeks -> approximate")
+            else:
+                self.context.executionTimer.count("Tools.BSMLibrary -> refreshGreeks -> current")
+
+        if fullRefresh:
+            self.setGreeks(fullRefresh)
+
+        # Stop the timer
+        self.context.executionTimer.stop("Tools.BSMLibrary -> refreshGreeks")
+
+    # Get the fitted volatility surface (only if enabled through the useVolSurface parameter)
+    def volSurface(self):
+        if getattr(self.context, "useVolSurface", False):
+            return getattr(self.context, "volSurface", None)
+        return None
+
+    # Get the cache shared by all BSM instances (if any)
+    def greeksCache(self):
+        return getattr(self.context, "greeksCache", None)
+
+    # Get the dirty set of the quotes (if any)
+    def quoteTracker(self):
+        return getattr(self.context, "quoteTracker", None)
+
+    # Attach the (cached) Greeks to the contract object
+    def saveGreeks(self, contract, greeks, saveIV = True):
+        contract.BSMGreeks = greeks
+        if saveIV:
+            contract.BSMImpliedVolatility = greeks.IV
+
     # Compute and store the Greeks for a list of contracts
     def setGreeks(self, contracts, sigma = None, ir = None):
         # Start the timer
         self.context.executionTimer.start("Tools.BSMLibrary -> setGreeks")
 
         if isinstance(contracts, list):
-            # Loop through all contracts
-            for contract in contracts:
-                # Get the current price of the underlying
-                spotPrice = self.contractUtils.getUnderlyingLastPrice(contract)
-                # Compute the Greeks for the contract
-                self.computeGreeks(contract, sigma = sigma, ir = ir, spotPrice = spotPrice, saveIt = True)
+            # Price the whole list in one vectorized pass
+            self.computeGreeksBatch(contracts, sigma = sigma, ir = ir, saveIt = True)
         else:
             # Get the current price of the underlying
             spotPrice = self.contractUtils.getUnderlyingLastPrice(contracts)
@@ -419,7 +1040,7 @@ class BSM:
         return
 
 class BSMGreeks:
-    def __init__(self, delta = None, gamma = None, vega = None, theta = None, rho = None, vomma = None, elasticity = None, IV = None, lastUpdated = None, precision = 5):
+    def __init__(self, delta = None, gamma = None, vega = None, theta = None, rho = None, vomma = None, elasticity = None, IV = None, lastUpdated = None, precision = 5, IVConverged = None):
         self.Delta = self.roundIt(delta, precision)
         self.Gamma = self.roundIt(gamma, precision)
         self.Vega = self.roundIt(vega, precision)
@@ -429,6 +1050,23 @@ class BSMGreeks:
         self.Elasticity = self.roundIt(elasticity, precision)
         self.IV = self.roundIt(IV, precision)
         self.lastUpdated = lastUpdated
+        # Whether the IV solver converged (None if the volatility was provided by the caller)
+        self.IVConverged = None if IVConverged is None else bool(IVConverged)
+        # Unrounded values of the last full solve (see BSM.refreshGreeks)
+        self.anchor = None
+        # Version of the quotes of the contract used to compute the Greeks (see QuoteTracker)
+        self.quoteVersion = None
+
+    def setAnchor(self, price, spotPrice, delta, gamma, vega, theta, IV):
+        self.anchor = {"price": float(price)
+                       , "spotPrice": float(spotPrice)
+                       , "delta": float(delta)
+                       , "gamma": float(gamma)
+                       , "vega": float(vega)
+                       , "theta": float(theta)
+                       , "IV": float(IV)
+                       , "lastUpdated": self.lastUpdated
+                       }
 
     def roundIt(self, value, precision = None):
         if precision:
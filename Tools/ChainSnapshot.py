@@ -0,0 +1,242 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+import numpy as np
+from .ContractUtils import ContractUtils
+
+
+class ChainSnapshot:
+    """
+    Columnar (struct-of-arrays) view of the option chain of one underlying at the current bar. The quotes and the static
+    attributes of each contract (strike, right, expiry, DTE, bid, ask, mid, spread, open interest, tradable flag) are read
+    once when the snapshot is built, so that the filters of the Scanner and of the OrderBuilder become NumPy masks/slices
+    instead of loops over the contract objects (each one hitting context.Securities).
+    The contracts are partitioned by expiry (each partition is sorted by strike).
+
+    The Greeks columns (delta, gamma, theta, vega, iv) are NaN until refreshGreeks is called (i.e. after bsm.setGreeks).
+    The quotes are recorded in the dirty set of the algorithm (context.quoteTracker, if any): the mid-prices of the contracts
+    whose quotes did not change are reused and the dirty column flags the contracts that changed since the previous bar.
+
+    The DataHandler builds the snapshot of the chain once per bar (see build) and stores it in context.chainSnapshots:
+    any list of contracts taken from that chain during the same bar is then resolved against the cached snapshot (see get).
+
+    Example:
+        snapshot, idx = ChainSnapshot.get(self.context, contracts)
+        # Tradable Puts between the 4000 and 4100 strikes, sorted by strike
+        puts = snapshot.take(snapshot.filter(idx, right = OptionRight.Put, fromStrike = 4000, toStrike = 4100, tradable = True))
+    """
+
+    def __init__(self, context, contracts, contractUtils=None):
+        # Start the timer
+        context.executionTimer.start("Tools.ChainSnapshot -> build")
+
+        self.context = context
+        # Time of the bar at which the snapshot was taken
+        self.time = context.Time
+        contractUtils = contractUtils or ContractUtils(context)
+        # Keep a reference to the original list (used to detect whether a list of contracts is the chain itself)
+        self.chain = contracts
+        self.contracts = np.empty(len(contracts), dtype=object)
+        for idx, contract in enumerate(contracts):
+            self.contracts[idx] = contract
+        # Position of each contract in the snapshot
+        self.index = {contract.Symbol: idx for idx, contract in enumerate(contracts)}
+
+        # Static attributes
+        today = context.Time.date().toordinal()
+        self.strike = np.array([float(contract.Strike) for contract in contracts], dtype=np.float64)
+        self.isCall = np.array([bool(contract.Right == OptionRight.Call) for contract in contracts], dtype=bool)
+        self.expiry = np.array([int(contract.Expiry.date().toordinal()) for contract in contracts], dtype=np.int64)
+        self.dte = self.expiry - today
+
+        # Quotes (read from the security once)
+        bid = []
+        ask = []
+        openInterest = []
+        tradable = []
+        for contract in contracts:
+            security = contractUtils.getSecurity(contract)
+            bid.append(float(security.BidPrice))
+            ask.append(float(security.AskPrice))
+            openInterest.append(float(getattr(security, "OpenInterest", 0) or 0))
+            tradable.append(bool(security.IsTradable))
+        self.bid = np.array(bid, dtype=np.float64)
+        self.ask = np.array(ask, dtype=np.float64)
+        # Contracts whose quotes (or the price of the underlying) changed since the previous bar (see QuoteTracker)
+        self.dirty = np.ones(len(contracts), dtype=bool)
+        quoteTracker = getattr(context, "quoteTracker", None)
+        # Mid-price with the same definition used by the rest of the framework (ContractUtils.midPrice)
+        mid = []
+        for idx, contract in enumerate(contracts):
+            midPrice = None
+            if quoteTracker is not None:
+                symbol = contract.Symbol
+                self.dirty[idx] = quoteTracker.observe(symbol, bid[idx], ask[idx], float(contract.UnderlyingLastPrice))
+                # Reuse the mid-price if the quotes did not change
+                midPrice = quoteTracker.mid(symbol)
+            if midPrice is None:
+                midPrice = float(contractUtils.midPrice(contract))
+                if quoteTracker is not None:
+                    quoteTracker.setMid(symbol, midPrice)
+            mid.append(midPrice)
+        self.mid = np.array(mid, dtype=np.float64)
+        self.spread = np.abs(self.ask - self.bid)
+        self.openInterest = np.array(openInterest, dtype=np.float64)
+        self.tradable = np.array(tradable, dtype=bool)
+
+        # Greeks (filled by refreshGreeks)
+        self.delta = np.full(len(contracts), np.nan)
+        self.gamma = np.full(len(contracts), np.nan)
+        self.theta = np.full(len(contracts), np.nan)
+        self.vega = np.full(len(contracts), np.nan)
+        self.iv = np.full(len(contracts), np.nan)
+
+        # Partition the contracts by expiry (each partition is sorted by strike)
+        order = np.lexsort((self.strike, self.expiry))
+        self.expiries, starts = np.unique(self.expiry[order], return_index=True)
+        self.partitions = dict(zip(self.expiries.tolist(), np.split(order, starts[1:])))
+
+        # Stop the timer
+        context.executionTimer.stop("Tools.ChainSnapshot -> build")
+
+    def __len__(self):
+        return len(self.contracts)
+
+    @staticmethod
+    def key(contracts):
+        """
+        Returns the key of the snapshot in context.chainSnapshots (the underlying of the contracts).
+        """
+        return contracts[0].UnderlyingSymbol
+
+    @classmethod
+    def build(cls, context, contracts, contractUtils=None):
+        """
+        Builds the snapshot of the chain of the current bar and stores it in context.chainSnapshots.
+        Args:
+            context: The algorithm.
+            contracts (list): The option contracts of the chain.
+            contractUtils (ContractUtils): Used to retrieve the securities and the mid-prices.
+        Returns:
+            ChainSnapshot: The snapshot.
+        """
+        snapshot = cls(context, contracts, contractUtils=contractUtils)
+        if contracts:
+            context.chainSnapshots[cls.key(contracts)] = snapshot
+        return snapshot
+
+    @classmethod
+    def cached(cls, context, contracts):
+        """
+        Returns the snapshot of the current bar that contains the given contracts (None if there is no such snapshot).
+        """
+        if not contracts:
+            return None
+        snapshot = context.chainSnapshots.get(cls.key(contracts))
+        if snapshot is None or snapshot.time != context.Time:
+            return None
+        return snapshot
+
+    @classmethod
+    def get(cls, context, contracts, contractUtils=None):
+        """
+        Returns the snapshot of the current bar for the given contracts and the position of each contract in the snapshot.
+        The cached snapshot is used if it contains all the contracts, otherwise a new snapshot is built for the given list.
+        Args:
+            context: The algorithm.
+            contracts (list): The option contracts.
+            contractUtils (ContractUtils): Used to retrieve the securities and the mid-prices if a new snapshot is built.
+        Returns:
+            tuple: (ChainSnapshot, np.ndarray) The snapshot and the indices of the contracts.
+        """
+        snapshot = cls.cached(context, contracts)
+        idx = None if snapshot is None else snapshot.indices(contracts)
+        if idx is None:
+            context.executionTimer.count("Tools.ChainSnapshot -> misses")
+            snapshot = cls(context, contracts, contractUtils=contractUtils)
+            idx = np.arange(len(contracts))
+            # Cache it unless there is already a snapshot for this bar
+            if contracts and cls.cached(context, contracts) is None:
+                context.chainSnapshots[cls.key(contracts)] = snapshot
+        else:
+            context.executionTimer.count("Tools.ChainSnapshot -> hits")
+        return snapshot, idx
+
+    def indices(self, contracts):
+        """
+        Returns the position of the given contracts in the snapshot (None if any of the contracts is not in the snapshot).
+        """
+        if contracts is self.chain:
+            return np.arange(len(self.contracts))
+        idx = [self.index.get(contract.Symbol) for contract in contracts]
+        if None in idx:
+            return None
+        # Make sure these are the same contract objects (the chain might have been rebuilt during the bar)
+        idx = np.array(idx, dtype=np.int64)
+        for contract, position in zip(contracts, idx):
+            if self.contracts[position] is not contract:
+                return None
+        return idx
+
+    def take(self, idx):
+        """
+        Returns the contracts at the given positions.
+        """
+        return self.contracts[idx].tolist()
+
+    def expiryIndices(self, expiry):
+        """
+        Returns the positions of the contracts with the given expiry date, sorted by strike.
+        """
+        expiry = expiry.date() if hasattr(expiry, "date") else expiry
+        return self.partitions.get(expiry.toordinal(), np.empty(0, dtype=np.int64))
+
+    def filter(self, idx, right=None, fromStrike=None, toStrike=None, fromPrice=None, toPrice=None, tradable=None, reverse=False):
+        """
+        Filters the contracts at the given positions and sorts them by strike.
+        Args:
+            idx (np.ndarray): Positions of the contracts to filter.
+            right (OptionRight): Keep only the Calls/Puts (None for both).
+            fromStrike/toStrike (float): Strike range (inclusive).
+            fromPrice/toPrice (float): Mid-price range (inclusive).
+            tradable (bool): Keep only the tradable contracts if True.
+            reverse (bool): Sort by descending strike.
+        Returns:
+            np.ndarray: The positions of the selected contracts.
+        """
+        idx = np.asarray(idx, dtype=np.int64)
+        mask = np.ones(len(idx), dtype=bool)
+        if right is not None:
+            mask &= self.isCall[idx] == (right == OptionRight.Call)
+        if fromStrike is not None:
+            mask &= self.strike[idx] >= fromStrike
+        if toStrike is not None:
+            mask &= self.strike[idx] <= toStrike
+        if fromPrice is not None:
+            mask &= self.mid[idx] >= fromPrice
+        if toPrice is not None:
+            mask &= self.mid[idx] <= toPrice
+        if tradable:
+            mask &= self.tradable[idx]
+        idx = idx[mask]
+        # Stable sort by strike
+        idx = idx[np.argsort(self.strike[idx], kind="stable")]
+        return idx[::-1] if reverse else idx
+
+    def refreshGreeks(self, idx=None):
+        """
+        Copies the Greeks of the contracts (contract.BSMGreeks) into the Greeks columns.
+        Args:
+            idx (np.ndarray): Positions of the contracts to refresh (all the contracts if not specified).
+        """
+        idx = np.arange(len(self.contracts)) if idx is None else np.asarray(idx, dtype=np.int64)
+        for position in idx:
+            greeks = getattr(self.contracts[position], "BSMGreeks", None)
+            if greeks is None:
+                continue
+            self.delta[position] = greeks.Delta
+            self.gamma[position] = greeks.Gamma
+            self.theta[position] = greeks.Theta
+            self.vega[position] = greeks.Vega
+            self.iv[position] = getattr(self.contracts[position], "BSMImpliedVolatility", np.nan)
@@ -58,6 +58,7 @@ class Charting:
 
         totalSecurities = Chart("Total Securities")
         totalSecurities.AddSeries(Series('Total Securities', SeriesType.Line, 0))
+        totalSecurities.AddSeries(Series('Greek Indicators', SeriesType.Line, 0))
 
         # Setup Charts
         if openPositions:
@@ -153,6 +154,7 @@ class Charting:
 
         if plotInfo.totalSecurities:
             self.context.Plot("Total Securities", "Total Securities", self.context.Securities.Count)
+            self.context.Plot("Total Securities", "Greek Indicators", self.context.greekIndicators.activeCount())
         # Add the latest stats to the plots
         if plotInfo.openPositions:
             self.context.Plot("Open Positions", "Open Positions", self.context.openPositions.Count)
@@ -14,6 +14,8 @@ class ContractUtils:
     Attributes:
         context: An object providing access to market data and securities.
         logger: An instance of Logger used for logging operations.
+        greeksProvider: The GreeksProvider used by the Greeks methods (delta, gamma, ...). If not specified, the Greeks are read
+            from the contract (BSMGreeks if custom_greeks = True, Lean Greeks otherwise).
     Methods:
         getUnderlyingPrice(symbol):
             Returns the latest price of the security associated with the given symbol.
@@ -64,10 +66,25 @@ class ContractUtils:
             Calculates and returns the bid-ask spread of the given option
     """
 
-    def __init__(self, context, custom_greeks=False):
+    def __init__(self, context, custom_greeks=False, greeksProvider=None):
         self.context = context # Set the context
         self.logger = Logger(context, className=type(self).__name__, logLevel=context.logLevel) # Set the logger
         self.custom_greeks = custom_greeks
+        self.greeksProvider = greeksProvider # Set the Greeks provider (see GreeksProvider)
+
+    def leanGreek(self, contract, name):
+        """
+        Reads one of the Greeks computed by Lean (same timer as the lean tier of the GreeksProvider).
+        Args:
+            contract (Contract): The contract object.
+            name (str): The name of the Greek (i.e. "delta").
+        Returns:
+            float: The value of the Greek.
+        """
+        self.context.executionTimer.start("Tools.GreeksProvider -> lean")
+        value = getattr(contract.greeks, name)
+        self.context.executionTimer.stop("Tools.GreeksProvider -> lean")
+        return value
 
     def getUnderlyingPrice(self, symbol):
         """
@@ -187,6 +204,8 @@ class ContractUtils:
         Returns:
             float: The implied volatility of the contract.
         """
+        if self.greeksProvider is not None:
+            return self.greeksProvider.iv(contract)
         return contract.implied_volatility
 
     def delta(self, contract):
@@ -197,9 +216,11 @@ class ContractUtils:
         Returns:
             float: The delta of the contract.
         """
+        if self.greeksProvider is not None:
+            return self.greeksProvider.delta(contract)
         if self.custom_greeks:
-            return contract.BSMGreeks.Delta if hasattr(contract, 'BSMGreeks') else contract.greeks.delta
-        return contract.greeks.delta 
+            return contract.BSMGreeks.Delta if hasattr(contract, 'BSMGreeks') else self.leanGreek(contract, "delta")
+        return self.leanGreek(contract, "delta")
 
     def gamma(self, contract):
         """
@@ -209,9 +230,11 @@ class ContractUtils:
         Returns:
             float: The gamma of the contract.
         """
+        if self.greeksProvider is not None:
+            return self.greeksProvider.gamma(contract)
         if self.custom_greeks:
-            return contract.BSMGreeks.Gamma if hasattr(contract, 'BSMGreeks') else contract.greeks.gamma
-        return contract.greeks.gamma 
+            return contract.BSMGreeks.Gamma if hasattr(contract, 'BSMGreeks') else self.leanGreek(contract, "gamma")
+        return self.leanGreek(contract, "gamma")
 
     def theta(self, contract):
         """
@@ -221,9 +244,11 @@ class ContractUtils:
         Returns:
             float: The theta of the contract.
         """
+        if self.greeksProvider is not None:
+            return self.greeksProvider.theta(contract)
         if self.custom_greeks:
-            return contract.BSMGreeks.Theta if hasattr(contract, 'BSMGreeks') else contract.greeks.theta
-        return contract.greeks.theta 
+            return contract.BSMGreeks.Theta if hasattr(contract, 'BSMGreeks') else self.leanGreek(contract, "theta")
+        return self.leanGreek(contract, "theta")
 
     def vega(self, contract):
         """
@@ -233,9 +258,11 @@ class ContractUtils:
         Returns:
             float: The vega of the contract.
         """
+        if self.greeksProvider is not None:
+            return self.greeksProvider.vega(contract)
         if self.custom_greeks:
-            return contract.BSMGreeks.Vega if hasattr(contract, 'BSMGreeks') else contract.greeks.vega
-        return contract.greeks.vega 
+            return contract.BSMGreeks.Vega if hasattr(contract, 'BSMGreeks') else self.leanGreek(contract, "vega")
+        return self.leanGreek(contract, "vega")
 
     def rho(self, contract):
         """
@@ -245,9 +272,11 @@ class ContractUtils:
         Returns:
             float: The rho of the contract.
         """
+        if self.greeksProvider is not None:
+            return self.greeksProvider.rho(contract)
         if self.custom_greeks:
-            return contract.BSMGreeks.Rho if hasattr(contract, 'BSMGreeks') else contract.greeks.rho
-        return contract.greeks.rho 
+            return contract.BSMGreeks.Rho if hasattr(contract, 'BSMGreeks') else self.leanGreek(contract, "rho")
+        return self.leanGreek(contract, "rho")
         
     def bidPrice(self, contract):
         """
@@ -4,7 +4,12 @@ from AlgorithmImports import *
 
 from .Underlying import Underlying
 from .ProviderOptionContract import ProviderOptionContract
+from .GreeksProvider import GreeksProvider
+from .ChainSnapshot import ChainSnapshot
 import operator
+import bisect
+import math
+from statistics import NormalDist
 
 class DataHandler:
     # The supported cash indices by QC https://www.quantconnect.com/docs/v2/writing-algorithms/datasets/tickdata/us-cash-indices#05-Supported-Indices
@@ -16,6 +21,22 @@ class DataHandler:
         self.context = context
         self.strategy = strategy
         self.is_future_option = self.__FutureTicker()  # Flag to identify if we're dealing with future options
+        # State of the strike window of optionChainProviderFilter: index of the symbols by strike, bounds of the window
+        # (and the index they refer to) and the ProviderOptionContract of each symbol inside the window
+        self.providerIndex = None
+        # Index restricted to the tradable symbols (only built when some of the symbols are not tradable)
+        self.tradableProviderIndex = None
+        self.providerWindow = None
+        self.providerWindowIndex = None
+        self.providerContracts = {}
+        # Index of the future option chains: canonical future -> {future contract -> canonical option symbol}, sorted by the
+        # expiry of the future contracts, and the future contract currently used for the option chain of each canonical future
+        self.futureOptionChains = {}
+        self.activeFutureContract = {}
+        # Distance between two consecutive strikes of the chain (used to convert the adaptive strike universe into a number of strikes)
+        self.strikeStep = None
+        # Trade time for which the strike window has been prefetched (see prefetch)
+        self.prefetchTradeTime = None
 
     # Method to add the ticker[String] data to the context.
     # @param resolution [Resolution]
@@ -63,34 +84,48 @@ class DataHandler:
         self.context.executionTimer.stop('Tools.DataHandler -> SetOptionFilter')
 
     # SECTION BELOW HANDLES OPTION CHAIN PROVIDER METHODS
-    def optionChainProviderFilter(self, symbols, min_strike_rank, max_strike_rank, minDte, maxDte):
+    def optionChainProviderFilter(self, symbols, min_strike_rank, max_strike_rank, minDte, maxDte, strikeRange = None):
+        """
+        Selects the contracts of the OptionChainProvider list within the strike window around the ATM strike.
+        The list of symbols is indexed by strike once (per list, date and DTE range), then on every bar only the bounds of the
+        window are recomputed: the contracts entering the window are subscribed and wrapped in a ProviderOptionContract, the
+        ones leaving it are dropped, and the others are reused (with the updated price of the underlying).
+        Args:
+            symbols (list): The option contract symbols of the OptionChainProvider.
+            min_strike_rank (int): Offset of the lowest strike of the window from the ATM strike.
+            max_strike_rank (int): Offset of the highest strike of the window from the ATM strike.
+            minDte/maxDte (int): DTE range of the contracts.
+            strikeRange (tuple): Maximum distance (in points) of the strikes below/above the ATM strike (see strikeUniverse).
+                The window is the intersection of the strike ranks and this range.
+        Returns:
+            list: The ProviderOptionContract objects of the window (None if there are no contracts).
+        """
         self.context.executionTimer.start('Tools.DataHandler -> optionChainProviderFilter')
         self.context.logger.debug(f"optionChainProviderFilter -> symbols count: {len(symbols)}")
 
         if len(symbols) == 0:
             self.context.logger.warning("No symbols provided to optionChainProviderFilter")
+            self.context.executionTimer.stop('Tools.DataHandler -> optionChainProviderFilter')
             return None
 
-        filteredSymbols = [symbol for symbol in symbols
-                            if minDte <= (symbol.ID.Date.date() - self.context.Time.date()).days <= maxDte]
-
-        self.context.logger.debug(f"Filtered symbols count: {len(filteredSymbols)}")
-        self.context.logger.debug(f"Context Time: {self.context.Time.date()}")
-        unique_dates = set(symbol.ID.Date.date() for symbol in symbols)
-        self.context.logger.debug(f"Unique symbol dates: {unique_dates}")
-        self.context.logger.debug(f"optionChainProviderFilter -> filteredSymbols: {filteredSymbols}")
+        # Index the symbols by strike (only when the list, the date or the DTE range change)
+        indexKey = (self.context.Time.date(), minDte, maxDte)
+        if self.providerIndex is None or self.providerIndex["symbols"] is not symbols or self.providerIndex["key"] != indexKey:
+            self.providerIndex = self.buildProviderIndex(symbols, indexKey, minDte, maxDte)
+        index = self.providerIndex
 
-        if not filteredSymbols:
+        if not index["strikes"]:
             self.context.logger.warning("No symbols left after date filtering")
+            self.context.executionTimer.stop('Tools.DataHandler -> optionChainProviderFilter')
             return None
 
+        # Skip the symbols that are not tradable (before looking for the ATM strike)
         if not self.__CashTicker():
-            filteredSymbols = [x for x in filteredSymbols if self.context.Securities[x.ID.Symbol].IsTradable]
-            self.context.logger.debug(f"Tradable filtered symbols count: {len(filteredSymbols)}")
-
-        if not filteredSymbols:
-            self.context.logger.warning("No tradable symbols left after filtering")
-            return None
+            index = self.tradableIndex(index)
+            if not index["strikes"]:
+                self.context.logger.warning("No tradable symbols left after filtering")
+                self.context.executionTimer.stop('Tools.DataHandler -> optionChainProviderFilter')
+                return None
 
         underlying = Underlying(self.context, self.strategy.underlyingSymbol)
         underlyingLastPrice = underlying.Price()
@@ -99,36 +134,130 @@ class DataHandler:
 
         if underlyingLastPrice is None:
             self.context.logger.warning("Underlying price is None")
+            self.context.executionTimer.stop('Tools.DataHandler -> optionChainProviderFilter')
             return None
 
-        try:
-            atm_strike = sorted(filteredSymbols, key=lambda x: abs(x.ID.StrikePrice - underlyingLastPrice))[0].ID.StrikePrice
-        except IndexError:
-            self.context.logger.error("Unable to find ATM strike. Check if filteredSymbols is empty or if strike prices are available.")
-            return None
-
-        self.context.logger.debug(f"ATM strike: {atm_strike}")
-
-        strike_list = sorted(set([i.ID.StrikePrice for i in filteredSymbols]))
-        atm_strike_rank = strike_list.index(atm_strike)
-        min_strike = strike_list[max(0, atm_strike_rank + min_strike_rank + 1)]
-        max_strike = strike_list[min(atm_strike_rank + max_strike_rank - 1, len(strike_list)-1)]
-
-        selectedSymbols = [symbol for symbol in filteredSymbols
-                                if min_strike <= symbol.ID.StrikePrice <= max_strike]
-
-        self.context.logger.debug(f"Selected symbols count: {len(selectedSymbols)}")
+        # ATM strike: closest to the price of the underlying (ties -> the strike that comes first in the list of symbols)
+        strikes = index["strikes"]
+        pos = bisect.bisect_left(strikes, underlyingLastPrice)
+        candidates = [rank for rank in (pos - 1, pos) if 0 <= rank < len(strikes)]
+        atm_strike_rank = min(candidates, key=lambda rank: (abs(strikes[rank] - underlyingLastPrice), index["firstPosition"][rank]))
+
+        self.context.logger.debug(f"ATM strike: {strikes[atm_strike_rank]}")
+
+        # Bounds of the strike window (positions in the list of strikes)
+        low = max(0, atm_strike_rank + min_strike_rank + 1)
+        high = min(atm_strike_rank + max_strike_rank - 1, len(strikes) - 1)
+        if strikeRange is not None:
+            # Only keep the strikes the strategy can actually trade
+            atmStrike = strikes[atm_strike_rank]
+            low = max(low, bisect.bisect_left(strikes, atmStrike - strikeRange[0]))
+            high = min(high, bisect.bisect_right(strikes, atmStrike + strikeRange[1]) - 1)
+        window = (low, high)
+
+        # Only the strikes entering/leaving the window are processed
+        previous = self.providerWindow if self.providerWindowIndex is index else None
+        if previous != window:
+            # Owner of the subscriptions of the window
+            scanOwner = ("scan", self.strategy.nameTag)
+            if previous is None:
+                self.providerContracts = {}
+                # Release the subscriptions of the previous window (the contracts that are still in the window are acquired again below)
+                self.context.optionContractsSubscriptions.release(owner=scanOwner)
+                entering = range(low, high + 1)
+                leaving = []
+            else:
+                entering = [rank for rank in range(low, high + 1) if not previous[0] <= rank <= previous[1]]
+                leaving = [rank for rank in range(previous[0], previous[1] + 1) if not low <= rank <= high]
+            leavingSymbols = [symbol for rank in leaving for symbol in index["symbolsByStrike"][rank]]
+            for symbol in leavingSymbols:
+                self.providerContracts.pop(symbol, None)
+            if leavingSymbols:
+                self.context.optionContractsSubscriptions.release(leavingSymbols, owner=scanOwner)
+                self.context.executionTimer.count('Tools.DataHandler -> optionChainProviderFilter -> leaving', len(leaving))
+            # Subscribe the contracts entering the window (all at once)
+            enteringSymbols = [symbol for rank in entering for symbol in index["symbolsByStrike"][rank]]
+            self.AddOptionContracts(enteringSymbols, resolution=self.scanResolution(), owner=scanOwner)
+            for symbol in enteringSymbols:
+                # Reuse the instance of the contract if it already exists (i.e. it was in the window on the previous day)
+                self.providerContracts[symbol] = ProviderOptionContract.get(symbol, underlyingLastPrice, self.context)
+            if entering:
+                self.context.executionTimer.count('Tools.DataHandler -> optionChainProviderFilter -> entering', len(entering))
+            # Keep the contracts in the order of the list of symbols
+            self.providerContracts = dict(sorted(self.providerContracts.items(), key=lambda item: index["position"][item[0]]))
+            self.providerWindow = window
+            self.providerWindowIndex = index
+
+        # Contracts of the window
+        contracts = list(self.providerContracts.values())
+        for contract in contracts:
+            contract.UnderlyingLastPrice = underlyingLastPrice
 
-        contracts = []
-        for symbol in selectedSymbols:
-            self.AddOptionContracts([symbol], resolution=self.context.timeResolution)
-            contract = ProviderOptionContract(symbol, underlyingLastPrice, self.context)
-            contracts.append(contract)
+        self.context.logger.debug(f"Selected symbols count: {len(contracts)}")
 
         self.context.executionTimer.stop('Tools.DataHandler -> optionChainProviderFilter')
 
         return contracts
 
+    def tradableIndex(self, index):
+        """
+        Returns the index of the tradable symbols. The tradability is checked once per security (the symbols of the index
+        share their ID.Symbol); the index is returned as is when all the symbols are tradable, otherwise the restricted
+        index is built (and reused as long as the same securities are not tradable).
+        Args:
+            index (dict): The index of the symbols (see buildProviderIndex).
+        Returns:
+            dict: The index of the tradable symbols.
+        """
+        nonTradable = frozenset(ticker for ticker in index["tickers"] if not self.context.Securities[ticker].IsTradable)
+        if not nonTradable:
+            return index
+        self.context.logger.debug(f"Non tradable securities: {set(nonTradable)}")
+        cached = self.tradableProviderIndex
+        if cached is None or cached["parent"] is not index or cached["nonTradable"] != nonTradable:
+            symbols = [symbol for symbol in index["symbols"] if symbol.ID.Symbol not in nonTradable]
+            minDte, maxDte = index["key"][1:]
+            cached = self.buildProviderIndex(symbols, index["key"], minDte, maxDte)
+            cached["parent"] = index
+            cached["nonTradable"] = nonTradable
+            self.tradableProviderIndex = cached
+        return cached
+
+    def buildProviderIndex(self, symbols, key, minDte, maxDte):
+        """
+        Indexes the symbols of the OptionChainProvider within the DTE range by strike.
+        Returns:
+            dict: The list of symbols, the key of the index, the sorted unique strikes, the symbols of each strike (in the order
+                of the list), the position of the first symbol of each strike and the position of each symbol in the list.
+        """
+        filteredSymbols = [symbol for symbol in symbols
+                            if minDte <= (symbol.ID.Date.date() - self.context.Time.date()).days <= maxDte]
+
+        self.context.logger.debug(f"Filtered symbols count: {len(filteredSymbols)}")
+        self.context.logger.debug(f"Context Time: {self.context.Time.date()}")
+        self.context.logger.debug(f"Unique symbol dates: {set(symbol.ID.Date.date() for symbol in symbols)}")
+
+        byStrike = {}
+        firstPosition = {}
+        positions = {}
+        for position, symbol in enumerate(filteredSymbols):
+            positions[symbol] = position
+            strike = symbol.ID.StrikePrice
+            if strike not in byStrike:
+                byStrike[strike] = []
+                firstPosition[strike] = position
+            byStrike[strike].append(symbol)
+        strikes = sorted(byStrike)
+        return {
+            "symbols": symbols,
+            "key": key,
+            "strikes": strikes,
+            "symbolsByStrike": [byStrike[strike] for strike in strikes],
+            "firstPosition": [firstPosition[strike] for strike in strikes],
+            "position": positions,
+            "tickers": {symbol.ID.Symbol for symbol in filteredSymbols},
+        }
+
     def getOptionContracts(self, slice=None):
         self.context.executionTimer.start('Tools.DataHandler -> getOptionContracts')
 
@@ -139,50 +268,316 @@ class DataHandler:
         self.context.logger.debug(f"getOptionContracts -> maxDte: {maxDte}")
 
         if self.strategy.useSlice and slice is not None:
-            if self.is_future_option:
-                for continuous_future_symbol, futures_chain in slice.FuturesChains.items():
-                    if continuous_future_symbol == self.strategy.underlyingSymbol:
-                        for futures_contract in futures_chain:
-                            canonical_fop_symbol = Symbol.CreateCanonicalOption(futures_contract.Symbol)
-                            option_chain = slice.OptionChains.get(canonical_fop_symbol)
-                            if option_chain is not None and option_chain.contracts.count != 0:
-                                contracts = list(option_chain.Contracts.Values)
-                                break
-                        if contracts:
-                            break
-            else:
-                for chain in slice.OptionChains:
-                    if self.strategy.optionSymbol is None or chain.Key == self.strategy.optionSymbol:
-                        if chain.Value.Contracts.Count != 0:
-                            contracts = list(chain.Value)
-                            break
+            contracts = self.getSliceOptionContracts(slice)
             self.context.logger.debug(f"getOptionContracts -> number of contracts from slice: {len(contracts) if contracts else 0}")
 
         if contracts is None:
             if not self.is_future_option:
                 canonical_symbol = self.OptionsContract(self.strategy.underlyingSymbol)
-                symbols = self.context.OptionChainProvider.GetOptionContractList(canonical_symbol, self.context.Time)
-                contracts = self.optionChainProviderFilter(symbols, -self.strategy.nStrikesLeft, self.strategy.nStrikesRight, minDte, maxDte)
+                symbols = self.getOptionContractList(canonical_symbol)
+                strikeRange = self.strikeUniverse(maxDte)
+                contracts = self.optionChainProviderFilter(symbols, -self.strategy.nStrikesLeft, self.strategy.nStrikesRight, minDte, maxDte, strikeRange = strikeRange)
+
+        # Build the columnar snapshot of the chain (once per bar): used by the Scanner and the OrderBuilder filters
+        if contracts:
+            ChainSnapshot.build(self.context, contracts)
+            # Keep track of the strike spacing of the chain (used by the universe filter of the adaptive strike universe)
+            if self.adaptiveStrikeUniverse():
+                self.updateStrikeStep(contracts)
 
         self.context.executionTimer.stop('Tools.DataHandler -> getOptionContracts')
 
         return contracts
 
+    def adaptiveStrikeUniverse(self):
+        return getattr(self.strategy, "adaptiveStrikeUniverse", False) is True
+
+    def strikeUniverse(self, dte, underlyingPrice = None):
+        """
+        Sizes the strike universe from the needs of the strategy, plus the width of the wings on each side:
+            - strategies with the short strikes at a fixed distance from the ATM strike (strikeUniverseOffset): the offset
+            - otherwise: the distance from the ATM strike of the target delta, floored by the expected move of the underlying
+              until expiration (from the ATM IV)
+        Args:
+            dte (int): Days to expiration of the furthest expiry of the universe (a 0DTE chain is sized on 1 day).
+            underlyingPrice (float): Price of the underlying (the last price is used if not provided).
+        Returns:
+            tuple: The distance (in points) of the lowest/highest strike from the ATM strike (None if the adaptive strike
+                universe is disabled or the price of the underlying is not available).
+        """
+        if not self.adaptiveStrikeUniverse():
+            return None
+        if underlyingPrice is None:
+            underlyingPrice = Underlying(self.context, self.strategy.underlyingSymbol).Price()
+        if not underlyingPrice:
+            return None
+
+        # ATM IV: most recent observation of the IV history of the underlying, if available
+        iv = None
+        ivHistory = getattr(self.context, "ivHistory", None)
+        if ivHistory is not None:
+            iv = ivHistory.get(self.ticker).last()
+        if not iv:
+            iv = self.strategy.strikeUniverseIV
+
+        # One standard deviation move of the underlying until expiration
+        stdMove = underlyingPrice * iv * math.sqrt(max(dte, 1) / 365.0)
+        expectedMove = self.strategy.expectedMoveMultiplier * stdMove
+
+        def deltaDistance(delta):
+            # Distance from the ATM strike of the strike with the given delta (in percent): N^-1(1 - delta) standard deviations
+            # (0 for the ATM/ITM strikes)
+            if delta is None or not 0 < delta < 50:
+                return 0.0
+            return stdMove * NormalDist().inv_cdf(1.0 - delta / 100.0)
+
+        strategy = self.strategy
+        # Wings on each side
+        leftWing = max(strategy.wingSize, strategy.putWingSize, strategy.butterflyLeftWingSize)
+        rightWing = max(strategy.wingSize, strategy.callWingSize, strategy.butterflyRightWingSize)
+
+        offset = strategy.strikeUniverseOffset
+        if offset is not None:
+            # The short strikes are selected at a fixed distance from the ATM strike: the deltas and the expected move are not used
+            left = offset + leftWing
+            right = offset + rightWing
+        else:
+            # Target deltas on each side (the lowest delta is the furthest strike)
+            putDelta = strategy.strikeUniverseDelta
+            callDelta = strategy.strikeUniverseDelta
+            if putDelta is None:
+                putDelta = min(strategy.delta, strategy.putDelta)
+                callDelta = min(strategy.delta, strategy.callDelta)
+            left = max(expectedMove, deltaDistance(putDelta)) + leftWing
+            right = max(expectedMove, deltaDistance(callDelta)) + rightWing
+
+        self.context.logger.debug(f"strikeUniverse -> IV: {iv}, expected move: {expectedMove:.2f}, range: (-{left:.2f}, +{right:.2f})")
+
+        return (left, right)
+
+    def strikeUniverseCounts(self):
+        """
+        Returns the number of strikes below/above the ATM strike of the universe filter: the adaptive strike universe converted
+        with the strike spacing of the chain, capped by nStrikesLeft/nStrikesRight (which are used until the spacing is known).
+        """
+        nStrikesLeft = self.strategy.nStrikesLeft
+        nStrikesRight = self.strategy.nStrikesRight
+        if not self.strikeStep:
+            return nStrikesLeft, nStrikesRight
+        strikeRange = self.strikeUniverse(max(0, self.strategy.dte))
+        if strikeRange is None:
+            return nStrikesLeft, nStrikesRight
+        return (min(nStrikesLeft, math.ceil(strikeRange[0] / self.strikeStep) + 1),
+                min(nStrikesRight, math.ceil(strikeRange[1] / self.strikeStep) + 1))
+
+    def updateStrikeStep(self, contracts):
+        """
+        Updates the strike spacing of the chain: the smallest distance between two consecutive strikes of the contracts.
+        """
+        strikes = sorted(set(contract.Strike for contract in contracts))
+        steps = [high - low for low, high in zip(strikes, strikes[1:]) if high > low]
+        if steps:
+            self.strikeStep = min(steps)
+
+    def nextTradeTime(self):
+        """
+        Returns the next time (today) at which the strategy looks to open a position: the next of its tradeTimes, or the
+        scheduleStartTime if the strategy has no tradeTimes (None if they have all passed).
+        """
+        now = self.context.Time
+        times = self.strategy.tradeTimes or [self.strategy.scheduleStartTime]
+        tradeDttms = sorted(datetime.combine(now.date(), tradeTime) for tradeTime in times if tradeTime is not None)
+        return next((tradeDttm for tradeDttm in tradeDttms if tradeDttm > now), None)
+
+    def prefetch(self, slice=None):
+        """
+        Subscribes and warms (quotes and Greeks) the strike window of the strategy prefetchLeadTime before its next trade time,
+        so that the subscription latency is not paid in the minute the strategy trades. The window is released once the trade
+        time has passed and the scanner is not running on the current bar (it is rebuilt by the next scan or prefetch). The
+        window of the strategies without tradeTimes is kept, as they scan on every scheduled interval.
+        Only the OptionChainProvider path is prefetched (useSlice = False): the contracts of the slice are subscribed by the
+        option universe.
+        Args:
+            slice (Slice): The current data slice.
+        Returns:
+            list: The prefetched contracts (None if nothing has been prefetched on this bar).
+        """
+        leadTime = self.strategy.prefetchLeadTime
+        if not isinstance(leadTime, timedelta):
+            return None
+
+        now = self.context.Time
+        tradeDttm = self.nextTradeTime()
+        if tradeDttm is not None and tradeDttm - now <= leadTime:
+            self.context.executionTimer.start('Tools.DataHandler -> prefetch')
+            contracts = self.getOptionContracts(slice)
+            if contracts:
+                # Warm the Greeks with the same provider used by the strategy
+                greeksProvider = GreeksProvider.of(self.strategy)
+                if greeksProvider is not None:
+                    greeksProvider.prepare(contracts)
+                self.context.executionTimer.count('Tools.DataHandler -> prefetch -> contracts', len(contracts))
+            self.prefetchTradeTime = tradeDttm
+            self.context.executionTimer.stop('Tools.DataHandler -> prefetch')
+            return contracts
+
+        if self.prefetchTradeTime is not None and now > self.prefetchTradeTime and not self.isScanning():
+            self.prefetchTradeTime = None
+            if self.strategy.tradeTimes:
+                self.releaseScanWindow()
+        return None
+
+    def isScanning(self):
+        """
+        Returns True if the scanner of the strategy runs on the current bar (see Scanner.isWithinScheduledTimeWindow).
+        """
+        scanner = getattr(self.strategy, "scanner", None)
+        return scanner is not None and scanner.isWithinScheduledTimeWindow()
+
+    def releaseScanWindow(self):
+        """
+        Releases the subscriptions of the strike window of the strategy (the window is rebuilt on the next call of
+        optionChainProviderFilter).
+        Returns:
+            list: The contracts that are no longer referenced by any owner.
+        """
+        unreferenced = self.context.optionContractsSubscriptions.release(owner=("scan", self.strategy.nameTag))
+        self.providerWindow = None
+        self.providerWindowIndex = None
+        self.providerContracts = {}
+        self.context.executionTimer.count('Tools.DataHandler -> releaseScanWindow -> released', len(unreferenced))
+        return unreferenced
+
+    def getOptionContractList(self, canonical_symbol):
+        """
+        Returns the list of contracts of the OptionChainProvider, through the per (underlying, date) cache shared by all the strategies.
+        """
+        optionContractLists = getattr(self.context, "optionContractLists", None)
+        if optionContractLists is None:
+            return self.context.OptionChainProvider.GetOptionContractList(canonical_symbol, self.context.Time)
+        return optionContractLists.get(canonical_symbol)
+
+    def getSliceOptionContracts(self, slice):
+        """
+        Returns the option contracts of the strategy's chain inside the given slice (None if the chain is not in the slice).
+        """
+        contracts = None
+        if self.is_future_option:
+            contracts = self.getFutureOptionContracts(slice)
+        else:
+            for chain in slice.OptionChains:
+                if self.strategy.optionSymbol is None or chain.Key == self.strategy.optionSymbol:
+                    if chain.Value.Contracts.Count != 0:
+                        contracts = list(chain.Value)
+                        break
+        return contracts
+
+    def getFutureOptionContracts(self, slice):
+        """
+        Returns the option contracts of the future option chain of the strategy inside the given slice. The chain of the active
+        future contract is looked up directly: the other future contracts of the index (sorted by expiry) are only checked
+        when the chain of the active contract is not in the slice (i.e. on a roll), and the first one with data becomes the
+        active contract. The index is kept up to date by OnSecuritiesChanged.
+        """
+        canonicalFuture = self.strategy.underlyingSymbol
+        chains = self.futureOptionChains.get(canonicalFuture)
+        if not chains:
+            # The index is not populated yet: scan the futures chains of the slice
+            self.context.executionTimer.count('Tools.DataHandler -> getFutureOptionContracts -> scans')
+            return self.scanFutureOptionContracts(slice)
+
+        active = self.activeFutureContract.get(canonicalFuture)
+        if active in chains:
+            contracts = self.futureOptionChainContracts(slice, chains[active])
+            if contracts:
+                return contracts
+
+        # Roll: find the first future contract with an option chain in the slice
+        for futureContract, canonicalOption in chains.items():
+            if futureContract == active:
+                continue
+            contracts = self.futureOptionChainContracts(slice, canonicalOption)
+            if contracts:
+                self.context.executionTimer.count('Tools.DataHandler -> getFutureOptionContracts -> rolls')
+                self.activeFutureContract[canonicalFuture] = futureContract
+                return contracts
+        return None
+
+    def futureOptionChainContracts(self, slice, canonicalOption):
+        """
+        Returns the contracts of the option chain of the given canonical option symbol in the slice (None if there are none).
+        """
+        option_chain = slice.OptionChains.get(canonicalOption)
+        if option_chain is not None and option_chain.Contracts.Count != 0:
+            return list(option_chain.Contracts.Values)
+        return None
+
+    def scanFutureOptionContracts(self, slice):
+        """
+        Returns the option contracts of the first future contract of the strategy with an option chain in the slice, scanning
+        all the futures chains of the slice.
+        """
+        for continuous_future_symbol, futures_chain in slice.FuturesChains.items():
+            if continuous_future_symbol == self.strategy.underlyingSymbol:
+                for futures_contract in futures_chain:
+                    canonical_fop_symbol = Symbol.CreateCanonicalOption(futures_contract.Symbol)
+                    contracts = self.futureOptionChainContracts(slice, canonical_fop_symbol)
+                    if contracts:
+                        return contracts
+        return None
+
+    def OnSecuritiesChanged(self, changes):
+        """
+        Updates the index of the future option chains with the future contracts added/removed from the universe of the
+        strategy's underlying (i.e. on a roll).
+        """
+        if not self.is_future_option:
+            return
+        canonicalFuture = self.strategy.underlyingSymbol
+        chains = self.futureOptionChains.setdefault(canonicalFuture, {})
+        updated = False
+        for security in changes.AddedSecurities:
+            symbol = security.Symbol
+            if symbol.SecurityType == SecurityType.Future and not symbol.IsCanonical() and symbol.Canonical == canonicalFuture:
+                chains[symbol] = Symbol.CreateCanonicalOption(symbol)
+                updated = True
+        for security in changes.RemovedSecurities:
+            if chains.pop(security.Symbol, None) is not None:
+                updated = True
+                if self.activeFutureContract.get(canonicalFuture) == security.Symbol:
+                    self.activeFutureContract.pop(canonicalFuture)
+        if updated:
+            # Keep the future contracts sorted by expiry
+            self.futureOptionChains[canonicalFuture] = dict(sorted(chains.items(), key=lambda item: item[0].ID.Date))
+
+    def scanResolution(self):
+        """
+        Returns the resolution of the subscriptions of the scan universe (scanResolution parameter of SetupBaseStructure, or the
+        timeResolution of the algorithm if not set).
+        """
+        resolution = getattr(self.context, "scanResolution", None)
+        return self.context.timeResolution if resolution is None else resolution
+
     # Method to add option contracts data to the context.
     # @param contracts [Array]
     # @param resolution [Resolution]
-    # @return [Symbol]
-    def AddOptionContracts(self, contracts, resolution = Resolution.Minute):
-        # Add this contract to the data subscription so we can retrieve the Bid/Ask price
-        for contract in contracts:
-            if contract not in self.context.optionContractsSubscriptions:
-                if self.is_future_option:
-                    self.context.AddFutureOptionContract(contract, resolution)
-                elif self.__CashTicker():
-                    self.context.AddIndexOptionContract(contract, resolution)
-                else:
-                    self.context.AddOptionContract(contract, resolution)
-                self.context.optionContractsSubscriptions.append(contract)
+    # @param owner [Object] Owner of the references to the contracts (see SubscriptionRegistry)
+    # @return [Array] The contracts that have been subscribed
+    def AddOptionContracts(self, contracts, resolution = Resolution.Minute, owner = None):
+        # Register all the contracts at once: only the ones that are not subscribed yet are added to the data subscriptions
+        newContracts = self.context.optionContractsSubscriptions.acquire(contracts, owner=owner)
+        # Add these contracts to the data subscription so we can retrieve the Bid/Ask price
+        for contract in newContracts:
+            if self.is_future_option:
+                self.context.AddFutureOptionContract(contract, resolution)
+            elif self.__CashTicker():
+                self.context.AddIndexOptionContract(contract, resolution)
+            else:
+                self.context.AddOptionContract(contract, resolution)
+            # Keep track of the resolution of the subscription (see SetupBaseStructure.updateResolutionTiers)
+            self.context.optionContractsSubscriptions.resolutions[contract] = resolution
+            self.context.optionContractsSubscriptions.subscribed.add(contract)
+        return newContracts
 
     def OptionsContract(self, underlyingSymbol):
         if self.ticker == "SPX":
@@ -204,12 +599,14 @@ class DataHandler:
         return self.ticker in self.CashIndices
 
     def OptionFilterFunction(self, universe):
-        return universe.Strikes(-self.strategy.nStrikesLeft, self.strategy.nStrikesRight) \
+        nStrikesLeft, nStrikesRight = self.strikeUniverseCounts()
+        return universe.Strikes(-nStrikesLeft, nStrikesRight) \
                        .Expiration(max(0, self.strategy.dte - self.strategy.dteWindow), max(0, self.strategy.dte)) \
                        .IncludeWeeklys()
 
     def FutureOptionFilterFunction(self, universe):
+        nStrikesLeft, nStrikesRight = self.strikeUniverseCounts()
         return (universe
                 .IncludeWeeklys()
-                .Strikes(-self.strategy.nStrikesLeft, self.strategy.nStrikesRight)
+                .Strikes(-nStrikesLeft, nStrikesRight)
                 .Expiration(max(0, self.strategy.dte - self.strategy.dteWindow), max(0, self.strategy.dte)))
\ No newline at end of file
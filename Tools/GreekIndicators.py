@@ -0,0 +1,173 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+from .Logger import Logger
+
+
+class GreekIndicators:
+    """
+    Manages the Lean Greek indicators (iv, delta, gamma, vega, rho, theta) of the option securities.
+    The indicators are created on demand: when the contract becomes the leg of a position or when its Greeks are read for
+    the first time (see ProviderOptionContract). They are disposed when the position is closed, so that only the indicators
+    that are actually used get updated on every bar.
+    In lazy mode the indicators are created in the middle of the backtest: they are warmed up right after they are created
+    (see warmUp), without changing the warm up of the other indicators of the algorithm.
+
+    Example:
+        self.context.greekIndicators.register(security)  # Called by the security initializer
+        self.context.greekIndicators.ensure(security)  # Creates the indicators (if not already active)
+        delta = security.delta.current.value
+        self.context.greekIndicators.disposePosition(position)  # Disposes the indicators of the position legs
+    """
+    # Attributes of the security holding the indicators
+    NAMES = ["iv", "delta", "gamma", "vega", "rho", "theta"]
+
+    def __init__(self, context, lazy=True):
+        self.context = context
+        # Set the logger
+        self.logger = Logger(context, className=type(self).__name__, logLevel=context.logLevel)
+        # If False, the indicators are created as soon as the security is registered
+        self.lazy = lazy
+        # Active indicators: Symbol -> list of indicators
+        self.indicators = {}
+
+    def register(self, security):
+        """
+        Registers an option security (called by the security initializer). The indicators are only created on demand unless
+        lazy = False.
+        Args:
+            security (Security): The option security.
+        """
+        # Make sure the attributes exist so that the Greeks can be read before the indicators are created
+        for name in self.NAMES:
+            setattr(security, name, None)
+        if not self.lazy:
+            self.ensure(security)
+
+    def ensure(self, security):
+        """
+        Creates the indicators of the given security if they are not active already.
+        Args:
+            security (Security | Symbol): The option security (or its symbol).
+        Returns:
+            bool: True if the indicators are active.
+        """
+        if isinstance(security, Symbol):
+            if security not in self.context.Securities:
+                return False
+            security = self.context.Securities[security]
+        symbol = security.Symbol
+        if symbol in self.indicators:
+            return True
+
+        self.context.executionTimer.start("Tools.GreekIndicators -> ensure")
+
+        if security.Type == SecurityType.FutureOption:
+            # Future options use the contract itself as the mirror contract
+            mirror_symbol = symbol
+        else:
+            right = OptionRight.CALL if symbol.ID.option_right == OptionRight.PUT else OptionRight.PUT
+            mirror_symbol = Symbol.create_option(symbol.ID.underlying.symbol, symbol.ID.market, symbol.ID.option_style, right, symbol.ID.strike_price, symbol.ID.date)
+
+        resolution = self.context.timeResolution
+        try:
+            indicators = [
+                self.context.iv(symbol, mirror_symbol, resolution=resolution),
+                self.context.d(symbol, mirror_symbol, resolution=resolution),
+                self.context.g(symbol, mirror_symbol, resolution=resolution),
+                self.context.v(symbol, mirror_symbol, resolution=resolution),
+                self.context.r(symbol, mirror_symbol, resolution=resolution),
+                self.context.t(symbol, mirror_symbol, resolution=resolution),
+            ]
+        except Exception as e:
+            self.logger.warning(f"Greek indicators: Data not available for {symbol}: {e}")
+            self.context.executionTimer.stop("Tools.GreekIndicators -> ensure")
+            return False
+
+        # The Greeks read on the bar the indicators are created would be 0 otherwise
+        if self.lazy:
+            self.warmUp([symbol, mirror_symbol, symbol.Underlying], indicators, resolution)
+
+        for name, indicator in zip(self.NAMES, indicators):
+            setattr(security, name, indicator)
+        self.indicators[symbol] = indicators
+        self.context.executionTimer.count("Tools.GreekIndicators -> created")
+
+        self.context.executionTimer.stop("Tools.GreekIndicators -> ensure")
+        return True
+
+    def warmUp(self, symbols, indicators, resolution):
+        """
+        Warms up the indicators of a contract created on demand (same symbols used by Lean to register them: the contract, its
+        mirror contract and the underlying).
+        Args:
+            symbols (list): The symbols feeding the indicators.
+            indicators (list): The indicators of the contract.
+            resolution (Resolution): The resolution of the indicators.
+        """
+        self.context.executionTimer.start("Tools.GreekIndicators -> warmUp")
+        # Future options use the contract itself as the mirror contract
+        symbols = list(dict.fromkeys(symbols))
+        try:
+            for indicator in indicators:
+                self.context.WarmUpIndicator(symbols, indicator, resolution)
+        except Exception as e:
+            self.logger.warning(f"Greek indicators: Could not warm up the indicators of {symbols[0]}: {e}")
+        self.context.executionTimer.stop("Tools.GreekIndicators -> warmUp")
+
+    def dispose(self, symbol):
+        """
+        Deregisters the indicators of the given contract so that they are no longer updated.
+        Args:
+            symbol (Symbol): The symbol of the option contract.
+        """
+        indicators = self.indicators.pop(symbol, None)
+        if indicators is None:
+            return
+        for indicator in indicators:
+            self.context.DeregisterIndicator(indicator)
+        if symbol in self.context.Securities:
+            security = self.context.Securities[symbol]
+            for name in self.NAMES:
+                setattr(security, name, None)
+        self.context.executionTimer.count("Tools.GreekIndicators -> disposed")
+
+    def ensurePosition(self, position):
+        """
+        Creates the indicators of all the legs of the given position.
+        Args:
+            position (Position): The position.
+        """
+        for leg in position.legs:
+            self.ensure(leg.symbol)
+
+    def disposePosition(self, position):
+        """
+        Disposes the indicators of the legs of the given position, unless the contract is a leg of another open position.
+        Args:
+            position (Position): The closed position.
+        """
+        # Get the contracts still used by the other open positions
+        inUse = set()
+        for orderTag, orderId in self.context.openPositions.items():
+            openPosition = self.context.allPositions.get(orderId)
+            if openPosition is None or orderTag == position.orderTag:
+                continue
+            inUse.update(leg.symbol for leg in openPosition.legs)
+
+        for leg in position.legs:
+            if leg.symbol not in inUse:
+                self.dispose(leg.symbol)
+
+    def activeCount(self):
+        """
+        Returns the number of active indicators (six per contract).
+        Returns:
+            int: The number of active indicators.
+        """
+        return sum(len(indicators) for indicators in self.indicators.values())
+
+    def __len__(self):
+        # Number of contracts with active indicators
+        return len(self.indicators)
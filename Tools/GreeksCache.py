@@ -0,0 +1,100 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+from collections import OrderedDict
+
+
+class GreeksCache:
+    """
+    Process-wide cache of the BSM Greeks/IV shared by all the BSM instances (Scanner, OrderBuilder, Order, Limit Order handlers).
+    Entries are keyed by (symbol, bar time, spot, mid-price) so that a contract object recreated on every bar (i.e.
+    ProviderOptionContract) still hits the cache as long as nothing that affects the pricing has changed.
+    The size of the cache is bounded: the least recently used entries are evicted first.
+
+    Hits, misses and evictions are reported through the executionTimer counters.
+
+    Example:
+        self.context.greeksCache = GreeksCache(self.context, maxSize = 20000)
+        key = self.context.greeksCache.key(contract, spotPrice, midPrice)
+        greeks = self.context.greeksCache.get(key)
+        if greeks is None:
+            greeks = ...
+            self.context.greeksCache.put(key, greeks)
+    """
+
+    def __init__(self, context, maxSize=20000):
+        self.context = context
+        # Maximum number of entries
+        self.maxSize = maxSize
+        # The cache (ordered from the least to the most recently used entry)
+        self.cache = OrderedDict()
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, contract, spotPrice, midPrice, sigma=None, ir=None):
+        """
+        Builds the cache key of a contract at the current bar.
+        Args:
+            contract (Contract): The contract object.
+            spotPrice (float): The price of the underlying.
+            midPrice (float): The mid-price of the contract.
+            sigma (float): The volatility used for pricing (None if the IV is solved from the mid-price).
+            ir (float): The interest rate used for pricing (None for the default risk free rate).
+        Returns:
+            tuple: The cache key.
+        """
+        return (contract.Symbol, self.context.Time, float(spotPrice), float(midPrice), sigma, ir)
+
+    def get(self, key):
+        """
+        Retrieves an entry from the cache.
+        Args:
+            key (tuple): The cache key (see the key method).
+        Returns:
+            BSMGreeks: The cached Greeks or None if the key is not in the cache.
+        """
+        greeks = self.cache.get(key)
+        if greeks is None:
+            self.misses += 1
+            self.context.executionTimer.count("Tools.GreeksCache -> misses")
+        else:
+            self.hits += 1
+            self.context.executionTimer.count("Tools.GreeksCache -> hits")
+            # Mark the entry as the most recently used
+            self.cache.move_to_end(key)
+        return greeks
+
+    def put(self, key, greeks):
+        """
+        Stores an entry in the cache, evicting the least recently used entries if the cache is full.
+        Args:
+            key (tuple): The cache key (see the key method).
+            greeks (BSMGreeks): The Greeks to store.
+        """
+        self.cache[key] = greeks
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.maxSize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+            self.context.executionTimer.count("Tools.GreeksCache -> evictions")
+
+    def clear(self):
+        """
+        Removes all the entries from the cache.
+        """
+        self.cache.clear()
+
+    def hitRate(self):
+        """
+        Returns the fraction of lookups that hit the cache.
+        Returns:
+            float: The hit rate (0 if there were no lookups).
+        """
+        lookups = self.hits + self.misses
+        return self.hits/lookups if lookups > 0 else 0.0
+
+    def __len__(self):
+        return len(self.cache)
@@ -0,0 +1,219 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+from .BSMLibrary import BSM
+
+
+class ProviderGreeks:
+    """
+    Greeks of a contract as returned by a GreeksProvider (same attribute names as the Lean Greeks object).
+    """
+    __slots__ = ("delta", "gamma", "theta", "vega", "rho", "iv")
+
+    def __init__(self, delta=0, gamma=0, theta=0, vega=0, rho=0, iv=0):
+        self.delta = delta
+        self.gamma = gamma
+        self.theta = theta
+        self.vega = vega
+        self.rho = rho
+        self.iv = iv
+
+    @classmethod
+    def fromBSM(cls, greeks):
+        """
+        Converts a BSMGreeks object.
+        Args:
+            greeks (BSMGreeks): The Greeks computed by the BSM library.
+        Returns:
+            ProviderGreeks: The converted Greeks.
+        """
+        return cls(delta=greeks.Delta, gamma=greeks.Gamma, theta=greeks.Theta, vega=greeks.Vega, rho=greeks.Rho, iv=greeks.IV)
+
+
+class GreeksProvider:
+    """
+    Source of the Greeks used by ContractUtils. The available tiers, from the cheapest/least
+    accurate to the most expensive/accurate for a single contract, are:
+        - lean: Lean Greek indicators (or the Greeks of the OptionContract when using the slice)
+        - surface: BSM Greeks with the IV read from the fitted volatility surface (VolSurface)
+        - batch: BSM Greeks with the IV solved for the whole list of contracts at once (vectorized)
+        - bsm: BSM Greeks with the IV solved for each contract separately (scalar)
+
+    Each Alpha/Monitor/Execution model selects its tier through the greeksProvider parameter.
+
+    Example:
+        provider = GreeksProvider.create(self.context, "batch")
+        provider.prepare(contracts)  # Optional: price the whole list of contracts at once
+        delta = provider.delta(contracts[0])
+    """
+    # Name of the tier (set by each implementation)
+    name = None
+
+    def __init__(self, context):
+        self.context = context
+
+    @staticmethod
+    def create(context, tier="lean"):
+        """
+        Creates the provider for the requested tier.
+        Args:
+            context (QCAlgorithm): The algorithm.
+            tier (str | GreeksProvider): The name of the tier (case insensitive) or a provider instance.
+        Returns:
+            GreeksProvider: The provider.
+        """
+        if isinstance(tier, GreeksProvider):
+            return tier
+        tiers = {
+            "lean": LeanGreeksProvider,
+            "bsm": BSMGreeksProvider,
+            "batch": BatchBSMGreeksProvider,
+            "surface": SurfaceGreeksProvider,
+        }
+        tierName = (tier or "lean").lower()
+        if tierName not in tiers:
+            raise ValueError(f"Invalid Greeks provider: {tier}. Valid options are: {list(tiers)}")
+        # Keep track of the tiers used by the models: the option price models are only needed by the lean tier
+        # (see SetupBaseStructure.SetPriceModel)
+        tiersInUse = getattr(context, "greeksProviderTiers", None)
+        if tiersInUse is not None:
+            tiersInUse.add(tierName)
+        return tiers[tierName](context)
+
+    @staticmethod
+    def of(model):
+        """
+        Returns the Greeks provider selected by the given Alpha/Monitor/Execution model (the provider of its contractUtils).
+        Args:
+            model: The model.
+        Returns:
+            GreeksProvider: The provider of the model (None if the model has no provider).
+        """
+        greeksProvider = getattr(getattr(model, "contractUtils", None), "greeksProvider", None)
+        return greeksProvider if isinstance(greeksProvider, GreeksProvider) else None
+
+    def prepare(self, contracts):
+        """
+        Computes the Greeks of a list of contracts ahead of time (only meaningful for the batch providers).
+        Args:
+            contracts (list): The option contracts.
+        """
+        pass
+
+    def greeks(self, contract):
+        """
+        Returns the Greeks of the given contract.
+        Args:
+            contract (Contract): The option contract.
+        Returns:
+            ProviderGreeks: The Greeks of the contract.
+        """
+        raise NotImplementedError()
+
+    def delta(self, contract):
+        return self.greeks(contract).delta
+
+    def gamma(self, contract):
+        return self.greeks(contract).gamma
+
+    def theta(self, contract):
+        return self.greeks(contract).theta
+
+    def vega(self, contract):
+        return self.greeks(contract).vega
+
+    def rho(self, contract):
+        return self.greeks(contract).rho
+
+    def iv(self, contract):
+        return self.greeks(contract).iv
+
+
+class LeanGreeksProvider(GreeksProvider):
+    """
+    Reads the Greeks computed by Lean (Greek indicators or the OptionContract greeks).
+    """
+    name = "lean"
+
+    def greeks(self, contract):
+        return contract.greeks
+
+    def read(self, contract, name):
+        """
+        Reads one of the Greeks computed by Lean. The Greeks of the OptionContract are evaluated by the option price model of the
+        security when they are read (see the optionPriceModels parameter of SetupBaseStructure): the read is timed to compare the models.
+        Args:
+            contract (Contract): The option contract.
+            name (str): The name of the Greek (i.e. "delta").
+        Returns:
+            float: The value of the Greek.
+        """
+        self.context.executionTimer.start("Tools.GreeksProvider -> lean")
+        value = getattr(contract.greeks, name)
+        self.context.executionTimer.stop("Tools.GreeksProvider -> lean")
+        return value
+
+    def delta(self, contract):
+        return self.read(contract, "delta")
+
+    def gamma(self, contract):
+        return self.read(contract, "gamma")
+
+    def theta(self, contract):
+        return self.read(contract, "theta")
+
+    def vega(self, contract):
+        return self.read(contract, "vega")
+
+    def rho(self, contract):
+        return self.read(contract, "rho")
+
+    def iv(self, contract):
+        return contract.implied_volatility
+
+
+class BSMGreeksProvider(GreeksProvider):
+    """
+    Computes the BSM Greeks of each contract separately (scalar IV solver).
+    """
+    name = "bsm"
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.bsm = BSM(context)
+
+    def greeks(self, contract):
+        return ProviderGreeks.fromBSM(self.bsm.computeGreeks(contract, saveIt=True))
+
+
+class BatchBSMGreeksProvider(BSMGreeksProvider):
+    """
+    Computes the BSM Greeks of a whole list of contracts at once (vectorized IV solver and pricing).
+    Contracts that were not prepared are priced on demand.
+    """
+    name = "batch"
+
+    def prepare(self, contracts):
+        self.bsm.computeGreeksBatch(list(contracts), saveIt=True)
+
+    def greeks(self, contract):
+        return ProviderGreeks.fromBSM(self.bsm.computeGreeksBatch([contract], saveIt=True)[0])
+
+
+class SurfaceGreeksProvider(BSMGreeksProvider):
+    """
+    Computes the BSM Greeks with the IV read from the fitted volatility surface (context.volSurface). The IV is solved
+    from the mid-price for the contracts without a usable smile.
+    The Greeks are not saved on the contract objects so that they do not override the Greeks computed from the solved IV.
+    """
+    name = "surface"
+
+    def prepare(self, contracts):
+        self.context.volSurface.fit(list(contracts))
+
+    def greeks(self, contract):
+        sigma = self.context.volSurface.iv(contract)
+        if sigma is None:
+            return ProviderGreeks.fromBSM(self.bsm.computeGreeks(contract, saveIt=True))
+        return ProviderGreeks.fromBSM(self.bsm.computeGreeks(contract, sigma=sigma))
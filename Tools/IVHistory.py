@@ -0,0 +1,267 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+import json
+import numpy as np
+
+
+class IVHistory:
+    """
+    Rolling history of the ATM implied volatility of one underlying (one observation per bar).
+    The observations are kept in a fixed-size NumPy ring buffer (the oldest observation is dropped once the buffer is full) and
+    are also counted in a Fenwick tree over discretized IV buckets, so that the IV rank and IV percentile queries run in
+    O(log nBuckets) instead of sorting/scanning the whole history.
+
+    The precision of the rank/percentile (and of the min/max of the history) is the size of the buckets (bucketSize).
+    Observations above maxIV are counted in the last bucket.
+
+    Example:
+        history = IVHistory(self.context, size = 252 * 390)
+        history.add(0.18)
+        rank = history.ivRank()             # 0 -> current IV at the low of the period, 100 -> at the high
+        percentile = history.ivPercentile() # % of the observations below the current IV
+    """
+
+    def __init__(self, context, size=252*390, bucketSize=0.0005, maxIV=5.0):
+        self.context = context
+        # Maximum number of observations
+        self.size = int(size)
+        # Discretization of the IV values
+        self.bucketSize = bucketSize
+        self.nBuckets = int(np.ceil(maxIV / bucketSize)) + 1
+        # Ring buffer with the observations
+        self.values = np.full(self.size, np.nan)
+        # Position of the next observation in the ring buffer
+        self.head = 0
+        # Number of observations in the ring buffer
+        self.count = 0
+        # Fenwick tree (1-based) with the number of observations in each bucket
+        self.tree = [0] * (self.nBuckets + 1)
+        # Largest power of two not greater than the number of buckets (used by the kth search)
+        self.topBit = 1 << (self.nBuckets.bit_length() - 1)
+        # Time of the last observation (only one observation per bar is recorded)
+        self.lastTime = None
+
+    def __len__(self):
+        return self.count
+
+    def bucket(self, iv):
+        """
+        Returns the bucket (0-based) of the given IV value.
+        """
+        # The small offset makes sure that the values on the bucket edges (i.e. 0.123 with bucketSize = 0.001) are not affected by the rounding errors
+        return min(max(int(iv / self.bucketSize + 1e-9), 0), self.nBuckets - 1)
+
+    def add(self, iv, time=None):
+        """
+        Adds an observation to the history.
+        Args:
+            iv (float): The ATM implied volatility.
+            time (datetime): The time of the observation. The observation is ignored if it has the same time of the last one.
+        Returns:
+            bool: True if the observation was added.
+        """
+        if iv is None or not np.isfinite(iv) or iv <= 0:
+            return False
+        if time is not None and time == self.lastTime:
+            return False
+        self.lastTime = time
+        # Drop the oldest observation if the buffer is full
+        if self.count == self.size:
+            self.updateTree(self.bucket(self.values[self.head]), -1)
+        else:
+            self.count += 1
+        self.values[self.head] = iv
+        self.updateTree(self.bucket(iv), 1)
+        self.head = (self.head + 1) % self.size
+        return True
+
+    def updateTree(self, bucket, delta):
+        idx = bucket + 1
+        while idx <= self.nBuckets:
+            self.tree[idx] += delta
+            idx += idx & -idx
+
+    def countBelow(self, bucket):
+        """
+        Returns the number of observations in the buckets below the given one.
+        """
+        total = 0
+        idx = bucket
+        while idx > 0:
+            total += self.tree[idx]
+            idx -= idx & -idx
+        return total
+
+    def kth(self, k):
+        """
+        Returns the bucket (0-based) of the k-th smallest observation (k is 1-based).
+        """
+        idx = 0
+        step = self.topBit
+        while step > 0:
+            nextIdx = idx + step
+            if nextIdx <= self.nBuckets and self.tree[nextIdx] < k:
+                idx = nextIdx
+                k -= self.tree[nextIdx]
+            step >>= 1
+        return idx
+
+    def last(self):
+        """
+        Returns the most recent observation (None if the history is empty).
+        """
+        if self.count == 0:
+            return None
+        return float(self.values[(self.head - 1) % self.size])
+
+    def min(self):
+        if self.count == 0:
+            return None
+        return self.kth(1) * self.bucketSize
+
+    def max(self):
+        if self.count == 0:
+            return None
+        return self.kth(self.count) * self.bucketSize
+
+    def ivRank(self, iv=None):
+        """
+        Returns the IV rank: the position (0-100) of the given IV within the min-max range of the history.
+        Args:
+            iv (float): The IV value. The most recent observation is used if not specified.
+        Returns:
+            float: The IV rank or None if the history is empty.
+        """
+        if self.count == 0:
+            return None
+        iv = self.last() if iv is None else iv
+        low = self.kth(1)
+        high = self.kth(self.count)
+        if high == low:
+            return 100.0 if self.bucket(iv) >= high else 0.0
+        return float(min(max((self.bucket(iv) - low) / (high - low), 0.0), 1.0) * 100)
+
+    def ivPercentile(self, iv=None):
+        """
+        Returns the IV percentile: the percentage (0-100) of the observations in the history that are below the given IV.
+        Args:
+            iv (float): The IV value. The most recent observation is used if not specified.
+        Returns:
+            float: The IV percentile or None if the history is empty.
+        """
+        if self.count == 0:
+            return None
+        iv = self.last() if iv is None else iv
+        return self.countBelow(self.bucket(iv)) / self.count * 100
+
+    def toList(self):
+        """
+        Returns the observations in chronological order.
+        """
+        if self.count < self.size:
+            return self.values[:self.count].tolist()
+        return np.roll(self.values, -self.head).tolist()
+
+
+class IVHistoryStore:
+    """
+    Keeps one IVHistory for each underlying and persists them to the ObjectStore so that the history survives the live restarts.
+
+    Example:
+        self.context.ivHistory = IVHistoryStore(self.context, size = 252 * 390)
+        # Record the ATM IV of the current bar
+        self.context.ivHistory.record("SPX", contracts)
+        # Query the history
+        rank = self.context.ivHistory.get("SPX").ivRank()
+    """
+
+    # ObjectStore key
+    KEY = "ivHistory.json"
+
+    def __init__(self, context, size=252*390, bucketSize=0.0005, maxIV=5.0):
+        self.context = context
+        self.size = size
+        self.bucketSize = bucketSize
+        self.maxIV = maxIV
+        # Dictionary with the history of each underlying
+        self.histories = {}
+        # Date of the last save (OnEndOfDay is called once per subscribed symbol)
+        self.lastSaveDate = None
+
+    def get(self, ticker):
+        """
+        Returns the IV history of the given underlying (creating it if needed).
+        """
+        if ticker not in self.histories:
+            self.histories[ticker] = IVHistory(self.context, size=self.size, bucketSize=self.bucketSize, maxIV=self.maxIV)
+        return self.histories[ticker]
+
+    def atmImpliedVolatility(self, contracts, dte=30):
+        """
+        Returns the ATM implied volatility (average of the Call and Put IV computed by Lean) of the expiry closest to the target DTE.
+        The IV is only read for the ATM contracts (reading the IV of a ProviderOptionContract creates its Lean indicators).
+        Args:
+            contracts (list): The option contracts of the chain (as returned by the DataHandler of the strategy).
+            dte (int): The target DTE.
+        Returns:
+            float: The ATM implied volatility or None if not available.
+        """
+        if not contracts:
+            return None
+        # Select the expiry closest to the target DTE
+        today = self.context.Time.date()
+        expiry = min({contract.Expiry for contract in contracts}, key=lambda expiry: abs((expiry.date() - today).days - dte))
+        contracts = [contract for contract in contracts if contract.Expiry == expiry]
+        # Select the strike closest to the price of the underlying
+        spotPrice = contracts[0].UnderlyingLastPrice
+        strike = min({contract.Strike for contract in contracts}, key=lambda strike: abs(strike - spotPrice))
+        # Only the contracts with a valid IV
+        ivs = [contract.ImpliedVolatility for contract in contracts if contract.Strike == strike]
+        ivs = [iv for iv in ivs if iv and iv > 0]
+        if not ivs:
+            return None
+        return sum(ivs) / len(ivs)
+
+    def record(self, ticker, contracts, dte=30):
+        """
+        Records the ATM implied volatility of the current bar.
+        Args:
+            ticker (str): The underlying ticker.
+            contracts (list): The option contracts of the chain (as returned by the DataHandler of the strategy).
+            dte (int): The target DTE of the ATM implied volatility.
+        Returns:
+            IVHistory: The history of the underlying.
+        """
+        # Start the timer
+        self.context.executionTimer.start("Tools.IVHistory -> record")
+        history = self.get(ticker)
+        if contracts and history.lastTime != self.context.Time:
+            history.add(self.atmImpliedVolatility(contracts, dte=dte), time=self.context.Time)
+        # Stop the timer
+        self.context.executionTimer.stop("Tools.IVHistory -> record")
+        return history
+
+    def save(self):
+        """
+        Stores the histories in the ObjectStore.
+        """
+        data = {ticker: history.toList() for ticker, history in self.histories.items()}
+        self.context.object_store.save(self.KEY, json.dumps(data))
+        self.lastSaveDate = self.context.Time.date()
+
+    def load(self):
+        """
+        Loads the histories from the ObjectStore (the most recent observations are kept if the stored history is larger than the buffer).
+        """
+        try:
+            json_data = self.context.object_store.read(self.KEY)
+            if not json_data:
+                return
+            for ticker, values in json.loads(json_data).items():
+                history = self.get(ticker)
+                for iv in values[-history.size:]:
+                    history.add(iv)
+        except Exception as e:
+            self.context.logger.error(f"Error reading the IV history: {e}")
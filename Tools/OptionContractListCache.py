@@ -0,0 +1,86 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+
+class OptionContractListCache:
+    """
+    Cache of the OptionChainProvider contract lists, keyed by (canonical option symbol, date). The listed contracts change at
+    most once a day, so the list is requested to the provider on the first bar of the day and reused on every other bar and by
+    every strategy/retry that needs the chain of the same underlying. The entries of the previous days are dropped.
+
+    The lists that include contracts expiring today (0DTE) can optionally be refreshed intraday (see refreshInterval), to pick up
+    the strikes that are listed during the session. Empty lists are never cached (the provider might not have the data yet).
+
+    Hits, misses and refreshes are reported through the executionTimer counters.
+
+    Example:
+        self.context.optionContractLists = OptionContractListCache(self.context, refreshInterval = timedelta(minutes = 30))
+        symbols = self.context.optionContractLists.get(canonicalSymbol)
+    """
+
+    def __init__(self, context, refreshInterval=None):
+        self.context = context
+        # Intraday refresh interval of the lists with 0DTE contracts (None -> never refresh)
+        self.refreshInterval = refreshInterval
+        # The cache: (canonical symbol, date) -> (time of the request, list of symbols, has 0DTE contracts)
+        self.cache = {}
+        # Date of the cached entries
+        self.date = None
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, canonicalSymbol):
+        """
+        Returns the list of option contracts of the given canonical symbol at the current date.
+        Args:
+            canonicalSymbol (Symbol): The canonical option symbol.
+        Returns:
+            list: The option contract symbols.
+        """
+        today = self.context.Time.date()
+        # Drop the entries of the previous days
+        if self.date != today:
+            self.cache.clear()
+            self.date = today
+
+        key = (canonicalSymbol, today)
+        entry = self.cache.get(key)
+        if entry is not None:
+            requestTime, symbols, hasZeroDte = entry
+            if not (hasZeroDte and self.refreshInterval is not None and self.context.Time - requestTime >= self.refreshInterval):
+                self.hits += 1
+                self.context.executionTimer.count("Tools.OptionContractListCache -> hits")
+                return symbols
+            self.refreshes += 1
+            self.context.executionTimer.count("Tools.OptionContractListCache -> refreshes")
+        else:
+            self.misses += 1
+            self.context.executionTimer.count("Tools.OptionContractListCache -> misses")
+
+        symbols = list(self.context.OptionChainProvider.GetOptionContractList(canonicalSymbol, self.context.Time))
+        if symbols:
+            hasZeroDte = any(symbol.ID.Date.date() == today for symbol in symbols)
+            self.cache[key] = (self.context.Time, symbols, hasZeroDte)
+        return symbols
+
+    def clear(self):
+        """
+        Removes all the entries from the cache.
+        """
+        self.cache.clear()
+        self.date = None
+
+    def hitRate(self):
+        """
+        Returns the fraction of lookups that hit the cache.
+        Returns:
+            float: The hit rate (0 if there were no lookups).
+        """
+        lookups = self.hits + self.misses + self.refreshes
+        return self.hits/lookups if lookups > 0 else 0.0
+
+    def __len__(self):
+        return len(self.cache)
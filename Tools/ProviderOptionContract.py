@@ -5,6 +5,22 @@ from AlgorithmImports import *
 from datetime import datetime
 
 class ProviderOptionContract:
+    """
+    Option contract built from an OptionChainProvider symbol (mirrors the attributes of the Lean OptionContract).
+    The Security of the contract is resolved once, when the object is created: all the price/Greeks properties read it directly
+    instead of looking it up in context.Securities.
+
+    The instances are flyweights: one per symbol, kept in context.providerOptionContracts and reused across bars (see get).
+    The attributes are declared in __slots__ (including the ones set by the BSM library) to keep the instances small.
+    Since the instances are shared by all the strategies, greeks always reads the Lean indicators: the Greeks of the tier selected
+    by a strategy are read through its contract utils (strategy.contractUtils.delta(contract), see Tools.GreeksProvider).
+
+    Example:
+        contract = ProviderOptionContract.get(symbol, underlyingPrice, self.context)
+    """
+    __slots__ = ("symbol", "Symbol", "Underlying", "UnderlyingSymbol", "ID", "UnderlyingLastPrice", "security", "context",
+                 "leanGreeks", "BSMGreeks", "BSMImpliedVolatility")
+
     def __init__(self, symbol, underlying_price, context):
         self.symbol = symbol
         self.Symbol = symbol
@@ -14,33 +30,79 @@ class ProviderOptionContract:
         self.UnderlyingLastPrice = underlying_price
         self.security = context.Securities[symbol]
         self.context = context
-        # Instantiate the custom Greeks object
-        self.greeks = self.Greeks(context, self.security)
+        # Instantiate the custom Greeks object (Lean indicators)
+        self.leanGreeks = self.Greeks(context, self.security)
+
+    @classmethod
+    def get(cls, symbol, underlying_price, context):
+        """
+        Returns the instance of the given symbol, creating it on the first request. The price of the underlying of an
+        existing instance is updated.
+        Args:
+            symbol (Symbol): The option contract symbol.
+            underlying_price (float): The current price of the underlying.
+            context: The algorithm.
+        Returns:
+            ProviderOptionContract: The contract.
+        """
+        contract = context.providerOptionContracts.get(symbol)
+        if contract is None:
+            context.executionTimer.count("Tools.ProviderOptionContract -> created")
+            contract = context.providerOptionContracts[symbol] = cls(symbol, underlying_price, context)
+        else:
+            context.executionTimer.count("Tools.ProviderOptionContract -> reused")
+            contract.UnderlyingLastPrice = underlying_price
+        return contract
+
+    @classmethod
+    def discard(cls, context, symbol):
+        """
+        Drops the instance of the given symbol (i.e. the security has been removed from the algorithm).
+        """
+        context.providerOptionContracts.pop(symbol, None)
+
+    @property
+    def greeks(self):
+        return self.leanGreeks
 
     class Greeks:
+        __slots__ = ("context", "security")
+
         def __init__(self, context, security):
             self.context = context
             self.security = security
+
+        def indicator(self, name):
+            # Create the Lean indicators on the first read (see GreekIndicators)
+            greekIndicators = getattr(self.context, "greekIndicators", None)
+            if greekIndicators is not None:
+                greekIndicators.ensure(self.security)
+            return getattr(self.security, name, None)
             
         @property
         def delta(self):
-            return self.security.delta.current.value if self.security.delta else 0
+            indicator = self.indicator("delta")
+            return indicator.current.value if indicator else 0
 
         @property
         def gamma(self):
-            return self.security.gamma.current.value if self.security.gamma else 0
+            indicator = self.indicator("gamma")
+            return indicator.current.value if indicator else 0
 
         @property
         def theta(self):
-            return self.security.theta.current.value if self.security.theta else 0
+            indicator = self.indicator("theta")
+            return indicator.current.value if indicator else 0
 
         @property
         def vega(self):
-            return self.security.vega.current.value if self.security.vega else 0
+            indicator = self.indicator("vega")
+            return indicator.current.value if indicator else 0
 
         @property
         def rho(self):
-            return self.security.rho.current.value if self.security.rho else 0
+            indicator = self.indicator("rho")
+            return indicator.current.value if indicator else 0
 
 
     @property
@@ -77,6 +139,11 @@ class ProviderOptionContract:
 
     @property
     def implied_volatility(self):
-        return self.security.iv.current.value if self.security.iv else 0
+        indicator = self.leanGreeks.indicator("iv")
+        return indicator.current.value if indicator else 0
+
+    @property
+    def ImpliedVolatility(self):
+        return self.implied_volatility
 
     # Add any other properties or methods you commonly use from OptionContract
\ No newline at end of file
@@ -0,0 +1,176 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+
+class QuoteState:
+    """
+    Last observed quotes of a contract (see QuoteTracker).
+    """
+    __slots__ = ("bid", "ask", "spot", "mid", "version", "quoteVersion", "time", "dirty")
+
+    def __init__(self, bid, ask, spot, time):
+        self.bid = bid
+        self.ask = ask
+        self.spot = spot
+        # Mid-price of the current quotes (None until it is computed, see QuoteTracker.setMid)
+        self.mid = None
+        # Incremented every time the quotes or the price of the underlying change
+        self.version = 0
+        # Incremented every time the quotes change (values that do not depend on the underlying, i.e. the mid-price)
+        self.quoteVersion = 0
+        # Time of the bar of the last observation
+        self.time = time
+        # Whether the quotes changed at the last observation
+        self.dirty = True
+
+
+class QuoteTracker:
+    """
+    Per-bar dirty set of the option contracts (context.quoteTracker): a contract is dirty if its bid/ask or the price of its
+    underlying changed since the previous bar in which it was observed (or if it has never been observed). The quotes are
+    observed when the ChainSnapshot of the chain is built, so that the values derived from the quotes are only recomputed for
+    the dirty contracts:
+        - ChainSnapshot: the mid-prices of the clean contracts are reused
+        - BSM.computeGreeksBatch: the Greeks of the clean contracts are reused (for up to maxAge since they were computed)
+
+    The consumers keep the version of the quotes they used (see version): the value is still valid as long as the contract is
+    clean with respect to that version (see isClean).
+    The fraction of clean contracts (hit rate) of each bar is logged and reported through the executionTimer counters.
+
+    Example:
+        dirty = self.context.quoteTracker.observe(contract.Symbol, bid, ask, spot)
+        version = self.context.quoteTracker.version(contract.Symbol)
+        ...
+        if self.context.quoteTracker.isClean(contract.Symbol, version, since = computedAt):
+            # Reuse the value computed at version
+    """
+
+    def __init__(self, context, maxAge=timedelta(minutes=5)):
+        self.context = context
+        # Maximum age of a value reused for a clean contract (None -> no limit)
+        self.maxAge = maxAge
+        # State of each contract: Symbol -> QuoteState
+        self.states = {}
+        # Stats of the current bar
+        self.barTime = None
+        self.dirtyCount = 0
+        self.cleanCount = 0
+        # Hit rate of the last completed bar (None if no contracts were observed)
+        self.lastHitRate = None
+
+    def observe(self, symbol, bid, ask, spot=None):
+        """
+        Records the quotes of the contract at the current bar.
+        Args:
+            symbol (Symbol): The contract symbol.
+            bid/ask (float): The bid/ask prices of the contract.
+            spot (float): The price of the underlying (None -> only the quotes of the contract are compared).
+        Returns:
+            bool: True if the contract is dirty (the quotes changed since the previous observation).
+        """
+        now = self.context.Time
+        self.rollover(now)
+        state = self.states.get(symbol)
+        if state is None:
+            self.states[symbol] = QuoteState(bid, ask, spot, now)
+            self.dirtyCount += 1
+            return True
+
+        # Whether the contract has already been counted in the stats of this bar (i.e. observed by another snapshot)
+        counted = state.time == now
+        if not counted:
+            state.time = now
+            state.dirty = False
+        quotesChanged = state.bid != bid or state.ask != ask
+        spotChanged = spot is not None and state.spot != spot
+        if quotesChanged:
+            state.bid, state.ask = bid, ask
+            # The mid-price only depends on the quotes of the contract
+            state.mid = None
+            state.quoteVersion += 1
+        if spotChanged:
+            state.spot = spot
+        if quotesChanged or spotChanged:
+            state.version += 1
+            if counted and not state.dirty:
+                self.cleanCount -= 1
+                self.dirtyCount += 1
+            state.dirty = True
+        if not counted:
+            if state.dirty:
+                self.dirtyCount += 1
+            else:
+                self.cleanCount += 1
+        return state.dirty
+
+    def rollover(self, now):
+        """
+        Reports the hit rate of the previous bar when a new bar starts.
+        """
+        if self.barTime == now:
+            return
+        total = self.dirtyCount + self.cleanCount
+        if total > 0:
+            self.lastHitRate = self.cleanCount / total
+            self.context.executionTimer.count("Tools.QuoteTracker -> clean", self.cleanCount)
+            self.context.executionTimer.count("Tools.QuoteTracker -> dirty", self.dirtyCount)
+            self.context.logger.debug(f"QuoteTracker -> {self.barTime}: {self.cleanCount}/{total} clean contracts (hit rate: {self.lastHitRate:.1%})")
+        self.barTime = now
+        self.dirtyCount = 0
+        self.cleanCount = 0
+
+    def version(self, symbol, quotesOnly=False):
+        """
+        Returns the version of the quotes of the contract at the current bar (None if it has not been observed in this bar).
+        If quotesOnly is True, the changes of the price of the underlying are ignored.
+        """
+        state = self.states.get(symbol)
+        if state is None or state.time != self.context.Time:
+            return None
+        return state.quoteVersion if quotesOnly else state.version
+
+    def isClean(self, symbol, version, since=None, quotesOnly=False):
+        """
+        Checks whether a value computed from the given version of the quotes is still valid at the current bar.
+        Args:
+            symbol (Symbol): The contract symbol.
+            version (int): The version of the quotes used to compute the value.
+            since (datetime): The time at which the value was computed (checked against maxAge).
+            quotesOnly (bool): Ignore the changes of the price of the underlying (the version must come from version(quotesOnly = True)).
+        Returns:
+            bool: True if the contract has been observed in this bar and its quotes have not changed since that version.
+        """
+        if version is None:
+            return False
+        if since is not None and self.maxAge is not None and self.context.Time - since > self.maxAge:
+            return False
+        return self.version(symbol, quotesOnly=quotesOnly) == version
+
+    def mid(self, symbol):
+        """
+        Returns the mid-price of the current quotes of the contract (None if it has not been computed yet).
+        """
+        state = self.states.get(symbol)
+        return None if state is None else state.mid
+
+    def setMid(self, symbol, mid):
+        state = self.states.get(symbol)
+        if state is not None:
+            state.mid = mid
+
+    def hitRate(self):
+        """
+        Returns the fraction of clean contracts observed so far in the current bar (0 if none were observed).
+        """
+        total = self.dirtyCount + self.cleanCount
+        return self.cleanCount / total if total > 0 else 0.0
+
+    def discard(self, symbol):
+        """
+        Drops the state of the contract (i.e. the security has been removed from the algorithm).
+        """
+        self.states.pop(symbol, None)
+
+    def __len__(self):
+        return len(self.states)
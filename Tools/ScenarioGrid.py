@@ -0,0 +1,118 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+import numpy as np
+from .BSMLibrary import BSM
+
+
+class ScenarioGrid:
+    """
+    Evaluates the P&L of a position (or of a batch of candidate orders) over a grid of scenarios in a single vectorized call.
+    Each scenario is a combination of:
+        - a relative move of the underlying (spotShocks, i.e. -0.12 -> the underlying is down 12%)
+        - a shift in time from the current bar (timeShifts, i.e. timedelta(days = 2))
+        - an absolute shift of the implied volatility of all the contracts (volShocks, i.e. 0.05 -> IV + 5 vol points)
+
+    The contracts are priced with the BSM model (Black-76 for options on futures) using their implied volatility
+    (contract.BSMImpliedVolatility unless the sigma array is specified), so the Greeks of the contracts must have been computed beforehand.
+
+    Used by Order (margin stress and theta profit target) and available to the Monitors for stress-based exits.
+
+    Example:
+        grid = ScenarioGrid(self.context)
+        # P&L matrix with shape (3 spot moves, 2 times, 1 vol)
+        pnl = grid.evaluate(contracts, sides, spotShocks = [-0.1, 0, 0.1], timeShifts = [timedelta(0), timedelta(days = 1)], openPremium = premium)
+    """
+
+    def __init__(self, context):
+        self.context = context
+        # Pricing model
+        self.bsm = BSM(context)
+
+    def evaluate(self, contracts, sides, spotShocks = (0.0,), timeShifts = (timedelta(0),), volShocks = (0.0,), openPremium = 0.0, spotPrice = None, sigma = None):
+        """
+        Evaluates the P&L of a single position over the grid of scenarios.
+        Args:
+            contracts (list): The contracts of the position.
+            sides (list): The side of each contract (+1 long, -1 short).
+            spotShocks (list): Relative moves of the underlying.
+            timeShifts (list): Shifts (timedelta) from the current time.
+            volShocks (list): Absolute shifts of the implied volatility.
+            openPremium (float): The premium paid (negative) or received (positive) to open the position.
+            spotPrice (float): The price of the underlying. The last price of the underlying of the first contract is used if not specified.
+            sigma (list): The implied volatility of each contract. contract.BSMImpliedVolatility is used if not specified.
+        Returns:
+            np.ndarray: The P&L matrix with shape (len(spotShocks), len(timeShifts), len(volShocks)).
+        """
+        return self.evaluateBatch([(contracts, sides, openPremium)], spotShocks = spotShocks, timeShifts = timeShifts, volShocks = volShocks, spotPrice = spotPrice, sigma = sigma)[0]
+
+    def evaluateBatch(self, orders, spotShocks = (0.0,), timeShifts = (timedelta(0),), volShocks = (0.0,), spotPrice = None, sigma = None):
+        """
+        Evaluates the P&L of a batch of positions/orders over the same grid of scenarios. The contracts shared by multiple
+        orders are priced only once.
+        Args:
+            orders (list): List of (contracts, sides, openPremium) tuples. All the contracts must have the same underlying.
+            spotShocks (list): Relative moves of the underlying.
+            timeShifts (list): Shifts (timedelta) from the current time.
+            volShocks (list): Absolute shifts of the implied volatility.
+            spotPrice (float): The price of the underlying. The last price of the underlying of the first contract is used if not specified.
+            sigma (dict): Symbol -> implied volatility. contract.BSMImpliedVolatility is used for the contracts not in the dictionary.
+        Returns:
+            np.ndarray: The P&L matrix with shape (len(orders), len(spotShocks), len(timeShifts), len(volShocks)).
+        """
+        # Start the timer
+        self.context.executionTimer.start("Tools.ScenarioGrid -> evaluateBatch")
+
+        # Get the unique contracts across all the orders
+        contracts = {}
+        for orderContracts, _, _ in orders:
+            for contract in orderContracts:
+                contracts.setdefault(contract.Symbol, contract)
+        symbols = list(contracts)
+        index = {symbol: idx for idx, symbol in enumerate(symbols)}
+        uniqueContracts = [contracts[symbol] for symbol in symbols]
+
+        # Get the current price of the underlying unless otherwise specified
+        if spotPrice is None:
+            spotPrice = self.bsm.contractUtils.getUnderlyingLastPrice(uniqueContracts[0])
+
+        # Implied volatility of each contract
+        if sigma is None:
+            sigma = {}
+        elif not isinstance(sigma, dict):
+            # List of volatilities aligned with the contracts of a single order
+            sigma = {contract.Symbol: vol for contract, vol in zip(orders[0][0], sigma)}
+        iv = np.array([sigma.get(symbol, contracts[symbol].BSMImpliedVolatility) for symbol in symbols], dtype = np.float64)
+
+        # Contract axis: (nContracts, 1, 1, 1)
+        strikes = np.array([contract.Strike for contract in uniqueContracts], dtype = np.float64)[:, None, None, None]
+        isCall = np.array([contract.Right == OptionRight.Call for contract in uniqueContracts])[:, None, None, None]
+        # Spot axis: (1, nSpot, 1, 1)
+        spot = (spotPrice * (1.0 + np.asarray(spotShocks, dtype = np.float64)))[None, :, None, None]
+        # Time axis: (nContracts, 1, nTime, 1)
+        tau = np.array([[self.bsm.optionTau(contract, atTime = self.context.Time + shift) for shift in timeShifts] for contract in uniqueContracts], dtype = np.float64)[:, None, :, None]
+        # Vol axis: (nContracts, 1, 1, nVol). The volatility cannot be negative
+        vol = np.maximum(iv[:, None] + np.asarray(volShocks, dtype = np.float64)[None, :], 0.0)[:, None, None, :]
+
+        # Price of each contract in each scenario: (nContracts, nSpot, nTime, nVol)
+        prices = self.bsm.bsmPriceBatch(strikes, isCall, tau, spot, vol)
+        # Options on futures are priced with the Black-76 model (the spot axis is the price of the underlying future)
+        isFOP = np.array([self.bsm.isFutureOption(contract) for contract in uniqueContracts])
+        if isFOP.any():
+            prices[isFOP] = self.bsm.black76Batch(strikes[isFOP], isCall[isFOP], tau[isFOP], spot, vol[isFOP])["price"]
+
+        # Side of each contract in each order: (nOrders, nContracts)
+        weights = np.zeros((len(orders), len(symbols)))
+        openPremiums = np.zeros(len(orders))
+        for orderIdx, (orderContracts, sides, openPremium) in enumerate(orders):
+            openPremiums[orderIdx] = openPremium
+            for contract, side in zip(orderContracts, sides):
+                weights[orderIdx, index[contract.Symbol]] += side
+
+        # Total value of each position: (nOrders, nSpot, nTime, nVol)
+        pnl = openPremiums[:, None, None, None] + np.tensordot(weights, prices, axes = 1)
+
+        # Stop the timer
+        self.context.executionTimer.stop("Tools.ScenarioGrid -> evaluateBatch")
+        return pnl
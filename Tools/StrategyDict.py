@@ -0,0 +1,77 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+from collections import Counter
+
+
+class StrategyDict(dict):
+    """
+    Dictionary that keeps the number of entries of each strategy up to date as the entries are added/replaced/removed, so that
+    the per-strategy limits (i.e. maxActivePositions, maxOpenPositions) are checked in O(1) instead of scanning all the entries.
+    Used for context.openPositions (orderTag -> orderId) and context.workingOrders (orderTag -> WorkingOrder).
+
+    The strategy of each entry is resolved once, when the entry is set, through the strategyTagOf function.
+
+    Example:
+        self.context.workingOrders = StrategyDict(lambda order: getattr(order, "strategyTag", None))
+        self.context.workingOrders[orderTag] = workingOrder
+        self.context.workingOrders.countTag("SPXic")
+    """
+
+    def __init__(self, strategyTagOf, *args, **kwargs):
+        super().__init__()
+        # Function returning the strategyTag of a value
+        self.strategyTagOf = strategyTagOf
+        # Strategy of each key and number of entries of each strategy
+        self.tags = {}
+        self.counts = Counter()
+        self.update(*args, **kwargs)
+
+    def countTag(self, strategyTag):
+        """
+        Returns the number of entries of the given strategy.
+        """
+        return self.counts[strategyTag]
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.untrack(key)
+        super().__setitem__(key, value)
+        tag = self.strategyTagOf(value)
+        self.tags[key] = tag
+        self.counts[tag] += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.untrack(key)
+
+    def untrack(self, key):
+        tag = self.tags.pop(key, None)
+        self.counts[tag] -= 1
+        if self.counts[tag] <= 0:
+            del self.counts[tag]
+
+    def pop(self, key, *default):
+        if key in self:
+            self.untrack(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self.untrack(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self.tags.clear()
+        self.counts.clear()
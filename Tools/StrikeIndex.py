@@ -0,0 +1,113 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+import numpy as np
+
+
+class StrikeIndex:
+    """
+    Sorted strike index of a list of option contracts (i.e. the contracts of one expiry). The strikes are sorted once when
+    the index is built, then the ATM/nearest-strike, strike-offset and wing lookups are O(log n) binary searches.
+
+    When multiple contracts are at the same distance from the requested price (i.e. the Put and the Call of the same strike),
+    the results follow the order of the contracts in the original list.
+
+    Example:
+        index = StrikeIndex(contracts)
+        # Put and Call closest to the price of the underlying
+        atm = index.nearest(spotPrice, n = 2)
+        # Strike 3 steps above the ATM strike
+        strike = index.offsetStrike(atm[0].Strike, 3)
+    """
+
+    def __init__(self, contracts):
+        self.contracts = contracts
+        strikes = np.array([float(contract.Strike) for contract in contracts], dtype=np.float64)
+        # Position of the contracts in the original list, sorted by strike (stable: the ties keep their original order)
+        self.order = np.argsort(strikes, kind="stable")
+        self.strikes = strikes[self.order]
+        # Unique strikes (for the strike-offset lookups)
+        self.uniqueStrikes = np.unique(self.strikes)
+
+    def __len__(self):
+        return len(self.contracts)
+
+    def nearest(self, price, n=1):
+        """
+        Returns the n contracts with the strike closest to the given price.
+        Args:
+            price (float): The reference price (i.e. the price of the underlying).
+            n (int): The number of contracts to return.
+        Returns:
+            list: The contracts sorted by distance from the price (ties in the order of the original list).
+        """
+        size = len(self.strikes)
+        n = min(n, size)
+        if n == 0:
+            return []
+        # The n closest strikes are within n positions from the insertion point of the price
+        pos = int(np.searchsorted(self.strikes, price))
+        window = np.abs(self.strikes[max(0, pos - n):min(size, pos + n)] - price)
+        # Distance of the n-th closest contract
+        threshold = np.partition(window, n - 1)[n - 1]
+        # Include all the contracts within that distance (there might be more ties outside of the window)
+        left = int(np.searchsorted(self.strikes, price - threshold, side="left"))
+        right = int(np.searchsorted(self.strikes, price + threshold, side="right"))
+        # Sort the candidates by distance, then by their position in the original list
+        candidates = self.order[left:right]
+        distance = np.abs(self.strikes[left:right] - price)
+        selected = candidates[np.lexsort((candidates, distance))[:n]]
+        return [self.contracts[idx] for idx in selected]
+
+    def nearestStrike(self, price):
+        """
+        Returns the strike closest to the given price (None if the index is empty).
+        """
+        contracts = self.nearest(price, n=1)
+        return contracts[0].Strike if contracts else None
+
+    def offsetStrike(self, strike, offset):
+        """
+        Returns the strike that is offset steps away from the given strike (offset > 0 -> higher strikes, offset < 0 -> lower strikes).
+        The given strike is first snapped to the closest listed strike.
+        Returns:
+            float: The strike or None if the offset goes beyond the listed strikes.
+        """
+        if len(self.uniqueStrikes) == 0:
+            return None
+        pos = int(np.searchsorted(self.uniqueStrikes, strike))
+        # Snap to the closest listed strike
+        if pos == len(self.uniqueStrikes) or (pos > 0 and strike - self.uniqueStrikes[pos - 1] <= self.uniqueStrikes[pos] - strike):
+            pos -= 1
+        target = pos + offset
+        if target < 0 or target >= len(self.uniqueStrikes):
+            return None
+        return float(self.uniqueStrikes[target])
+
+    def atStrike(self, strike):
+        """
+        Returns the contracts with the given strike (in the order of the original list).
+        """
+        left = int(np.searchsorted(self.strikes, strike, side="left"))
+        right = int(np.searchsorted(self.strikes, strike, side="right"))
+        return [self.contracts[idx] for idx in np.sort(self.order[left:right])]
+
+    @staticmethod
+    def wingPositions(strikes, wingSize):
+        """
+        Finds the wing of each leg of a list of contracts sorted by their distance from the first contract (i.e. Calls sorted
+        by ascending strike or Puts sorted by descending strike). The wing of the leg at position i is the furthest contract
+        after it within wingSize from its strike or, if there is no such contract, the next contract in the list.
+        Args:
+            strikes (np.ndarray): The strikes of the contracts (in the order of the list).
+            wingSize (float): The maximum distance between the strikes of the leg and its wing.
+        Returns:
+            np.ndarray: The position of the wing of each leg (len(strikes) if the leg is the last contract of the list).
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        # Distance from the first contract (non decreasing along the list)
+        distance = np.abs(strikes - strikes[0])
+        positions = np.arange(len(strikes))
+        wings = np.searchsorted(distance, distance + wingSize, side="right") - 1
+        return np.where(wings > positions, wings, positions + 1)
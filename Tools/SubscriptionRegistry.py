@@ -0,0 +1,165 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+
+class SubscriptionRegistry:
+    """
+    Registry of the option contract subscriptions (context.optionContractsSubscriptions), with one reference per owner of each
+    contract: the position that holds it as a leg (key: orderTag, from the moment the order is created until the position is
+    closed/cancelled) or the scan window of a strategy (see DataHandler.optionChainProviderFilter).
+    Lookups are O(1) and the contracts are acquired/released in bulk: acquire returns only the contracts that are not
+    subscribed yet (the caller adds the Lean subscriptions), release returns the contracts that are no longer referenced by
+    any owner, which can then be removed safely (see SetupBaseStructure.ClearSecurity).
+
+    The contracts added without an owner (i.e. through append) are referenced by the None owner.
+
+    Only the contracts subscribed through DataHandler.AddOptionContracts (kept in subscribed) are garbage collected once
+    they are no longer referenced (see unreferenced): the legs of the strategies using the slice belong to the option
+    universe (SetFilter) and stay subscribed after their position is closed.
+
+    Each contract belongs to a resolution tier: "leg" if it is referenced by a position (legResolution), "scan" otherwise
+    (scanResolution). The resolution at which each contract is currently subscribed is kept in resolutions (see
+    SetupBaseStructure.updateResolutionTiers).
+
+    Example:
+        newSymbols = self.context.optionContractsSubscriptions.acquire(symbols, owner = ("scan", "SPXic"))
+        for symbol in newSymbols:
+            self.context.AddIndexOptionContract(symbol, resolution)
+        unreferenced = self.context.optionContractsSubscriptions.release(owner = orderTag)
+    """
+
+    def __init__(self, context):
+        self.context = context
+        # Owners of each subscribed contract: Symbol -> set of owners
+        self.owners = {}
+        # Contracts referenced by each owner: owner -> set of Symbols
+        self.symbols = {}
+        # Resolution of the data subscription of each contract: Symbol -> Resolution
+        self.resolutions = {}
+        # Contracts subscribed through DataHandler.AddOptionContracts
+        self.subscribed = set()
+
+    def acquire(self, symbols, owner=None):
+        """
+        Adds a reference from the owner to each of the given contracts.
+        Args:
+            symbols (list): The contract symbols.
+            owner: The owner of the references (i.e. the orderTag of a position).
+        Returns:
+            list: The contracts that were not subscribed yet (in the order of the given list).
+        """
+        newSymbols = []
+        ownedSymbols = self.symbols.setdefault(owner, set())
+        for symbol in symbols:
+            owners = self.owners.get(symbol)
+            if owners is None:
+                owners = self.owners[symbol] = set()
+                newSymbols.append(symbol)
+            owners.add(owner)
+            ownedSymbols.add(symbol)
+        return newSymbols
+
+    def release(self, symbols=None, owner=None):
+        """
+        Removes the references of the owner to the given contracts (all the contracts of the owner if symbols is None).
+        Args:
+            symbols (list): The contract symbols.
+            owner: The owner of the references.
+        Returns:
+            list: The contracts that are no longer referenced by any owner (they are still registered until removed).
+        """
+        ownedSymbols = self.symbols.get(owner)
+        if not ownedSymbols:
+            return []
+        symbols = list(ownedSymbols) if symbols is None else [symbol for symbol in symbols if symbol in ownedSymbols]
+        unreferenced = []
+        for symbol in symbols:
+            ownedSymbols.discard(symbol)
+            owners = self.owners.get(symbol)
+            if owners is None:
+                continue
+            owners.discard(owner)
+            if not owners:
+                unreferenced.append(symbol)
+        if not ownedSymbols:
+            del self.symbols[owner]
+        return unreferenced
+
+    @staticmethod
+    def isScanOwner(owner):
+        """
+        Returns True if the owner is the scan window of a strategy (or the None owner), False if it is a position.
+        """
+        return owner is None or (isinstance(owner, tuple) and len(owner) > 0 and owner[0] == "scan")
+
+    def tier(self, symbol):
+        """
+        Returns the resolution tier of the contract: "leg" if it is referenced by at least one position, "scan" otherwise.
+        """
+        if any(not self.isScanOwner(owner) for owner in self.owners.get(symbol, ())):
+            return "leg"
+        return "scan"
+
+    def scanOwners(self, symbol):
+        """
+        Returns the scan windows (and the None owner) referencing the contract.
+        """
+        return [owner for owner in self.owners.get(symbol, ()) if self.isScanOwner(owner)]
+
+    def refCount(self, symbol):
+        """
+        Returns the number of owners of the contract (0 if it is not referenced or not registered).
+        """
+        return len(self.owners.get(symbol, ()))
+
+    def unreferenced(self):
+        """
+        Returns the contracts subscribed through AddOptionContracts that are not referenced by any owner.
+        """
+        return [symbol for symbol, owners in self.owners.items() if not owners and symbol in self.subscribed]
+
+    def remove(self, symbol):
+        """
+        Removes the contract from the registry (i.e. the security has been removed from the algorithm).
+        """
+        owners = self.owners.pop(symbol, None)
+        self.resolutions.pop(symbol, None)
+        self.subscribed.discard(symbol)
+        for owner in owners or ():
+            ownedSymbols = self.symbols.get(owner)
+            if ownedSymbols is not None:
+                ownedSymbols.discard(symbol)
+                if not ownedSymbols:
+                    del self.symbols[owner]
+
+    def append(self, symbol):
+        """
+        Registers a contract without an owner (list compatible interface).
+        """
+        self.acquire([symbol])
+
+    def clear(self):
+        self.owners.clear()
+        self.symbols.clear()
+        self.resolutions.clear()
+        self.subscribed.clear()
+
+    def __contains__(self, symbol):
+        return symbol in self.owners
+
+    def __iter__(self):
+        return iter(self.owners)
+
+    def __len__(self):
+        return len(self.owners)
+
+    def __eq__(self, other):
+        if isinstance(other, SubscriptionRegistry):
+            return self.owners == other.owners
+        try:
+            return list(self.owners) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
@@ -20,6 +20,8 @@ class Timer:
     def __init__(self, context):
         self.context = context
         self.performance = {}
+        # Event counters (i.e. cache hits/misses)
+        self.counters = {}
 
     def start(self, methodName=None):
         # Get the name of the calling method
@@ -46,6 +48,10 @@ class Timer:
         performance["elapsedTotal"] += elapsed
         performance["elapsedMean"] = performance["elapsedTotal"]/performance["calls"]
 
+    def count(self, counterName, increment=1):
+        # Update the counter
+        self.counters[counterName] = self.counters.get(counterName, 0) + increment
+
     def showStats(self, methodName=None):
         methods = methodName or self.performance.keys()
         total_elapsed = 0.0  # Initialize total elapsed time
@@ -68,3 +74,8 @@ class Timer:
         # Print the total elapsed time over all methods
         self.context.Log("Summary:")
         self.context.Log(f"  --> elapsedTotal: {timedelta(seconds=total_elapsed)}")
+        # Print the counters
+        if self.counters:
+            self.context.Log("Counters:")
+            for counter, value in self.counters.items():
+                self.context.Log(f"  --> {counter}: {value}")
@@ -0,0 +1,242 @@
+#region imports
+from AlgorithmImports import *
+#endregion
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+from .Logger import Logger
+from .ContractUtils import ContractUtils
+from .BSMLibrary import BSM
+
+
+class VolSmile:
+    """
+    Volatility smile of a single expiry of an underlying: a monotone (PCHIP) spline of the implied volatility in log-moneyness k = log(K/F),
+    fitted on the liquid OTM quotes. The smile is flat outside the range of the fitted strikes.
+
+    Attributes:
+        underlying (Symbol): The underlying of the contracts.
+        expiry (datetime): The expiry of the contracts.
+        lastUpdated (datetime): The time of the last fit.
+        spotPrice (float): The price of the underlying at the time of the fit.
+        forward (float): The forward price used to compute the log-moneyness.
+        quotes (dict): Symbol -> (strike, isCall, midPrice, IV) of the quotes used for the fit.
+    """
+
+    def __init__(self, underlying, expiry, lastUpdated, spotPrice, forward, quotes):
+        self.underlying = underlying
+        self.expiry = expiry
+        self.lastUpdated = lastUpdated
+        self.spotPrice = spotPrice
+        self.forward = forward
+        self.quotes = quotes
+        # Log-moneyness and IV of the fitted points (duplicated strikes are averaged)
+        points = {}
+        for strike, _, _, iv in quotes.values():
+            points.setdefault(strike, []).append(iv)
+        strikes = np.array(sorted(points))
+        self.k = np.log(strikes/forward)
+        self.iv = np.array([np.mean(points[strike]) for strike in strikes])
+        self.interpolator = PchipInterpolator(self.k, self.iv, extrapolate = False)
+
+    def ivAt(self, strike):
+        """
+        Evaluates the smile at the given strike(s).
+        Args:
+            strike (float | np.ndarray): The strike price(s).
+        Returns:
+            float | np.ndarray: The implied volatility.
+        """
+        # Flat extrapolation outside the fitted range
+        k = np.clip(np.log(np.asarray(strike, dtype = np.float64)/self.forward), self.k[0], self.k[-1])
+        return self.interpolator(k)
+
+
+class VolSurface:
+    """
+    Fits a smooth volatility smile per underlying and expiry (see VolSmile) once per bar from the liquid quotes of the chain, and answers the IV
+    of any strike by evaluating the smile. This avoids per-contract root solves, which are slow and often fail to converge on
+    the illiquid wings of the chain.
+    The smile is refitted incrementally: if the underlying has not moved and only a few quotes have changed since the last fit,
+    only the IV of the changed quotes is solved again.
+
+    The surface is shared by all the strategies (context.volSurface): the smiles are keyed by underlying and expiry, so the
+    strategies trading different underlyings with the same expiry do not override each other's smile.
+
+    The BSM library reads the IV from the surface (instead of solving it) when the useVolSurface parameter is set.
+
+    Example:
+        self.context.volSurface.fit(chain)
+        iv = self.context.volSurface.iv(contract)
+    """
+
+    def __init__(self, context, maxSpreadRatio = 0.25, minPoints = 4, refitThreshold = 0.2, maxAge = timedelta(minutes = 15)):
+        self.context = context
+        # Set the logger
+        self.logger = Logger(context, className = type(self).__name__, logLevel = context.logLevel)
+        # Initialize the contract utils
+        self.contractUtils = ContractUtils(context)
+        # Pricing model used to solve the IV of the quotes
+        self.bsm = BSM(context)
+        # Maximum bid-ask spread (relative to the mid-price) of a quote to be used in the fit
+        self.maxSpreadRatio = maxSpreadRatio
+        # Minimum number of quotes required to fit a smile
+        self.minPoints = minPoints
+        # Maximum fraction of changed quotes for an incremental refit
+        self.refitThreshold = refitThreshold
+        # Maximum age of a smile to be used for pricing
+        self.maxAge = maxAge
+        # Fitted smiles: (underlying, expiry) -> VolSmile
+        self.smiles = {}
+
+    def fit(self, contracts):
+        """
+        Fits the smile of each underlying/expiry found in the list of contracts (only once per bar).
+        Args:
+            contracts (list): The option contracts.
+        """
+        # Start the timer
+        self.context.executionTimer.start("Tools.VolSurface -> fit")
+
+        # Group the contracts by underlying and expiry
+        byExpiry = {}
+        for contract in contracts:
+            byExpiry.setdefault((contract.UnderlyingSymbol, contract.Expiry), []).append(contract)
+
+        for (_, expiry), group in byExpiry.items():
+            self.fitExpiry(expiry, group)
+
+        # Stop the timer
+        self.context.executionTimer.stop("Tools.VolSurface -> fit")
+
+    def fitExpiry(self, expiry, contracts):
+        """
+        Fits (or refits) the smile of a single expiry.
+        Args:
+            expiry (datetime): The expiry of the contracts.
+            contracts (list): The option contracts of the given expiry (all with the same underlying).
+        Returns:
+            VolSmile: The fitted smile or None if there are not enough liquid quotes.
+        """
+        underlying = contracts[0].UnderlyingSymbol
+        smile = self.smiles.get((underlying, expiry))
+        # Only fit once per bar
+        if smile is not None and smile.lastUpdated == self.context.Time:
+            return smile
+
+        spotPrice = self.contractUtils.getUnderlyingLastPrice(contracts[0])
+        tau = self.bsm.optionTau(contracts[0])
+        if tau == 0:
+            return None
+        forward = spotPrice * np.exp(self.bsm.riskFreeRate * tau)
+
+        # Get the liquid OTM quotes
+        quotes = {}
+        for contract in contracts:
+            isCall = contract.Right == OptionRight.Call
+            if isCall != (contract.Strike >= forward):
+                continue
+            security = self.contractUtils.getSecurity(contract)
+            bidPrice = security.BidPrice
+            askPrice = security.AskPrice
+            if bidPrice <= 0 or askPrice <= 0:
+                continue
+            midPrice = 0.5 * (bidPrice + askPrice)
+            if (askPrice - bidPrice)/midPrice > self.maxSpreadRatio:
+                continue
+            quotes[contract.Symbol] = (contract.Strike, isCall, midPrice, None)
+
+        if len(quotes) < self.minPoints:
+            self.logger.debug(f"Not enough liquid quotes to fit the smile of {underlying} expiry {expiry}: {len(quotes)}")
+            return None
+
+        # Find the quotes that need to be solved again
+        symbols = list(quotes)
+        if smile is not None and spotPrice == smile.spotPrice:
+            changed = [symbol for symbol in symbols if symbol not in smile.quotes or smile.quotes[symbol][2] != quotes[symbol][2]]
+        else:
+            changed = symbols
+        if len(changed) <= self.refitThreshold * len(symbols):
+            # Incremental refit: keep the IV of the quotes that did not change
+            changedSet = set(changed)
+            for symbol in symbols:
+                if symbol not in changedSet:
+                    quotes[symbol] = smile.quotes[symbol]
+            self.context.executionTimer.count("Tools.VolSurface -> fit -> incremental")
+        else:
+            changed = symbols
+            self.context.executionTimer.count("Tools.VolSurface -> fit -> full")
+
+        if changed:
+            strikes = np.array([quotes[symbol][0] for symbol in changed])
+            isCall = np.array([quotes[symbol][1] for symbol in changed])
+            midPrices = np.array([quotes[symbol][2] for symbol in changed])
+            # Start from the IV of the previous fit (if available)
+            x0 = np.array([smile.quotes[symbol][3] if smile is not None and symbol in smile.quotes else np.nan for symbol in changed])
+            iv, converged = self.bsm.bsmIVBatch(midPrices, strikes, isCall, tau, spotPrice, x0 = x0)
+            for idx, symbol in enumerate(changed):
+                if converged[idx]:
+                    quotes[symbol] = quotes[symbol][:3] + (iv[idx],)
+                else:
+                    # Drop the quotes that could not be solved
+                    quotes.pop(symbol)
+
+        if len(set(quote[0] for quote in quotes.values())) < self.minPoints:
+            self.logger.debug(f"Not enough converged quotes to fit the smile of {underlying} expiry {expiry}: {len(quotes)}")
+            return None
+
+        smile = VolSmile(underlying, expiry, self.context.Time, spotPrice, forward, quotes)
+        self.smiles[(underlying, expiry)] = smile
+        return smile
+
+    def smile(self, underlying, expiry):
+        """
+        Returns the smile of the given underlying and expiry if it is recent enough to be used.
+        Args:
+            underlying (Symbol): The underlying.
+            expiry (datetime): The expiry.
+        Returns:
+            VolSmile: The smile or None if not available.
+        """
+        smile = self.smiles.get((underlying, expiry))
+        if smile is None or self.context.Time - smile.lastUpdated > self.maxAge:
+            return None
+        return smile
+
+    def ivAt(self, underlying, expiry, strike):
+        """
+        Returns the implied volatility of the given underlying, expiry and strike.
+        Args:
+            underlying (Symbol): The underlying.
+            expiry (datetime): The expiry.
+            strike (float | np.ndarray): The strike price(s).
+        Returns:
+            float | np.ndarray: The implied volatility or None if no smile is available for the underlying and expiry.
+        """
+        smile = self.smile(underlying, expiry)
+        if smile is None:
+            return None
+        return smile.ivAt(strike)
+
+    def iv(self, contract):
+        """
+        Returns the implied volatility of the given contract.
+        Args:
+            contract (Contract): The option contract.
+        Returns:
+            float: The implied volatility or None if no smile is available for the underlying and expiry of the contract.
+        """
+        iv = self.ivAt(contract.UnderlyingSymbol, contract.Expiry, contract.Strike)
+        return None if iv is None else float(iv)
+
+    def clear(self, before = None):
+        """
+        Removes the smiles of the expired contracts (or all the smiles).
+        Args:
+            before (datetime): Remove the smiles with an expiry before this date. All the smiles are removed if not specified.
+        """
+        if before is None:
+            self.smiles.clear()
+        else:
+            for key in [key for key in self.smiles if key[1] < before]:
+                self.smiles.pop(key)
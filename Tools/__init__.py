@@ -4,7 +4,19 @@ from .Logger import Logger
 from .ContractUtils import ContractUtils
 from .DataHandler import DataHandler
 from .Underlying import Underlying
+from .GreeksCache import GreeksCache
+from .GreekIndicators import GreekIndicators
 from .BSMLibrary import BSM, BSMGreeks
+from .ScenarioGrid import ScenarioGrid
+from .ChainSnapshot import ChainSnapshot
+from .StrikeIndex import StrikeIndex
+from .StrategyDict import StrategyDict
+from .OptionContractListCache import OptionContractListCache
+from .SubscriptionRegistry import SubscriptionRegistry
+from .QuoteTracker import QuoteTracker
+from .IVHistory import IVHistory, IVHistoryStore
+from .VolSurface import VolSurface, VolSmile
+from .GreeksProvider import GreeksProvider, ProviderGreeks
 from .Helper import Helper
 from .Charting import Charting
 from .Performance import Performance
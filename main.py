@@ -78,6 +78,8 @@ class CentralAlgorithm(QCAlgorithm):
         # load previous positions if we are in live mode 
         if self.LiveMode:
             self.positions_store.load_positions()
+            # load the IV history of the underlyings
+            self.ivHistory.load()
 
         # Set the algorithm framework models
         # self.SetAlpha(FPLModel(self))
@@ -117,6 +119,9 @@ class CentralAlgorithm(QCAlgorithm):
     def OnEndOfDay(self, symbol):
         self.structure.checkOpenPositions()
         self.performance.endOfDay(symbol)
+        # store the IV history in live mode (in case the algorithm is not stopped gracefully), once per day
+        if self.LiveMode and self.ivHistory.lastSaveDate != self.Time.date():
+            self.ivHistory.save()
 
     def OnOrderEvent(self, orderEvent):
         # Start the timer
@@ -140,6 +145,7 @@ class CentralAlgorithm(QCAlgorithm):
         # store positions in live mode
         if self.LiveMode:
             self.positions_store.store_positions()
+            self.ivHistory.save()
 
         # Convert the dictionary into a Pandas Data Frame
         # dfAllPositions = pd.DataFrame.from_dict(self.allPositions, orient = "index")